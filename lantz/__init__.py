@@ -10,22 +10,110 @@
     :license: BSD, see LICENSE for more details.
 """
 
-import pkg_resources
+import sys
 
-try:
-    __version__ = pkg_resources.get_distribution('lantz').version
-except:
-    __version__ = "unknown"
 
-from pint import UnitRegistry
-ureg = UnitRegistry()
-Q_ = ureg.Quantity
+class _LazyRegistry(object):
+    """Proxy to the pint UnitRegistry used by Lantz, built on first use
+    as building it takes a significant fraction of the import time.
+    """
+
+    _registry = None
+
+    def _get(self):
+        if self._registry is None:
+            from pint import UnitRegistry
+            registry = UnitRegistry()
+            _Quantity.cls = registry.Quantity
+            type(self)._registry = registry
+        return self._registry
+
+    def __getattr__(self, item):
+        return getattr(self._get(), item)
+
+    def __call__(self, *args, **kwargs):
+        return self._get()(*args, **kwargs)
+
+    def __repr__(self):
+        return repr(self._get())
+
+
+class _Unbuilt(object):
+    """Placeholder: nothing is a Quantity before the registry is built.
+    """
+
+
+class _Quantity(type):
+    """Metaclass of Q_ delegating to the Quantity class of the registry.
+    """
+
+    cls = _Unbuilt
+
+    def __call__(cls, *args, **kwargs):
+        return ureg._get().Quantity(*args, **kwargs)
+
+    def __instancecheck__(cls, instance):
+        return isinstance(instance, _Quantity.cls)
+
+    def __subclasscheck__(cls, subclass):
+        return issubclass(subclass, _Quantity.cls)
+
+    def __getattr__(cls, item):
+        return getattr(ureg._get().Quantity, item)
+
+
+ureg = _LazyRegistry()
+
+
+class Q_(metaclass=_Quantity):
+    """Quantity class of the Lantz unit registry.
+    """
+
 
 from .log import LOGGER
-from .driver import Driver, Feat, DictFeat, Action, initialize_many, finalize_many
 
 __all__ = ['Driver', 'Action', 'Feat', 'DictFeat', 'Q_']
 
+#: Attributes imported on first use (name: module), as importing the driver
+#: module loads the signal backend (e.g. Qt).
+_LAZY = dict.fromkeys(('Driver', 'Feat', 'DictFeat', 'Action', 'initialize_many', 'finalize_many',
+                       'initialize_many_async', 'finalize_many_async'), 'driver')
+_LAZY['sweep'] = 'sweeper'
+_LAZY['DriverGroup'] = 'group'
+
+
+def _get_version():
+    try:
+        from importlib.metadata import version
+        return version('lantz')
+    except ImportError:
+        import pkg_resources
+        return pkg_resources.get_distribution('lantz').version
+
+
+def __getattr__(name):
+    if name == '__version__':
+        try:
+            value = _get_version()
+        except Exception:
+            value = "unknown"
+    elif name in _LAZY:
+        from importlib import import_module
+        value = getattr(import_module('.' + _LAZY[name], __name__), name)
+    else:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    globals()[name] = value
+    return value
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ is not available.
+    __version__ = __getattr__('__version__')
+    from .driver import (Driver, Feat, DictFeat, Action, initialize_many, finalize_many,
+                         initialize_many_async, finalize_many_async)
+    from .sweeper import sweep
+    from .group import DriverGroup
+
 
 def _run_pyroma(data):   # pragma: no cover
     """Run pyroma (used to perform checks before releasing a new version).
@@ -13,6 +13,8 @@
 import time
 import copy
 import inspect
+import logging
+import threading
 import functools
 
 from weakref import WeakKeyDictionary
@@ -20,7 +22,10 @@ from weakref import WeakKeyDictionary
 from .processors import (Processor, FromQuantityProcessor,
                          MapProcessor, RangeProcessor)
 
+from . import trace
 from .feat import MISSING
+from .stats import perf_counter_ns
+from .cancel import CancelToken
 
 
 def _dget(adict, instance=MISSING):
@@ -46,6 +51,68 @@ def _dset(adict, value, instance=MISSING):
         adict[instance] = value
 
 
+def _binder(func):
+    """Return a function mapping the arguments of a call to func (the
+    instance, args tuple and kwargs dict) to the tuple of values of its
+    positional parameters (excluding the first one), like
+    `inspect.getcallargs` but resolving the signature only once.
+
+    Calls with all the positional arguments, or omitting only some with
+    defaults, do not need to bind the signature.
+    """
+    signature = inspect.signature(func)
+    parameters = list(signature.parameters.values())[1:]
+    positional = [parameter for parameter in parameters
+                  if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD)]
+    names = tuple(parameter.name for parameter in positional)
+    nargs = len(names)
+
+    first_default = nargs
+    while first_default and positional[first_default - 1].default is not inspect.Parameter.empty:
+        first_default -= 1
+    defaults = tuple(parameter.default for parameter in positional[first_default:])
+
+    def bind(instance, args, kwargs):
+        if not kwargs:
+            given = len(args)
+            if given == nargs:
+                return args
+            if first_default <= given < nargs:
+                return args + defaults[given - first_default:]
+        bound = signature.bind(instance, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        return tuple(arguments[name] for name in names)
+
+    return bind
+
+
+def _takes_token(func):
+    """Return True if func has a keyword-only parameter named token.
+    """
+    parameter = inspect.signature(func).parameters.get('token')
+    return parameter is not None and parameter.kind == parameter.KEYWORD_ONLY
+
+
+class _BoundAction(functools.partial):
+    """Action bound to a driver instance.
+
+    `aio` and `invalidate` are created on access to keep calls cheap.
+    """
+
+    @property
+    def __wrapped__(self):
+        return self.func.__self__.func
+
+    @property
+    def aio(self):
+        return functools.partial(self.func.__self__.aio, self.args[0])
+
+    @property
+    def invalidate(self):
+        return functools.partial(self.func.__self__.invalidate, self.args[0])
+
+
 class Action(object):
     """Wraps a Driver method with Lantz. Can be used as a decorator.
 
@@ -63,10 +130,26 @@ class Action(object):
                 changed but only tested to belong to the container.
     :param units: `Quantity` or string that can be interpreted as units.
     :param procs: Other callables to be applied to input arguments.
+    :param memoize: cache the result for each tuple of (processed) arguments,
+                    for actions that only query the instrument.
+    :param ttl: time in seconds after which a memoized result is discarded.
+                None means never. Implies memoize.
+    :param invalidated_by: names of the feats whose change discards the
+                           memoized results. Implies memoize.
+    :param abort: name of the driver method called (without the driver lock,
+                  in the thread cancelling) to interrupt the action when its
+                  token is cancelled or its deadline expires (see `lantz.cancel`).
+    :param timeout: default deadline in seconds for each call.
+
+    Methods declaring a keyword-only `token` parameter receive a
+    `lantz.cancel.CancelToken` (given by the caller as `token=` or created
+    with the default timeout). While waiting for the driver lock, cancellable
+    actions give up when their token is cancelled.
 
     """
 
-    def __init__(self, func=None, *, values=None, units=None, limits=None, procs=None):
+    def __init__(self, func=None, *, values=None, units=None, limits=None, procs=None,
+                 memoize=False, ttl=None, invalidated_by=None, abort=None, timeout=None):
 
         #: instance: key: value
         self.modifiers = WeakKeyDictionary()
@@ -76,62 +159,188 @@ class Action(object):
                                    'units': units,
                                    'limits': limits,
                                    'processors': procs}
+        self.abort = abort
+        self.timeout = timeout
+
         self.func = func
         self.args = ()
+        self._bind = _binder(func) if func is not None else None
+        self._takes_token = func is not None and _takes_token(func)
+
+        self.invalidated_by = tuple(invalidated_by or ())
+        self.ttl = ttl
+        self.memoize = memoize or ttl is not None or bool(self.invalidated_by)
 
     def __call__(self, func):
         self.func = func
         self.args = inspect.getfullargspec(func).args
+        self._bind = _binder(func)
+        self._takes_token = _takes_token(func)
         self.__name__ = func.__name__
         self.__doc__ = func.__doc__
+        self._lock_timing = self.__name__ + '.lock'
+        self._pre_timing = self.__name__ + '.pre'
         self.rebuild(store=True)
         return self
 
     def __get__(self, instance, owner=None):
-        func = functools.partial(self.call, instance)
-        func.__wrapped__ = self.func
-        return func
+        return _BoundAction(self.call, instance)
 
     @property
     def name(self):
         return self.__name__
 
+    @property
+    def cancellable(self):
+        """True if calls accept a `token` to cancel them.
+        """
+        return self._takes_token or self.abort is not None or self.timeout is not None
+
     def call(self, instance, *args, **kwargs):
+        tracing = trace.enabled
+        tic = perf_counter_ns()
+        try:
+            if not self.cancellable:
+                with instance._lock:
+                    instance.timing.add_ns(self._lock_timing, perf_counter_ns() - tic)
+                    return self._call(instance, args, kwargs, None)
+
+            token = kwargs.pop('token', None)
+            if token is None:
+                token = CancelToken(self.timeout)
+            token.acquire(instance._lock)
+            try:
+                instance.timing.add_ns(self._lock_timing, perf_counter_ns() - tic)
+                return self._call(instance, args, kwargs, token)
+            finally:
+                instance._lock.release()
+        finally:
+            if tracing:
+                trace.record(instance, self.__name__, 'action', tic,
+                             {'args': args, 'kwargs': kwargs})
+
+    def _call(self, instance, args, kwargs, token):
         name = self.__name__
 
         # This part calls to the underlying function wrapping
         # and timing, logging and error handling
-        with instance._lock:
+        info = instance.log_enabled(logging.INFO)
+        if info:
             if args or kwargs:
                 instance.log_info('Calling {} with ({}, {}))', name, args, kwargs)
             else:
                 instance.log_info('Calling {}', name)
 
+        try:
+            tic = perf_counter_ns()
+            values = self._bind(instance, args, kwargs)
+            procs = _dget(self.action_processors, instance)
+            if not procs:
+                t_values = values
+            elif len(values) == 1:
+                t_values = (self.pre_action(values[0], instance), )
+            else:
+                t_values = self.pre_action(values, instance)
+        except Exception as e:
+            instance.log_error('While pre-processing ({}, {}) for {}: {}', args, kwargs, name, e)
+            instance.errors[name] += 1
+            raise e
+        instance.timing.add_ns(self._pre_timing, perf_counter_ns() - tic)
+
+        if self.memoize:
+            memo = instance._memo.setdefault(self, {})
             try:
-                values = inspect.getcallargs(self.func, *(instance, ) + args, **kwargs)
-                fargs = self.args
-                values = tuple(values[farg] for farg in fargs)[1:]
-                if len(values) == 1:
-                    t_values = (self.pre_action(values[0], instance), )
-                else:
-                    t_values = self.pre_action(values, instance)
-            except Exception as e:
-                instance.log_error('While pre-processing ({}, {}) for {}: {}', args, kwargs, name, e)
-                raise e
-
-            if args or kwargs:
-                instance.log_debug('(raw) Calling {} with {}', name, t_values)
-
+                timestamp, out = memo[t_values]
+            except (KeyError, TypeError):
+                pass
+            else:
+                if self.ttl is None or time.monotonic() - timestamp < self.ttl:
+                    instance.cache_hits[name] += 1
+                    if info:
+                        instance.log_info('{} returned {} (memoized)', name, out)
+                    return out
+
+        if (args or kwargs) and instance.log_enabled(logging.DEBUG):
+            instance.log_debug('(raw) Calling {} with {}', name, t_values)
+
+        try:
+            tic = perf_counter_ns()
+            if token is None:
+                out = self.func(instance, *t_values)
+            else:
+                out = self._call_cancellable(instance, t_values, token)
+        except Exception as e:
+            if token is not None and token.cancelled:
+                instance.log_info('{} was cancelled ({})', name, e)
+                token.check()
+            instance.log_error('While calling {} with {}. {}', name, t_values, e)
+            instance.errors[name] += 1
+            raise e
+
+        instance.timing.add_ns(name, perf_counter_ns() - tic)
+        if info:
+            instance.log_info('{} returned {}', name, out)
+
+        if self.memoize:
             try:
-                tic = time.time()
+                memo[t_values] = (time.monotonic(), out)
+            except TypeError:
+                # Unhashable arguments are not memoized.
+                pass
+
+        return out
+
+    def _call_cancellable(self, instance, t_values, token):
+        token.check()
+
+        hook = timer = None
+        if self.abort is not None:
+            hook = functools.partial(self._abort, instance)
+            token.add_callback(hook)
+            remaining = token.remaining()
+            if remaining is not None:
+                # Cancel when the deadline expires to interrupt blocking calls.
+                timer = threading.Timer(remaining, token.cancel)
+                timer.daemon = True
+                timer.start()
+
+        try:
+            if self._takes_token:
+                out = self.func(instance, *t_values, token=token)
+            else:
                 out = self.func(instance, *t_values)
-                instance.timing.add(name, time.time() - tic)
-                instance.log_info('{} returned {}', name, out)
-
-                return out
-            except Exception as e:
-                instance.log_error('While calling {} with {}. {}', name, t_values, e)
-                raise e
+        finally:
+            if hook is not None:
+                token.remove_callback(hook)
+            if timer is not None:
+                timer.cancel()
+
+        token.check()
+        return out
+
+    def _abort(self, instance):
+        instance.log_info('Aborting {} with {}', self.__name__, self.abort)
+        action = instance._lantz_actions.get(self.abort)
+        try:
+            if action is not None:
+                # Bypass the lock, held by the running action.
+                action.func(instance)
+            else:
+                getattr(instance, self.abort)()
+        except Exception as e:
+            instance.log_error('While aborting {} with {}: {}', self.__name__, self.abort, e)
+
+    def invalidate(self, instance):
+        """Discard the memoized results of an instance.
+        """
+        instance._memo.pop(self, None)
+
+    def aio(self, instance, *args, **kwargs):
+        """Coroutine to call the action from an asyncio event loop
+        (see `lantz.aio`).
+        """
+        from .aio import run
+        return run(instance, self.call, instance, *args, **kwargs)
 
     def pre_action(self, value, instance=None):
         procs = _dget(self.action_processors, instance)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+    lantz.aio
+    ~~~~~~~~~
+
+    Implements coroutines to use drivers from an asyncio event loop.
+
+    Blocking driver calls are run in the executor of the driver (see
+    `lantz.executor`), shared by all drivers and by the other asynchronous
+    methods, one call at a time per driver, and awaited as asyncio futures.
+    A busy driver does not hold a worker thread while calls wait for their
+    turn, and cancelling a call that has not started removes it from the queue.
+
+    Usage::
+
+        value = await driver.aget('frequency')
+        await driver.aset('amplitude', Q_(1, 'V'))
+        await driver.scan.aio(start, stop)
+        await initialize_many_async(drivers, dependencies={'lockin': ['sensor']})
+
+    :copyright: 2015 by Lantz Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import atexit
+import asyncio
+
+from .feat import DictFeat, MISSING
+
+
+async def run(driver, fn, *args, **kwargs):
+    """Run fn(*args, **kwargs) in the executor of the driver,
+    one call at a time per driver.
+    """
+    return await asyncio.wrap_future(driver._submit(fn, *args, **kwargs))
+
+
+async def aget(driver, feat_name, key=MISSING, *, max_age=None):
+    """Get the value of a feat (see `Driver.aget`).
+    """
+    feat = driver._lantz_features[feat_name]
+    if isinstance(feat, DictFeat):
+        if key is MISSING:
+            raise ValueError('A key is required to get {}'.format(feat_name))
+        target = feat._targets(driver, [key])[0]
+    else:
+        target = MISSING
+
+    # Values that can be taken from the cache do not need the executor.
+    compiled = feat.compiled(driver, target)
+    current = feat._fresh_cache(driver, target, compiled, max_age)
+    if current is not MISSING:
+        driver.cache_hits[compiled.get_timing] += 1
+        return current
+
+    if target is MISSING:
+        return await run(driver, feat.get, driver, max_age=max_age)
+    values = await run(driver, feat.get_many, driver, [key], max_age)
+    return values[key]
+
+
+async def aset(driver, feat_name, value, key=MISSING, *, force=False):
+    """Set the value of a feat (see `Driver.aset`).
+    """
+    feat = driver._lantz_features[feat_name]
+    if isinstance(feat, DictFeat) and key is not MISSING:
+        await run(driver, feat.setitem, driver, key, value, force)
+    else:
+        await run(driver, feat.set, driver, value, force)
+
+
+async def initialize_many(drivers, register_finalizer=True,
+                          on_initializing=None, on_initialized=None, on_exception=None,
+                          dependencies=None, max_concurrency=None, timeout=None):
+    """Initialize a group of drivers concurrently (see `lantz.initialize_many_async`).
+    """
+    from .scheduler import schedule_async
+
+    def _on_start(driver):
+        if register_finalizer:
+            atexit.register(driver.finalize)
+        if on_initializing:
+            on_initializing(driver)
+
+    return await schedule_async(drivers, 'initialize', dependencies, reverse=False,
+                                max_concurrency=max_concurrency, timeout=timeout,
+                                on_start=_on_start, on_done=on_initialized,
+                                on_exception=on_exception)
+
+
+async def finalize_many(drivers,
+                        on_finalizing=None, on_finalized=None, on_exception=None,
+                        dependencies=None, max_concurrency=None, timeout=None):
+    """Finalize a group of drivers concurrently (see `lantz.finalize_many_async`).
+
+    Each driver is finalized after the ones depending on it.
+    """
+    from .scheduler import schedule_async
+
+    return await schedule_async(drivers, 'finalize', dependencies, reverse=True,
+                                max_concurrency=max_concurrency, timeout=timeout,
+                                on_start=on_finalizing, on_done=on_finalized,
+                                on_exception=on_exception)
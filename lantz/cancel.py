@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+    lantz.cancel
+    ~~~~~~~~~~~~
+
+    Implements the token used to cancel long running actions, optionally
+    with a deadline.
+
+    Actions declaring a keyword-only `token` parameter receive it and are
+    expected to check it periodically (e.g. in a polling loop)::
+
+        @Action(abort='abort_acquisition', timeout=30)
+        def wait_for_acquisition(self, *, token):
+            while not self.acquisition_done:
+                if token.wait(.01):
+                    token.check()
+
+    Cancelling the token (e.g. with `future.abort()` for the future returned
+    by `<action>_async`) calls the `abort` hook of the action, if any, to
+    interrupt blocking calls.
+
+    :copyright: 2015 by Lantz Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import time
+import threading
+
+from .errors import ActionCancelled, DeadlineExceeded
+
+#: Maximum time in seconds between checks of the token while waiting for a lock.
+POLL_INTERVAL = .05
+
+
+class CancelToken(object):
+    """Cancellation request shared between the caller and a running action.
+
+    :param timeout: seconds from now after which the token is considered
+                    cancelled (deadline). None means no deadline.
+    """
+
+    def __init__(self, timeout=None):
+        #: time.monotonic() after which the token is expired, or None.
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+
+    def __repr__(self):
+        if self._event.is_set():
+            state = 'cancelled'
+        elif self.expired:
+            state = 'expired'
+        elif self.deadline is None:
+            state = 'active'
+        else:
+            state = 'active, {:.3f} s left'.format(self.remaining())
+        return '<CancelToken ({})>'.format(state)
+
+    def cancel(self):
+        """Request cancellation, calling the registered callbacks.
+
+        :return: False if it was already cancelled.
+        """
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self._event.set()
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback()
+        return True
+
+    @property
+    def expired(self):
+        """True if the deadline has passed.
+        """
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    @property
+    def cancelled(self):
+        """True if cancellation was requested or the deadline has passed.
+        """
+        return self._event.is_set() or self.expired
+
+    def remaining(self):
+        """Return the seconds left until the deadline, or None if there is none.
+        """
+        if self.deadline is None:
+            return None
+        return max(0., self.deadline - time.monotonic())
+
+    def check(self):
+        """Raise if cancelled.
+
+        :raises: DeadlineExceeded if the deadline has passed,
+                 ActionCancelled if cancellation was requested.
+        """
+        if self.expired:
+            raise DeadlineExceeded('Deadline exceeded')
+        if self._event.is_set():
+            raise ActionCancelled('Cancelled')
+
+    def wait(self, timeout=None):
+        """Sleep until cancelled, the deadline or timeout seconds.
+
+        :return: True if cancelled.
+        """
+        remaining = self.remaining()
+        if remaining is not None and (timeout is None or remaining < timeout):
+            timeout = remaining
+        self._event.wait(timeout)
+        return self.cancelled
+
+    def add_callback(self, callback):
+        """Register a callable (without arguments) to be called on cancel.
+        It is called immediately if already cancelled.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback):
+        with self._lock:
+            try:
+                self._callbacks.remove(callback)
+            except ValueError:
+                pass
+
+    def acquire(self, lock):
+        """Acquire a lock, giving up if cancelled.
+
+        :raises: ActionCancelled or DeadlineExceeded.
+        """
+        while True:
+            self.check()
+            remaining = self.remaining()
+            interval = POLL_INTERVAL if remaining is None else min(POLL_INTERVAL, remaining)
+            if lock.acquire(timeout=interval):
+                return
@@ -12,14 +12,18 @@ import copy
 import atexit
 import logging
 import threading
-from functools import wraps
-from concurrent import futures
-from collections import defaultdict
+from functools import wraps, partial
+from contextlib import contextmanager
+from weakref import WeakSet
+from collections import defaultdict, Counter
 
-from .utils.qt import MetaQObject, SuperQObject, QtCore
-from .feat import Feat, DictFeat, MISSING, FeatProxy
+from .utils.signals import MetaObject, SuperObject, Signal
+from .feat import Feat, DictFeat, MISSING, FeatProxy, _differs
 from .action import Action, ActionProxy
+from .cancel import CancelToken
 from .stats import RunningStats
+from .executor import get_executor, NORMAL
+from .scheduler import schedule
 from .log import get_logger
 
 logger = get_logger('lantz.driver', False)
@@ -115,18 +119,37 @@ def repartial_submit(fname):
     """Used to create an async bound method in Driver.
     """
     def wrapped(self, *args, **kwargs):
-        return self._submit(getattr(self, fname), *args, **kwargs)
+        action = self._lantz_actions.get(fname)
+        if action is None or not action.cancellable:
+            return self._submit(getattr(self, fname), *args, **kwargs)
+
+        # The token is created now so that the future can abort the action.
+        token = kwargs.get('token')
+        if token is None:
+            token = kwargs['token'] = CancelToken(action.timeout)
+        fut = self._submit(getattr(self, fname), *args, **kwargs)
+        fut.token = token
+        fut.abort = partial(_abort_future, fut, token)
+        return fut
     return wrapped
 
 
-class _DriverType(MetaQObject):
+def _abort_future(fut, token):
+    """Cancel the future of an action if it is queued,
+    or cancel its token if it is running.
+    """
+    if not fut.cancel():
+        token.cancel()
+
+
+class _DriverType(MetaObject):
     """Base metaclass for all drivers.
     """
 
     def __new__(cls, classname, bases, class_dict):
 
 
-        # Qt Signals need to be added to the class before it is created.
+        # Signals need to be added to the class before it is created.
         # We loop through all members of the class and add a changed event
         # for each Feat/DictFeat.
 
@@ -141,10 +164,10 @@ class _DriverType(MetaQObject):
             for feat_name, feat in d.items():
                 if isinstance(feat, DictFeat):
                     # The signature is new value, old value, dictionary of other stuff such as keys
-                    signals[feat_name + '_changed'] = QtCore.Signal(object, object, dict)
+                    signals[feat_name + '_changed'] = Signal(object, object, dict)
                 else:
                     # The signature is new value, old value
-                    signals[feat_name + '_changed'] = QtCore.Signal(object, object)
+                    signals[feat_name + '_changed'] = Signal(object, object)
 
         class_dict.update(signals)
 
@@ -190,22 +213,161 @@ class _DriverType(MetaQObject):
         self._lantz_features = feats
         self._lantz_actions = actions
 
+        # Modifiers given with Self are resolved once per class, so that
+        # creating an instance only needs to register the dependents.
+
+        self._lantz_self_modifiers = [(attr_value.item, feat_name, attr_name)
+                                      for feat_name, feat in sorted(feats.items())
+                                      for attr_name, attr_value in sorted(_self_modifiers(feat).items())]
+
+        # Feats whose change discards the memoized results of an action.
+
+        invalidators = []
+        for action_name, action in sorted(actions.items()):
+            for feat_name in action.invalidated_by:
+                if feat_name not in feats:
+                    raise ValueError('In {}: {} is invalidated_by {}, which is not a feat'.format(
+                                     classname, action_name, feat_name))
+                invalidators.append((feat_name, action))
+        self._lantz_invalidators = invalidators
+
+
+def _self_modifiers(feat):
+    """Return the modifiers of a feat given with Self (name: Self).
+
+    The first time, the defaults are applied to the feat. If a default
+    is missing, getting or setting the feat raises an exception until the
+    dependency is set.
+    """
+    try:
+        return feat._self_modifiers
+    except AttributeError:
+        pass
+
+    selfs = feat._self_modifiers = {attr_name: attr_value
+                                    for attr_name, attr_value in feat.modifiers.items()
+                                    if isinstance(attr_value, Self)}
+    missing = None
+    for attr_name, attr_value in selfs.items():
+        if attr_value.default is MISSING:
+            missing = attr_value
+        else:
+            feat.modifiers[attr_name] = attr_value.default
+
+    if missing is not None:
+        feat.get_processors = (_raise_must_change(missing.item, feat.name, 'get'), )
+        feat.set_processors = (_raise_must_change(missing.item, feat.name, 'set'), )
+        feat.invalidate()
+    elif selfs:
+        feat.rebuild(build_doc=False, store=True)
+
+    return selfs
+
+
+class Batch(object):
+    """Pending work of a driver batch (see `Driver.batch`).
+    """
+
+    def __init__(self):
+        #: identifier of the thread that opened the batch.
+        #: :type: int
+        self.thread = threading.get_ident()
+
+        #: commands collected by the driver to be sent together.
+        #: :type: list
+        self.commands = []
+
+        #: (feat, value, key) cache updates to be applied if the batch succeeds.
+        #: :type: list
+        self.updates = []
+
+        #: (feat, key): latest value set within the batch.
+        #: :type: dict
+        self.pending = {}
+
+    def add_update(self, feat, value, key):
+        """Record a successful set to be applied to the cache if the batch succeeds.
+        """
+        self.updates.append((feat, value, key))
+        self.pending[(feat, key)] = value
+
+    def commit(self, instance):
+        """Apply the pending cache updates.
+        """
+        for feat, value, key in self.updates:
+            feat.set_cache(instance, value, key)
+        self.updates = []
+        self.pending = {}
+
+
+class Snapshot(object):
+    """Cached feat values of a driver (see `Driver.snapshot`).
+
+    It can be pickled, or converted to and from builtin types
+    with `to_dict` and `from_dict`.
+    """
+
+    __slots__ = ('driver', 'values')
+
+    def __init__(self, driver, values):
+        #: name of the driver class.
+        #: :type: str
+        self.driver = driver
+
+        #: feat name: value (or key: value for DictFeat).
+        #: :type: dict
+        self.values = values
+
+    def __getstate__(self):
+        return self.driver, self.values
+
+    def __setstate__(self, state):
+        self.driver, self.values = state
+
+    def __eq__(self, other):
+        return (isinstance(other, Snapshot) and
+                self.driver == other.driver and self.values == other.values)
+
+    def __repr__(self):
+        return '<Snapshot of {} ({} feats)>'.format(self.driver, len(self.values))
+
+    def to_dict(self):
+        return {'driver': self.driver, 'values': self.values}
+
+    @classmethod
+    def from_dict(cls, adict):
+        return cls(adict['driver'], adict['values'])
+
 
 _REGISTERED = defaultdict(int)
 
+#: Drivers that have not been garbage collected.
+_INSTANCES = WeakSet()
+
+
+def live_drivers():
+    """Return a list of the drivers that have not been garbage collected.
+    """
+    return list(_INSTANCES)
+
 def _set(inst, feat_name, feat_attr):
     def _inner(value, *args):
         proxy = inst.feats[feat_name]
         setattr(proxy, feat_attr, value)
     return _inner
 
+def _invalidate(inst, action):
+    def _inner(*args):
+        action.invalidate(inst)
+    return _inner
+
 def _raise_must_change(dependent, feat_name, operation):
     def _inner(value):
         raise Exception("You must get or set '{}' before trying to {} '{}'".format(dependent, operation, feat_name))
     return _inner
 
 
-class Driver(SuperQObject, metaclass=_DriverType):
+class Driver(SuperObject, metaclass=_DriverType):
     """Base class for all drivers.
 
     :params name: easy to remember identifier given to the instance for logging
@@ -215,17 +377,42 @@ class Driver(SuperQObject, metaclass=_DriverType):
     _lantz_features = {}
     _lantz_actions = {}
 
+    #: Default policy for the emission of changed signals of all feats
+    #: (see `lantz.emission`). None means emit immediately.
+    #: It can be overridden per feat with the `emission` modifier.
+    emission_policy = None
+
+    #: Executor running the asynchronous methods (see `lantz.executor`).
+    #: None means use the one shared by all drivers.
+    executor = None
+
+    #: Name of the feat identifying the instrument firmware (see `lantz.persist`).
+    #: Persisted read_once values are discarded when its value changes.
+    PERSIST_FIRMWARE = None
+
     __name = ''
 
     def __new__(cls, *args, **kwargs):
-        inst = SuperQObject.__new__(cls)
+        inst = SuperObject.__new__(cls)
         name = kwargs.pop('name', None)
 
-        inst._executor = None
+        inst._tasks_lock = threading.Lock()
         inst._lock = threading.RLock()
+        inst._batch = None
+        inst._emitters = {}
+        inst._histories = {}
+        inst._dependents = defaultdict(list)
+        inst._feat_states = {}
+        inst._memo = {}
         inst.__unfinished_tasks = 0
         inst.timing = RunningStats()
 
+        #: timing key: number of operations that raised an exception.
+        inst.errors = Counter()
+
+        #: timing key: number of values served from the cache (or memoized).
+        inst.cache_hits = Counter()
+
         if hasattr(inst, 'name') and inst.name:
             pass
         elif name:
@@ -237,19 +424,13 @@ class Driver(SuperQObject, metaclass=_DriverType):
         inst.log_extra = {'lantz_driver': cls.__name__,
                           'lantz_name': inst.name}
 
-        for feat_name, feat in cls._lantz_features.items():
+        for item, feat_name, attr_name in cls._lantz_self_modifiers:
+            inst._dependents[item].append(_set(inst, feat_name, attr_name))
 
-            for attr_name, attr_value in feat.modifiers[MISSING][MISSING].items():
-                if not isinstance(attr_value, Self):
-                    continue
-                getattr(inst, attr_value.item + '_changed').connect(_set(inst, feat_name, attr_name))
-                if attr_value.default is MISSING:
-                    feat.get_processors[MISSING][MISSING] = (_raise_must_change(attr_value.item, feat_name, 'get'), )
-                    feat.set_processors[MISSING][MISSING] = (_raise_must_change(attr_value.item, feat_name, 'set'), )
-                else:
-                    feat.modifiers[MISSING][MISSING][attr_name] = attr_value.default
-                    feat.rebuild(build_doc=False, store=True)
+        for feat_name, action in cls._lantz_invalidators:
+            inst._dependents[feat_name].append(_invalidate(inst, action))
 
+        _INSTANCES.add(inst)
         inst.log_info('Created ' + inst.name)
         return inst
 
@@ -261,27 +442,110 @@ class Driver(SuperQObject, metaclass=_DriverType):
     def name(self, value):
         self.__name = value
 
+    def _emit_changed(self, feat_name, compiled, *args):
+        """Notify a change in the cached value of a feat: update dependent
+        feats synchronously and emit the changed signal following the
+        emission policy.
+        """
+        for callback in self._dependents.get(feat_name, ()):
+            callback(*args)
+
+        policy = compiled.emission or self.emission_policy
+        if policy is None:
+            getattr(self, feat_name + '_changed').emit(*args)
+            return
+
+        emitter = self._emitters.get(compiled.name)
+        if emitter is None or emitter.policy is not policy:
+            if emitter is not None:
+                emitter.flush()
+            emitter = policy.emitter(getattr(self, feat_name + '_changed'))
+            self._emitters[compiled.name] = emitter
+        emitter.emit(*args)
+
+    def emission_counts(self):
+        """Return the number of emitted, coalesced and dropped changed signals
+        for each feat (or feat key) emitted through an emission policy.
+
+        :rtype: dict[str, lantz.emission.EmissionCounts]
+        """
+        return {name: emitter.counts for name, emitter in self._emitters.items()}
+
+    def flush_emissions(self):
+        """Emit all pending changed signals held back by emission policies.
+        """
+        for emitter in list(self._emitters.values()):
+            emitter.flush()
+
+    def _history_buffer(self, compiled):
+        buffer = self._histories.get(compiled.name)
+        if buffer is None or buffer.capacity != compiled.history:
+            from .history import RingBuffer
+            new = RingBuffer(compiled.history, compiled.units)
+            if buffer is not None:
+                new.extend(*buffer.get())
+            buffer = self._histories[compiled.name] = new
+        return buffer
+
+    def _record_history(self, compiled, timestamp, value):
+        self._history_buffer(compiled).append(timestamp, value)
+
+    def history(self, feat_name, since=None, max_points=None, *, key=MISSING):
+        """Return the recorded history of the cached value of a feat
+        (enabled with the `history` modifier).
+
+        The arrays are views into a fixed size buffer and will be overwritten
+        by new values: copy them to keep them around.
+
+        :param feat_name: name of the feat.
+        :param since: only return points recorded at or after this time
+                      (as given by time.monotonic()).
+        :param max_points: only return the last max_points points.
+        :param key: key of a DictFeat.
+        :return: (timestamps, values) as NumPy arrays (values as Quantity
+                 if the feat has units).
+        """
+        feat = self._lantz_features[feat_name]
+        compiled = feat.compiled(self, key)
+        if not compiled.history:
+            raise ValueError('History is not enabled for {}'.format(compiled.name))
+        return self._history_buffer(compiled).get(since, max_points)
+
     def __submit_by_name(self, fname, *args, **kwargs):
         return self._submit(getattr(self, fname), *args, **kwargs)
 
-    def _first_submit(self, fn, *args, **kwargs):
-        self._executor = futures.ThreadPoolExecutor(max_workers=1)
-        self._submit = self._notfirst_submit
-        return self._notfirst_submit(fn, *args, **kwargs)
+    def _submit(self, fn, *args, **kwargs):
+        return self._submit_priority(NORMAL, fn, *args, **kwargs)
 
-    def _notfirst_submit(self, fn, *args, **kwargs):
-        self.__unfinished_tasks += 1
-        fut = self._executor.submit(fn, *args, **kwargs)
+    def _submit_priority(self, priority, fn, *args, **kwargs):
+        executor = self.executor or get_executor()
+        with self._tasks_lock:
+            self.__unfinished_tasks += 1
+        fut = executor.submit(self, priority, fn, *args, **kwargs)
         fut.add_done_callback(self._decrease_unfinished_tasks)
         return fut
 
-    _submit = _first_submit
-
     def _decrease_unfinished_tasks(self, *args):
-        self.__unfinished_tasks -= 1
+        with self._tasks_lock:
+            self.__unfinished_tasks -= 1
 
     unfinished_tasks = property(lambda self: self.__unfinished_tasks)
 
+    @property
+    def queued_tasks(self):
+        """Number of asynchronous tasks of this driver waiting to run.
+        """
+        return (self.executor or get_executor()).queue_depth(self)
+
+    @property
+    def queue_wait(self):
+        """Time in seconds that asynchronous tasks of this driver waited
+        to run (None if no task was submitted).
+
+        :rtype: lantz.stats.RunningState
+        """
+        return (self.executor or get_executor()).wait_time(self)
+
     def log(self, level, msg, *args, **kwargs):
         """Log with the integer severity 'level'
         on the logger corresponding to this instrument.
@@ -295,6 +559,16 @@ class Driver(SuperQObject, metaclass=_DriverType):
         else:
             logger.log(level, msg, *args, extra=self.log_extra)
 
+    def log_enabled(self, level):
+        """Return True if a message of the given severity would be processed
+        by the logger corresponding to this instrument.
+
+        Use it to avoid building expensive log arguments.
+
+        :param level: severity level.
+        """
+        return logger.isEnabledFor(level)
+
     def log_info(self, msg, *args, **kwargs):
         """Log with the severity 'INFO'
         on the logger corresponding to this instrument.
@@ -362,13 +636,76 @@ class Driver(SuperQObject, metaclass=_DriverType):
     def finalize(self):
         pass
 
-    def update(self, newstate=None, *, force=False, **kwargs):
+    def aget(self, feat_name, key=MISSING, *, max_age=None):
+        """Coroutine to get the value of a feat from an asyncio event loop.
+
+        The instrument is queried in the executor shared by all drivers
+        (see `lantz.aio`).
+
+        :param feat_name: name of the feat.
+        :param key: key of a DictFeat.
+        :param max_age: see `refresh`.
+        """
+        from .aio import aget
+        return aget(self, feat_name, key, max_age=max_age)
+
+    def aset(self, feat_name, value, key=MISSING, *, force=False):
+        """Coroutine to set the value of a feat from an asyncio event loop.
+
+        :param feat_name: name of the feat.
+        :param value: new value.
+        :param key: key of a DictFeat.
+        :param force: apply change even when the cache says it is not necessary.
+        """
+        from .aio import aset
+        return aset(self, feat_name, value, key, force=force)
+
+    @contextmanager
+    def batch(self):
+        """Context manager to group multiple set operations.
+
+        Commands collected by the driver while the batch is open are sent
+        together when it closes (see `MessageBasedDriver.BATCH_SEPARATOR`).
+        The cache is updated, and the corresponding changed signals emitted,
+        only if the batch finishes successfully. The driver lock is held
+        for the whole batch. Nested batches are merged into the outer one.
+
+        Example::
+
+            with inst.batch():
+                inst.frequency = 10
+                inst.amplitude = 2
+        """
+        with self._lock:
+            if self._batch is not None:
+                yield self._batch
+                return
+
+            self._batch = batch = Batch()
+            try:
+                yield batch
+            finally:
+                self._batch = None
+
+            self._send_batch(batch)
+            batch.commit(self)
+
+    def _send_batch(self, batch):
+        """Send the commands collected during a batch.
+
+        Drivers that collect commands must override this method.
+        """
+        batch.commands = []
+
+    def update(self, newstate=None, *, force=False, batch=False, **kwargs):
         """Update driver.
 
         :param newstate: a dictionary containing the new driver state.
         :type newstate: dict.
         :param force: apply change even when the cache says it is not necessary.
         :param force: boolean.
+        :param batch: group all set operations in a single batch.
+        :type batch: boolean.
 
         :raises: ValueError if called with an empty dictionary.
         """
@@ -377,18 +714,28 @@ class Driver(SuperQObject, metaclass=_DriverType):
         if not newstate:
             raise ValueError("update() called with an empty dictionary")
 
-        for key, value in newstate.items():
-            self._lantz_features[key].set(self, value, force)
+        if batch:
+            with self.batch():
+                for key, value in newstate.items():
+                    self._lantz_features[key].set(self, value, force)
+        else:
+            for key, value in newstate.items():
+                self._lantz_features[key].set(self, value, force)
 
-    def update_async(self, newstate=None, *, force=False, callback=None, **kwargs):
+    def update_async(self, newstate=None, *, force=False, batch=False, callback=None,
+                     priority=NORMAL, **kwargs):
         """Asynchronous update driver.
 
         :param newstate: driver state.
         :type newstate: dict.
         :param force: apply change even when the cache says it is not necessary.
         :type force: boolean.
+        :param batch: group all set operations in a single batch.
+        :type batch: boolean.
         :param callback: Called when the update finishes.
         :type callback: callable.
+        :param priority: tasks with lower values run first (see `lantz.executor`).
+        :type priority: int
 
         :return type: concurrent.future
 
@@ -398,12 +745,107 @@ class Driver(SuperQObject, metaclass=_DriverType):
         if not newstate:
             raise ValueError("update() called with an empty dictionary")
 
-        fut = self._submit(self.update, newstate, force=force)
+        fut = self._submit_priority(priority, self.update, newstate, force=force, batch=batch)
         if not callback is None:
             fut.add_done_callback(callback)
         return fut
 
-    def refresh(self, keys=None):
+    def sweep(self, feat_name, values, measure=None, settle=0., **kwargs):
+        """Set a feat to each value of a sequence and measure at each point
+        in a worker thread (see `lantz.sweeper.sweep`).
+
+        :param feat_name: name of the feat to set.
+        :param values: values to set.
+        :param measure: what to measure at each point.
+        :param settle: time in seconds to wait after setting before measuring.
+        :return: structured array with the measured points.
+        """
+        from .sweeper import sweep
+        return sweep(self.feats[feat_name], values, measure, settle, **kwargs)
+
+    def snapshot(self, keys=None):
+        """Capture the cached values of the feats (without querying the instrument).
+
+        :param keys: names of the feats to include.
+                     Default None, meaning all feats with a cached value.
+        :type keys: list or tuple
+        :return type: Snapshot
+        """
+        values = {}
+        with self._lock:
+            for name in keys or self._lantz_features:
+                feat = self._lantz_features[name]
+                value = feat.get_cache(self)
+                if value is MISSING or (isinstance(feat, DictFeat) and not value):
+                    continue
+                if isinstance(feat, DictFeat):
+                    value = dict(value)
+                values[name] = value
+        return Snapshot(self.__class__.__name__, values)
+
+    def diff(self, snapshot):
+        """Return the values of a snapshot that differ from the cache.
+        Read-only feats are ignored.
+
+        :param snapshot: as returned by `snapshot`.
+        :type snapshot: Snapshot
+        :return: feat name: value (or key: value for DictFeat).
+        :return type: dict
+
+        :raises: KeyError if the snapshot contains an unknown feat.
+        """
+        out = {}
+        for name, value in snapshot.values.items():
+            feat = self._lantz_features[name]
+            if feat.fset is None:
+                continue
+            current = feat.get_cache(self)
+            if isinstance(feat, DictFeat):
+                if current is MISSING:
+                    current = {}
+                changed = {key: key_value for key, key_value in value.items()
+                           if _differs(current.get(key, MISSING), key_value)}
+                if changed:
+                    out[name] = changed
+            elif _differs(current, value):
+                out[name] = value
+        return out
+
+    def restore(self, snapshot, *, force=False):
+        """Restore the driver state from a snapshot, setting only the
+        values that differ from the cache. All set operations are
+        grouped in a single batch.
+
+        :param snapshot: as returned by `snapshot`.
+        :type snapshot: Snapshot
+        :param force: set all values, even when the cache says it is not necessary.
+        :type force: boolean
+        :return: the values that were set (as returned by `diff`).
+        :return type: dict
+        """
+        with self._lock:
+            if force:
+                changes = {name: value for name, value in snapshot.values.items()
+                           if self._lantz_features[name].fset is not None}
+            else:
+                changes = self.diff(snapshot)
+
+            if not changes:
+                return changes
+
+            with self.batch():
+                for name, value in changes.items():
+                    feat = self._lantz_features[name]
+                    if isinstance(feat, DictFeat):
+                        # Keys in the cache (and the snapshot) are instrument keys.
+                        for key, key_value in value.items():
+                            feat.set(self, key_value, True, key)
+                    else:
+                        feat.set(self, value, True)
+
+        return changes
+
+    def refresh(self, keys=None, *, max_age=None, force_refresh=False):
         """Refresh cache by reading values from the instrument.
 
         :param keys: a string or list of strings with the properties to refresh.
@@ -412,19 +854,33 @@ class Driver(SuperQObject, metaclass=_DriverType):
                      If keys is a list/tuple, returns a tuple.
                      If keys is a dict, returns a dict.
         :type keys: str or list or tuple or dict
+        :param max_age: cached values younger than this number of seconds
+                        are returned without querying the instrument.
+                        Default None, meaning use each feat cache_ttl.
+        :type max_age: float
+        :param force_refresh: query the instrument even for read_once feats
+                              (bypassing also the persistent cache).
+        :type force_refresh: bool
         """
         if keys:
             if isinstance(keys, (list, tuple)):
-                return tuple(getattr(self, key) for key in keys)
+                return tuple(self._refresh(key, max_age, force_refresh) for key in keys)
             elif isinstance(keys, dict):
-                return {key: getattr(self, key) for key in keys.keys()}
+                return {key: self._refresh(key, max_age, force_refresh) for key in keys.keys()}
             elif isinstance(keys, str):
-                return getattr(self, keys)
+                return self._refresh(keys, max_age, force_refresh)
             else:
                 raise ValueError('keys must be a (str, list, tuple or dict)')
-        return {key: getattr(self, key) for key in self._lantz_features}
+        return {key: self._refresh(key, max_age, force_refresh) for key in self._lantz_features}
 
-    def refresh_async(self, keys=None, *, callback=None):
+    def _refresh(self, key, max_age, force_refresh=False):
+        feat = self._lantz_features[key]
+        if (max_age is None and not force_refresh) or isinstance(feat, DictFeat):
+            return getattr(self, key)
+        return feat.get(self, max_age=max_age, force_refresh=force_refresh)
+
+    def refresh_async(self, keys=None, *, max_age=None, force_refresh=False, callback=None,
+                      priority=NORMAL):
         """Asynchronous refresh cache by reading values from the instrument.
 
         :param keys: a string or list of strings with the properties to refresh
@@ -432,12 +888,23 @@ class Driver(SuperQObject, metaclass=_DriverType):
                      If keys is a string, returns the value.
                      If keys is a list, returns a dictionary.
         :type keys: str or list or tuple or dict
+        :param max_age: cached values younger than this number of seconds
+                        are returned without querying the instrument.
+        :type max_age: float
+        :param force_refresh: query the instrument even for read_once feats.
+        :type force_refresh: bool
+        :param priority: tasks with lower values run first, e.g. use
+                         `lantz.executor.INTERACTIVE` for reads requested
+                         by the user and `lantz.executor.BULK` for periodic
+                         refreshes.
+        :type priority: int
 
         :return type: concurrent.future.
 
 
         """
-        fut = self._submit(self.refresh, keys=keys)
+        fut = self._submit_priority(priority, self.refresh, keys=keys, max_age=max_age,
+                                    force_refresh=force_refresh)
         if not callback is None:
             fut.add_done_callback(callback)
         return fut
@@ -467,36 +934,9 @@ class Driver(SuperQObject, metaclass=_DriverType):
         return Proxy(self, self._lantz_actions, ActionProxy)
 
 
-def _solve_dependencies(dependencies, all_members=None):
-    """Solve a dependency graph.
-
-    :param dependencies: dependency dictionary. For each key, the value is
-                         an iterable indicating its dependencies.
-    :param all_members: If provided
-    :return: list of sets, each containing independent task only dependent of the
-             previous set in the list.
-
-    """
-    d = dict((key, set(value)) for key, value in dependencies.items())
-    if all_members:
-        d.update({key: set() for key in all_members if key not in d})
-    r = []
-    while d:
-        # values not in keys (items without dep)
-        t = set(i for v in d.values() for i in v) - set(d.keys())
-        # and keys without value (items without dep)
-        t.update(k for k, v in d.items() if not v)
-        # can be done right away
-        r.append(t)
-        # and cleaned up
-        d = dict(((k, v - t) for k, v in d.items() if v))
-
-    return r
-
-
 def initialize_many(drivers, register_finalizer=True,
                     on_initializing=None, on_initialized=None, on_exception=None,
-                    concurrent=False, dependencies=None):
+                    concurrent=False, dependencies=None, max_concurrency=None, timeout=None):
     """Initialize a group of drivers.
 
     :param drivers: an iterable of drivers.
@@ -509,73 +949,63 @@ def initialize_many(drivers, register_finalizer=True,
                          It takes the offending driver as the first argument and the
                          exception as the second one.
     :param concurrent: indicates that drivers with satisfied dependencies
-                       should be initialized concurrently.
+                       should be initialized concurrently. Each driver starts as
+                       soon as its own dependencies are initialized.
     :param dependencies: indicates which drivers depend on others to be initialized.
                          each key is a driver name, and the corresponding
                          value is an iterable with its dependencies.
+    :param max_concurrency: maximum number of drivers initialized at the same time
+                            (when concurrent). None means no limit.
+    :param timeout: maximum time in seconds to initialize each driver (when
+                    concurrent). Exceeding it is reported as a TimeoutError.
+    :return: timing report.
+    :rtype: lantz.scheduler.ScheduleReport
     """
 
-    if dependencies:
-        names = {driver.name: driver for driver in drivers}
-
-        groups = _solve_dependencies(dependencies, set(names.keys()))
-        drivers = tuple(tuple(names[name] for name in group) for group in groups)
-        for subset in drivers:
-            initialize_many(subset, register_finalizer,
-                            on_initializing, on_initialized, on_exception,
-                            concurrent)
-        return
-
-    if concurrent:
-        def _finalize(d):
-            def _inner_finalize(f):
-                atexit.register(d.finalize)
-            return _inner_finalize
-
-        def _done(d):
-            def _inner(f):
-                ex = f.exception()
-                if ex:
-                    if not on_exception:
-                        raise ex
-                    on_exception(d, ex)
-                else:
-                    if on_initialized:
-                        on_initialized(d)
-            return _inner
-
-        futs = []
-        for driver in drivers:
-            if on_initializing:
-                on_initializing(driver)
-            fut = driver.initialize_async()
-            if register_finalizer:
-                fut.add_done_callback(_finalize(driver))
-            fut.add_done_callback(_done(driver))
-            futs.append(fut)
-
-        futures.wait(futs)
-    else:
-        for driver in drivers:
-            if on_initializing:
-                on_initializing(driver)
-            try:
-                driver.initialize()
-            except Exception as ex:
-                if not on_exception:
-                    raise ex
-                on_exception(driver, ex)
-            else:
-                if on_initialized:
-                    on_initialized(driver)
+    def _on_start(driver):
+        if register_finalizer:
+            atexit.register(driver.finalize)
+        if on_initializing:
+            on_initializing(driver)
+
+    return schedule(drivers, 'initialize', dependencies, reverse=False,
+                    concurrent=concurrent, max_concurrency=max_concurrency, timeout=timeout,
+                    on_start=_on_start, on_done=on_initialized, on_exception=on_exception)
+
+
+def initialize_many_async(drivers, register_finalizer=True,
+                          on_initializing=None, on_initialized=None, on_exception=None,
+                          dependencies=None, max_concurrency=None, timeout=None):
+    """Coroutine to initialize a group of drivers from an asyncio event loop.
 
-            if register_finalizer:
-                atexit.register(driver.finalize)
+    Each driver is initialized as soon as its dependencies are,
+    running the blocking calls in the executor shared by all drivers.
+    Parameters, report and exceptions are the same as `initialize_many`
+    with concurrent=True.
+    """
+    from .aio import initialize_many as _initialize_many
+    return _initialize_many(drivers, register_finalizer,
+                            on_initializing, on_initialized, on_exception, dependencies,
+                            max_concurrency, timeout)
+
+
+def finalize_many_async(drivers,
+                        on_finalizing=None, on_finalized=None, on_exception=None,
+                        dependencies=None, max_concurrency=None, timeout=None):
+    """Coroutine to finalize a group of drivers from an asyncio event loop.
+
+    Each driver is finalized as soon as the drivers depending on it are.
+    Parameters, report and exceptions are the same as `finalize_many`
+    with concurrent=True.
+    """
+    from .aio import finalize_many as _finalize_many
+    return _finalize_many(drivers, on_finalizing, on_finalized, on_exception, dependencies,
+                          max_concurrency, timeout)
 
 
 def finalize_many(drivers,
                   on_finalizing=None, on_finalized=None, on_exception=None,
-                  concurrent=False, dependencies=None):
+                  concurrent=False, dependencies=None, max_concurrency=None, timeout=None):
     """Finalize a group of drivers.
 
     :param drivers: an iterable of drivers.
@@ -587,54 +1017,20 @@ def finalize_many(drivers,
                          It takes the offending driver as the first argument and the
                          exception as the second one.
     :param concurrent: indicates that drivers with satisfied dependencies
-                       are finalized concurrently.
+                       are finalized concurrently. Each driver starts as
+                       soon as the drivers depending on it are finalized.
     :param dependencies: indicates which drivers depend on others to be initialized.
                          each key is a driver name, and the corresponding
                          value is an iterable with its dependencies.
                          The dependencies are used in reverse.
+    :param max_concurrency: maximum number of drivers finalized at the same time
+                            (when concurrent). None means no limit.
+    :param timeout: maximum time in seconds to finalize each driver (when
+                    concurrent). Exceeding it is reported as a TimeoutError.
+    :return: timing report.
+    :rtype: lantz.scheduler.ScheduleReport
     """
 
-    if dependencies:
-        names = {driver.name: driver for driver in drivers}
-
-        groups = _solve_dependencies(dependencies, set(names.keys()))
-        drivers = tuple(tuple(names[name] for name in group) for group in groups)
-        for subset in reversed(drivers):
-            finalize_many(subset, on_finalizing, on_finalized, on_exception, concurrent)
-        return
-
-    if concurrent:
-        def _done(d):
-            def _inner(f):
-                ex = f.exception()
-                if ex:
-                    if not on_exception:
-                        raise ex
-                    on_exception(d, ex)
-                else:
-                    if on_finalized:
-                        on_finalized(d)
-            return _inner
-
-        futs = []
-        for driver in drivers:
-            if on_finalizing:
-                on_finalizing(driver)
-            fut = driver.finalize_async()
-            fut.add_done_callback(_done(driver))
-            futs.append(fut)
-
-        futures.wait(futs)
-    else:
-        for driver in drivers:
-            if on_finalizing:
-                on_finalizing(driver)
-            try:
-                driver.finalize()
-            except Exception as ex:
-                if not on_exception:
-                    raise ex
-                on_exception(driver, ex)
-            else:
-                if on_finalized:
-                    on_finalized(driver)
+    return schedule(drivers, 'finalize', dependencies, reverse=True,
+                    concurrent=concurrent, max_concurrency=max_concurrency, timeout=timeout,
+                    on_start=on_finalizing, on_done=on_finalized, on_exception=on_exception)
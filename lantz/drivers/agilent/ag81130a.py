@@ -29,6 +29,9 @@ class Ag81130A(MessageBasedDriver):
         }
     }
 
+    #: SCPI compound commands, each starting from the root of the header tree.
+    BATCH_SEPARATOR = ';:'
+
     ON_OFF_VALS = OrderedDict([
                     ('on', 1),
                     ('off', 0),
@@ -128,7 +128,7 @@ class Goniometer(MessageBasedDriver):
 
 	@Action()
 	def unsafe_R_relative_move(self, distance):
-		if type(distance) == Q_:
+		if isinstance(distance, Q_):
 			distance = distance.to('mm').m
 		if abs(distance)>= 25:
 			raise ValueError("Cannot do relative move of more then 25 mm")
@@ -18,6 +18,8 @@ class IEEE4882Driver(Driver):
     You can use it as a mixin class.
     """
 
+    PERSIST_FIRMWARE = 'idn'
+
     @Feat(read_once=True)
     def idn(self):
         """Instrument identification.
@@ -56,7 +56,7 @@ def build_feat(command, **kwargs):
             setter = None
         else:
             def setter(self, value):
-                return self.send(command + str(value))
+                return self.write('{} {}'.format(command, value))
 
         return Feat(getter, setter, doc=func.__doc__, **kwargs)
 
@@ -68,3 +68,7 @@ class SCPIDriver(IEEE4882Driver):
 
     You can use it as a mixin class.
     """
+
+    #: Commands in a batch are joined as a compound message. The leading
+    #: colon resets the header path so each command is taken from the root.
+    BATCH_SEPARATOR = ';:'
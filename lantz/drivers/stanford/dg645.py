@@ -23,6 +23,9 @@ class DG645(MessageBasedDriver):
         }
     }
 
+    #: Multiple commands can be sent in one message separated by semicolons.
+    BATCH_SEPARATOR = ';'
+
     ERRORS = OrderedDict([
                    ('NO ERROR', 0),
                    ('EXECUTION ERROR: Illegal Value. \n'
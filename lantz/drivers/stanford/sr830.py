@@ -86,6 +86,9 @@ SAMPLE_RATES = OrderedDict([
     ('trigger', 14)
 ])
 
+#: Parameter codes used by SNAP? for each analog_value key.
+SNAP_CODES = {'x': 1, 'y': 2, 'r': 3, 't': 4, 1: 10, 2: 11}
+
 
 class SR830(MessageBasedDriver):
 
@@ -464,10 +467,27 @@ class SR830(MessageBasedDriver):
 
     @DictFeat(keys={'x', 'y', 'r', 't', 1, 2}, units='volt')
     def analog_value(self, key):
-        if key in 'xyrt':
+        return self._query_analog_value(key)
+
+    @analog_value.getter_many
+    def analog_value(self, keys):
+        """Read several values simultaneously using SNAP?,
+        which takes between 2 and 6 parameters.
+        """
+        values = []
+        for start in range(0, len(keys), 6):
+            chunk = keys[start:start + 6]
+            if len(chunk) == 1:
+                values.append(self._query_analog_value(chunk[0]))
+            else:
+                codes = ','.join(str(SNAP_CODES[key]) for key in chunk)
+                values.extend(float(value) for value in self.query('SNAP? {}'.format(codes)).split(','))
+        return values
+
+    def _query_analog_value(self, key):
+        if key in ('x', 'y', 'r', 't'):
             return self.query('OUTP? {}'.format(key))
-        else:
-            return self.query('OUTR? {}'.format(key))
+        return self.query('OUTR? {}'.format(key))
 
     @Action()
     def measure(self, channels):
@@ -50,13 +50,13 @@ class V1000F(Driver):
 
     def power2voltage(self, p):
         cal_vs, cal_ps = self._get_cal()
-        if type(p) is Q_:
+        if isinstance(p, Q_):
             p = p.to('W').m
         return Q_(np.interp(p, cal_ps, cal_vs, period=1000), 'V')
 
     def voltage2power(self, v):
         cal_vs, cal_ps = self._get_cal()
-        if type(v) is Q_:
+        if isinstance(v, Q_):
             v = v.to('V').m
         return Q_(np.interp(v, cal_vs, cal_ps), 'W')
 
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+    lantz.emission
+    ~~~~~~~~~~~~~~
+
+    Implements policies to control how often the changed signals of
+    Feats and DictFeats are emitted.
+
+    :copyright: 2015 by Lantz Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import time
+import threading
+from collections import namedtuple
+
+#: Data structure
+EmissionCounts = namedtuple('EmissionCounts', 'emitted coalesced dropped')
+
+
+def _merge(pending, args):
+    """Merge a new emission into a pending one: the new value wins
+    and the old value is the one before the first pending change.
+    """
+    return (args[0], pending[1]) + tuple(args[2:])
+
+
+class Immediate(object):
+    """Emit every change as soon as it happens.
+    """
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return '{}()'.format(self.__class__.__name__)
+
+    def emitter(self, signal):
+        return Emitter(self, signal)
+
+
+class MaxRate(Immediate):
+    """Emit at most `rate` times per second. Changes occurring in between
+    are delayed and only the last value is emitted.
+
+    :param rate: maximum number of emissions per second.
+    """
+
+    def __init__(self, rate):
+        if rate <= 0:
+            raise ValueError('rate must be positive, not {}'.format(rate))
+        self.rate = rate
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, self.rate)
+
+    def emitter(self, signal):
+        return RateLimitedEmitter(self, signal, 1. / self.rate)
+
+
+class PerTick(Immediate):
+    """Emit at most once per event loop iteration, merging all changes
+    occurring in between.
+
+    :param schedule: callable taking a callback that must be executed in the
+                     next event loop iteration (e.g. `loop.call_soon_threadsafe`).
+                     Defaults to the event loop of the Qt application, which
+                     runs in the main thread.
+    """
+
+    def __init__(self, schedule=None):
+        self.schedule = schedule
+
+    def emitter(self, signal):
+        return TickEmitter(self, signal, self.schedule or _qt_schedule())
+
+
+class Emitter(object):
+    """Emits a signal following a policy and counts the emissions.
+
+    :param policy: policy that created this emitter.
+    :param signal: bound signal.
+    """
+
+    def __init__(self, policy, signal):
+        self.policy = policy
+        self.signal = signal
+        self.emitted = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    @property
+    def counts(self):
+        return EmissionCounts(self.emitted, self.coalesced, self.dropped)
+
+    def emit(self, *args):
+        self.emitted += 1
+        self.signal.emit(*args)
+
+    def flush(self):
+        """Emit pending changes, if any.
+        """
+        pass
+
+
+class _DeferringEmitter(Emitter):
+
+    def __init__(self, policy, signal):
+        super().__init__(policy, signal)
+        self._lock = threading.Lock()
+        self._pending = None
+
+    def flush(self):
+        with self._lock:
+            args, self._pending = self._pending, None
+            if args is None:
+                return
+            self._flushed()
+        Emitter.emit(self, *args)
+
+    def _flushed(self):
+        pass
+
+
+class RateLimitedEmitter(_DeferringEmitter):
+    """Emitter for `MaxRate`. Superseded changes are counted as dropped.
+    """
+
+    def __init__(self, policy, signal, period):
+        super().__init__(policy, signal)
+        self.period = period
+        self._next = 0
+
+    def emit(self, *args):
+        with self._lock:
+            now = time.monotonic()
+            if self._pending is None:
+                if now >= self._next:
+                    self._next = now + self.period
+                    deliver = True
+                else:
+                    self._pending = args
+                    timer = threading.Timer(self._next - now, self.flush)
+                    timer.daemon = True
+                    timer.start()
+                    deliver = False
+            else:
+                self.dropped += 1
+                self._pending = _merge(self._pending, args)
+                deliver = False
+
+        if deliver:
+            Emitter.emit(self, *args)
+
+    def _flushed(self):
+        self._next = time.monotonic() + self.period
+
+
+class TickEmitter(_DeferringEmitter):
+    """Emitter for `PerTick`. Merged changes are counted as coalesced.
+    """
+
+    def __init__(self, policy, signal, schedule):
+        super().__init__(policy, signal)
+        self.schedule = schedule
+
+    def emit(self, *args):
+        with self._lock:
+            if self._pending is None:
+                self._pending = args
+                schedule = True
+            else:
+                self.coalesced += 1
+                self._pending = _merge(self._pending, args)
+                schedule = False
+
+        if schedule:
+            self.schedule(self.flush)
+
+
+_QT_SCHEDULER = None
+_QT_SCHEDULER_LOCK = threading.Lock()
+
+
+def _qt_scheduler(app):
+    """Return the object running callbacks in the thread of the Qt application,
+    creating it if necessary.
+    """
+    global _QT_SCHEDULER
+    with _QT_SCHEDULER_LOCK:
+        if _QT_SCHEDULER is not None:
+            return _QT_SCHEDULER
+
+        from .utils.qt import QtCore, SuperQObject
+
+        class _TickScheduler(SuperQObject):
+
+            requested = QtCore.Signal()
+
+            def __init__(self):
+                super().__init__()
+                self._lock = threading.Lock()
+                self._callbacks = []
+
+            def __call__(self, callback):
+                with self._lock:
+                    self._callbacks.append(callback)
+                    first = len(self._callbacks) == 1
+                if first:
+                    self.requested.emit()
+
+            def _run(self):
+                with self._lock:
+                    callbacks, self._callbacks = self._callbacks, []
+                for callback in callbacks:
+                    callback()
+
+        scheduler = _TickScheduler()
+        # Queued calls run in the thread of the receiver, which must have
+        # an event loop: emissions usually come from worker threads.
+        # Connect after moving, as the connection is bound to the thread
+        # of the receiver at that moment.
+        scheduler.moveToThread(app.thread())
+        scheduler.requested.connect(scheduler._run, QtCore.Qt.QueuedConnection)
+        _QT_SCHEDULER = scheduler
+        return scheduler
+
+
+def _qt_run_next_tick(callback):
+    from .utils.qt import QtCore
+
+    app = QtCore.QCoreApplication.instance()
+    if app is None:
+        # Without an event loop there is no tick to wait for.
+        callback()
+    else:
+        _qt_scheduler(app)(callback)
+
+
+def _qt_schedule():
+    """Return a callable that runs callbacks in the next iteration of the
+    event loop of the Qt application (in the thread of the application,
+    whichever thread schedules them), or immediately if there is no
+    Qt application.
+    """
+    return _qt_run_next_tick
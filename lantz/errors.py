@@ -23,3 +23,9 @@ class InstrumentError(Exception):
 
 class NotSupportedError(Exception):
     pass
+
+class ActionCancelled(Exception):
+    pass
+
+class DeadlineExceeded(ActionCancelled, LantzTimeoutError):
+    pass
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+    lantz.executor
+    ~~~~~~~~~~~~~~
+
+    Implements the executor running the asynchronous operations of drivers
+    (e.g. `update_async`, `refresh_async` and the `<action>_async` methods).
+
+    A bounded pool of worker threads is shared by all drivers. Tasks of
+    the same driver run one at a time in order of priority (lower first)
+    and submission. Queued tasks can be cancelled with `Future.cancel`.
+
+    Worker threads are started on demand and exit after being idle
+    for `idle_timeout` seconds.
+
+    :copyright: 2015 by Lantz Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import time
+import heapq
+import itertools
+import threading
+from concurrent import futures
+from weakref import WeakKeyDictionary
+
+from .stats import RunningStats, RunningState
+
+#: Priorities (lower runs first).
+INTERACTIVE = 0
+NORMAL = 10
+BULK = 20
+
+#: Number of worker threads of the default executor.
+DEFAULT_MAX_WORKERS = 16
+
+_DEFAULT = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_executor():
+    """Return the executor shared by drivers, creating it if necessary.
+
+    :rtype: SharedExecutor
+    """
+    global _DEFAULT
+    if _DEFAULT is None:
+        with _DEFAULT_LOCK:
+            if _DEFAULT is None:
+                _DEFAULT = SharedExecutor(DEFAULT_MAX_WORKERS)
+    return _DEFAULT
+
+
+def set_executor(executor):
+    """Set the executor shared by drivers.
+
+    The previous one, if any, is shut down after finishing its queued tasks.
+
+    :type executor: SharedExecutor
+    """
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        previous, _DEFAULT = _DEFAULT, executor
+    if previous is not None and previous is not executor:
+        previous.shutdown(wait=False)
+
+
+class _WorkItem(object):
+
+    __slots__ = ('future', 'fn', 'args', 'kwargs', 'submitted')
+
+    def __init__(self, future, fn, args, kwargs):
+        self.future = future
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.submitted = time.monotonic()
+
+
+class _Lane(object):
+    """Queue of the tasks of a single owner.
+    """
+
+    __slots__ = ('items', 'running', 'wait')
+
+    def __init__(self):
+        #: heap of (priority, sequence, _WorkItem)
+        self.items = []
+        self.running = False
+        #: time in seconds that the tasks spent queued.
+        self.wait = RunningState()
+
+
+class SharedExecutor(object):
+    """Bounded thread pool running one task at a time per owner.
+
+    :param max_workers: maximum number of worker threads.
+    :param idle_timeout: seconds after which an idle worker thread exits.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, idle_timeout=5.):
+        if max_workers < 1:
+            raise ValueError('max_workers must be greater than 0')
+        self.max_workers = max_workers
+        self.idle_timeout = idle_timeout
+
+        #: Time in seconds that tasks spent queued ('wait')
+        #: and running ('run').
+        #: :type: RunningStats
+        self.timing = RunningStats()
+
+        self._cond = threading.Condition()
+        self._sequence = itertools.count()
+
+        #: owner: _Lane
+        self._lanes = WeakKeyDictionary()
+
+        #: heap of (priority, sequence, _Lane) of lanes that can run.
+        #: A lane might appear more than once or be stale, this is checked on pop.
+        self._ready = []
+
+        self._threads = set()
+        # Workers waiting for a task, and how many of them have been
+        # notified but not yet woken up. Only workers change _idle.
+        self._idle = 0
+        self._waking = 0
+        self._shutdown = False
+
+    def submit(self, owner, priority, fn, *args, **kwargs):
+        """Schedule fn(*args, **kwargs) to run after the queued tasks of owner
+        with the same or higher priority (lower value).
+
+        :param owner: object serializing the tasks (usually a driver).
+        :param priority: lower values run first.
+        :return type: concurrent.futures.Future
+        """
+        future = futures.Future()
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError('cannot schedule new futures after shutdown')
+
+            lane = self._lanes.get(owner)
+            if lane is None:
+                lane = self._lanes[owner] = _Lane()
+
+            sequence = next(self._sequence)
+            heapq.heappush(lane.items, (priority, sequence, _WorkItem(future, fn, args, kwargs)))
+            if not lane.running:
+                heapq.heappush(self._ready, (priority, sequence, lane))
+                self._wake()
+
+        return future
+
+    def queue_depth(self, owner=None):
+        """Return the number of queued tasks (not running nor cancelled),
+        for all owners or for a given one.
+        """
+        with self._cond:
+            if owner is None:
+                lanes = list(self._lanes.values())
+            else:
+                lanes = [self._lanes[owner]] if owner in self._lanes else []
+            return sum(1 for lane in lanes for _, _, item in lane.items
+                       if not item.future.cancelled())
+
+    def wait_time(self, owner):
+        """Return the time in seconds that the tasks of owner spent queued,
+        or None if owner has not submitted tasks.
+
+        :rtype: lantz.stats.RunningState
+        """
+        with self._cond:
+            lane = self._lanes.get(owner)
+            return None if lane is None else lane.wait
+
+    def shutdown(self, wait=True, cancel_pending=False):
+        """Stop accepting tasks and let the workers exit once the queue is empty.
+
+        :param wait: block until the worker threads exit.
+        :param cancel_pending: cancel the tasks that have not started.
+        """
+        with self._cond:
+            self._shutdown = True
+            if cancel_pending:
+                for lane in self._lanes.values():
+                    for _, _, item in lane.items:
+                        item.future.cancel()
+            self._cond.notify_all()
+            threads = list(self._threads)
+
+        if wait:
+            for thread in threads:
+                if thread is not threading.current_thread():
+                    thread.join()
+
+    def _wake(self):
+        # Must be called holding self._cond
+        if self._idle > self._waking:
+            self._waking += 1
+            self._cond.notify()
+        elif len(self._threads) < self.max_workers:
+            thread = threading.Thread(target=self._worker, name='lantz-executor')
+            thread.daemon = True
+            self._threads.add(thread)
+            thread.start()
+
+    def _next(self):
+        # Must be called holding self._cond
+        while self._ready:
+            _, _, lane = heapq.heappop(self._ready)
+            if lane.running:
+                continue
+            while lane.items:
+                _, _, item = heapq.heappop(lane.items)
+                if item.future.set_running_or_notify_cancel():
+                    lane.running = True
+                    return lane, item
+        return None, None
+
+    def _worker(self):
+        thread = threading.current_thread()
+        while True:
+            with self._cond:
+                lane, item = self._next()
+                while item is None:
+                    if self._shutdown:
+                        self._threads.discard(thread)
+                        return
+                    self._idle += 1
+                    notified = self._cond.wait(self.idle_timeout)
+                    self._idle -= 1
+                    if notified:
+                        self._waking -= 1
+                    # A notification might be lost as the wait times out (and
+                    # shutdown notifies all), so keep the count of pending ones
+                    # consistent with the workers that can receive them.
+                    self._waking = max(min(self._waking, self._idle), 0)
+                    if not notified:
+                        lane, item = self._next()
+                        if item is None:
+                            self._threads.discard(thread)
+                            return
+                        break
+                    lane, item = self._next()
+
+                tic = time.monotonic()
+                self.timing.add('wait', tic - item.submitted)
+                lane.wait.add(tic - item.submitted)
+
+            try:
+                result = item.fn(*item.args, **item.kwargs)
+            except BaseException as e:
+                item.future.set_exception(e)
+            else:
+                item.future.set_result(result)
+            # Drop references to arguments and result.
+            del item
+
+            with self._cond:
+                self.timing.add('run', time.monotonic() - tic)
+                lane.running = False
+                if lane.items:
+                    priority, sequence, _ = lane.items[0]
+                    heapq.heappush(self._ready, (priority, sequence, lane))
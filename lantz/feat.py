@@ -12,9 +12,11 @@
 
 import time
 import copy
-from weakref import WeakKeyDictionary
+import logging
 
 from . import Q_
+from . import trace
+from .stats import perf_counter_ns
 from .processors import (Processor, ToQuantityProcessor, FromQuantityProcessor,
                          MapProcessor, ReverseMapProcessor, RangeProcessor)
 
@@ -41,28 +43,107 @@ class _NamedObject(object):
 MISSING = _NamedObject('MISSING')
 
 
-def _dget(adict, instance=MISSING, key=MISSING):
-
-    try:
-        adict = adict[instance]
-    except KeyError:
-        adict = adict[MISSING]
+def _differs(current, value):
+    """Return True if value needs to be set given the cached value.
+    """
+    if current is MISSING:
+        return True
     try:
-        return adict[key]
-    except KeyError:
-        return adict[MISSING]
+        return not bool(current == value)
+    except Exception:
+        # e.g. arrays or quantities of incompatible dimensions.
+        return True
+
+
+class _FeatState(object):
+    """State of a Feat for a given instance, stored in the instance.
+
+    Modifiers customized for the instance are stored as overlays (only
+    the changed entries, per key) over the modifiers of the Feat, which
+    are never copied.
+    """
+
+    __slots__ = ('value', 'timestamp', 'overlays', 'compiled', 'generation')
+
+    def __init__(self, generation):
+        #: cached value (a dictionary for DictFeat)
+        self.value = MISSING
+
+        #: key: time.monotonic() of the last cache update
+        self.timestamp = {}
+
+        #: key: dictionary of customized modifiers
+        self.overlays = {}
+
+        #: key: _Compiled
+        self.compiled = {}
 
-def _dset(adict, value, instance=MISSING, key=MISSING):
-    if instance not in adict:
-        adict[instance] = copy.deepcopy(adict[MISSING])
+        #: generation of the Feat when compiled was filled
+        self.generation = generation
 
-    if key not in adict[instance]:
-        adict[instance][key] = copy.deepcopy(adict[instance][MISSING])
 
-    if isinstance(adict[instance][key], dict):
-        adict[instance][key].update(value)
-    else:
-        adict[instance][key] = value
+class _Compiled(object):
+    """Resolved state of a Feat for a given (instance, key) pair.
+
+    It is built on first access and discarded when the modifiers change,
+    avoiding dictionary lookups and string formatting on every get/set.
+    """
+
+    __slots__ = ('name', 'get_timing', 'set_timing',
+                 'get_lock_timing', 'get_post_timing', 'set_lock_timing', 'set_pre_timing',
+                 'get_processors', 'set_processors', 'cache_ttl', 'emission', 'history', 'units')
+
+    def __init__(self, feat, instance, key):
+        if key is MISSING:
+            self.name = feat.name
+        else:
+            self.name = '{}[{!r}]'.format(feat.name, key)
+        self.get_timing = 'get_' + self.name
+        self.set_timing = 'set_' + self.name
+        self.get_lock_timing = self.get_timing + '.lock'
+        self.get_post_timing = self.get_timing + '.post'
+        self.set_lock_timing = self.set_timing + '.lock'
+        self.set_pre_timing = self.set_timing + '.pre'
+        overlay = feat._overlay(instance, key)
+        if overlay is None:
+            modifiers = feat.modifiers
+            get_processors, set_processors = feat.get_processors, feat.set_processors
+        else:
+            modifiers = dict(feat.modifiers)
+            modifiers.update(overlay)
+            get_processors, set_processors = feat.rebuild(modifiers=modifiers)
+        self.get_processors = tuple(reversed(get_processors))
+        self.set_processors = tuple(set_processors)
+        self.cache_ttl = modifiers['cache_ttl']
+        self.emission = modifiers['emission']
+        self.history = modifiers['history']
+        self.units = modifiers['units']
+
+
+class _DictCompiled(_Compiled):
+    """Resolved state of a DictFeat for a given (instance, key) pair.
+
+    Additionally stores the result of validating the key against the
+    `keys` modifier, both as a user key (`valid`, `target`) and as an
+    instrument key (`cacheable`).
+    """
+
+    __slots__ = ('keys', 'valid', 'target', 'cacheable')
+
+    def __init__(self, feat, instance, key):
+        super().__init__(feat, instance, key)
+        keys = feat.modifier(instance, key, 'keys')
+        self.keys = keys
+
+        self.valid = not keys or key in keys
+        if self.valid and isinstance(keys, dict):
+            self.target = keys[key]
+        else:
+            self.target = key
+
+        if isinstance(keys, dict):
+            keys = keys.values()
+        self.cacheable = not keys or key is MISSING or key in keys
 
 
 class Feat(object):
@@ -87,6 +168,17 @@ class Feat(object):
                    changed but only tested to belong to the container.
     :param units: `Quantity` or string that can be interpreted as units.
     :param procs: Other callables to be applied to input arguments.
+    :param read_once: the value is read from the instrument only once and
+                      afterwards taken from the cache.
+    :param cache_ttl: time in seconds during which a cached value is
+                      considered fresh and returned without querying the
+                      instrument. None (default) means always query.
+    :param emission: policy controlling the emission of the changed signal
+                     (see `lantz.emission`). None (default) means use the
+                     driver `emission_policy`.
+    :param history: number of (timestamp, value) points of the cached value
+                    to record (see `Driver.history`). None (default) means
+                    do not record.
 
     """
 
@@ -94,19 +186,19 @@ class Feat(object):
 
     def __init__(self, fget=MISSING, fset=None, doc=None, *,
                  values=None, units=None, limits=None, procs=None,
-                 read_once=False):
+                 read_once=False, cache_ttl=None, emission=None, history=None):
         self.fget = fget
         self.fset = fset
         self.__doc__ = doc
         self.name = '?'
 
-        #: instance: value
-        self.value = WeakKeyDictionary()
+        #: processors built from the modifiers, for instances and keys
+        #: without customized modifiers.
+        self.get_processors = ()
+        self.set_processors = ()
 
-        #: instance: key: value
-        self.modifiers = WeakKeyDictionary()
-        self.get_processors = WeakKeyDictionary()
-        self.set_processors = WeakKeyDictionary()
+        #: incremented to discard the resolved state of all instances.
+        self._generation = 0
 
         # Take documentation from fget or fset
         # if not provided explicitly.
@@ -116,12 +208,14 @@ class Feat(object):
             elif fset and fset.__doc__:
                 self.__doc__ = fset.__doc__
 
-        self.modifiers[MISSING] = {MISSING: {'values': values,
-                                             'units': units,
-                                             'limits': limits,
-                                             'processors': procs}}
-        self.get_processors[MISSING] = {MISSING: ()}
-        self.set_processors[MISSING] = {MISSING: ()}
+        #: modifier name: value (customized per instance with FeatProxy).
+        self.modifiers = {'values': values,
+                          'units': units,
+                          'limits': limits,
+                          'processors': procs,
+                          'cache_ttl': cache_ttl,
+                          'emission': emission,
+                          'history': history}
 
         self.read_once = read_once
 
@@ -129,7 +223,7 @@ class Feat(object):
 
     def rebuild(self, instance=MISSING, key=MISSING, build_doc=False, modifiers=None, store=False):
         if not modifiers:
-            modifiers = _dget(self.modifiers, instance, key)
+            modifiers = self.modifier(instance, key)
 
         values = modifiers['values']
         units = modifiers['units']
@@ -160,11 +254,104 @@ class Feat(object):
             _dochelper(self)
 
         if store:
-            _dset(self.get_processors, get_processors, instance, key)
-            _dset(self.set_processors, set_processors, instance, key)
+            if instance is MISSING:
+                self.get_processors = tuple(get_processors)
+                self.set_processors = tuple(set_processors)
+            self.invalidate(instance)
 
         return get_processors, set_processors
 
+    def _state(self, instance):
+        states = instance._feat_states
+        try:
+            return states[self]
+        except KeyError:
+            return states.setdefault(self, _FeatState(self._generation))
+
+    def _overlay(self, instance, key=MISSING):
+        """Return the modifiers customized for an instance and key,
+        or None if there are none.
+        """
+        if instance is MISSING:
+            return None
+        overlays = self._state(instance).overlays
+        if not overlays:
+            return None
+        common = overlays.get(MISSING)
+        specific = overlays.get(key) if key is not MISSING else None
+        if not specific:
+            return common or None
+        if not common:
+            return specific
+        overlay = dict(common)
+        overlay.update(specific)
+        return overlay
+
+    def modifier(self, instance=MISSING, key=MISSING, name=None):
+        """Return the value of a modifier for a given instance and key,
+        or a dictionary with all of them if name is None.
+        """
+        overlay = self._overlay(instance, key)
+        if name is not None:
+            if overlay is not None and name in overlay:
+                return overlay[name]
+            return self.modifiers[name]
+        if overlay is None:
+            return self.modifiers
+        modifiers = dict(self.modifiers)
+        modifiers.update(overlay)
+        return modifiers
+
+    def set_modifier(self, instance, key, name, value):
+        """Customize a modifier for a given instance (and key if not MISSING).
+        The Feat modifiers are not copied, only the changed value is stored.
+
+        :raises AttributeError: if name is not a valid modifier.
+        """
+        if name not in self.modifiers:
+            raise AttributeError('{} is not a modifier of {}'.format(name, self.name))
+
+        overlay = self._state(instance).overlays.setdefault(key, {})
+        previous = overlay.get(name, MISSING)
+        overlay[name] = value
+        self.invalidate(instance)
+        try:
+            # Build now to raise invalid values when they are given.
+            self.compiled(instance, key)
+        except Exception:
+            if previous is MISSING:
+                del overlay[name]
+            else:
+                overlay[name] = previous
+            self.invalidate(instance)
+            raise
+
+    def compiled(self, instance, key=MISSING):
+        """Return the resolved state for a given instance and key,
+        building it if necessary.
+        """
+        state = self._state(instance)
+        if state.generation != self._generation:
+            state.compiled = {}
+            state.generation = self._generation
+        try:
+            return state.compiled[key]
+        except KeyError:
+            compiled = state.compiled[key] = self._compile(instance, key)
+            return compiled
+
+    def _compile(self, instance, key):
+        return _Compiled(self, instance, key)
+
+    def invalidate(self, instance=MISSING):
+        """Discard the resolved state of an instance (or of all instances
+        if MISSING), forcing it to be rebuilt on next access.
+        """
+        if instance is MISSING:
+            self._generation += 1
+        else:
+            self._state(instance).compiled = {}
+
     def __call__(self, func):
         if self.fget is MISSING:
             return self.getter(func)
@@ -194,96 +381,208 @@ class Feat(object):
         return self
 
     def post_get(self, value, instance=None, key=MISSING):
-        for processor in reversed(_dget(self.get_processors, instance, key)):
+        if instance is None:
+            processors = reversed(self.get_processors)
+        else:
+            processors = self.compiled(instance, key).get_processors
+        for processor in processors:
             value = processor(value)
         return value
 
     def pre_set(self, value, instance=None, key=MISSING):
-        for processor in _dget(self.set_processors, instance, key):
+        if instance is None:
+            processors = self.set_processors
+        else:
+            processors = self.compiled(instance, key).set_processors
+        for processor in processors:
+            value = processor(value)
+        return value
+
+    def _post_get(self, compiled, value, instance, key):
+        # post_get might have been replaced using post_getter
+        # or overridden in a subclass.
+        if 'post_get' in self.__dict__ or type(self).post_get is not Feat.post_get:
+            return self.post_get(value, instance, key)
+        for processor in compiled.get_processors:
             value = processor(value)
         return value
 
-    def get(self, instance, owner=None, key=MISSING):
+    def _pre_set(self, compiled, value, instance, key):
+        # pre_set might have been replaced using post_setter
+        # or overridden in a subclass.
+        if 'pre_set' in self.__dict__ or type(self).pre_set is not Feat.pre_set:
+            return self.pre_set(value, instance, key)
+        for processor in compiled.set_processors:
+            value = processor(value)
+        return value
+
+    def _fresh_cache(self, instance, key, compiled, max_age=None):
+        """Return the cached value if it can be used instead of querying
+        the instrument (read_once or younger than max_age/cache_ttl),
+        MISSING otherwise.
+        """
+        current = self.get_cache(instance, key)
+        if current is MISSING or self.read_once:
+            return current
+        if max_age is None:
+            max_age = compiled.cache_ttl
+        if max_age is not None and self.cache_age(instance, key) <= max_age:
+            return current
+        return MISSING
+
+    def get(self, instance, owner=None, key=MISSING, max_age=None, force_refresh=False):
         if instance is None:
             return self
 
-        name = self.name + ('' if key is MISSING else '[{!r}]'.format(key))
+        compiled = self.compiled(instance, key)
+        name = compiled.name
         if self.fget is None or self.fget is MISSING:
             raise AttributeError('{} is a write-only feature'.format(name))
 
-        current = self.get_cache(instance, key)
-        if self.read_once and current is not MISSING:
-            return current
+        if not force_refresh:
+            current = self._fresh_cache(instance, key, compiled, max_age)
+            if current is not MISSING:
+                instance.cache_hits[compiled.get_timing] += 1
+                return current
+
+        persisted = MISSING
+        if self.read_once:
+            from . import persist
+            if not force_refresh:
+                persisted = persist.lookup(instance, self.name, key)
 
         # This part calls to the underlying get function wrapping
         # and timing, caching, logging and error handling
-        with instance._lock:
-            instance.log_info('Getting {}', name)
-
-            try:
-                tic = time.time()
-                if key is MISSING:
-                    value = self.fget(instance)
+        timing = instance.timing
+        tracing = trace.enabled
+        tic = start = perf_counter_ns()
+        try:
+            with instance._lock:
+                timing.add_ns(compiled.get_lock_timing, perf_counter_ns() - tic)
+                info = instance.log_enabled(logging.INFO)
+
+                if persisted is MISSING:
+                    if info:
+                        instance.log_info('Getting {}', name)
+
+                    try:
+                        tic = perf_counter_ns()
+                        if key is MISSING:
+                            value = self.fget(instance)
+                        else:
+                            value = self.fget(instance, key)
+                    except Exception as e:
+                        instance.log_error('While getting {}: {}', name, e)
+                        instance.errors[compiled.get_timing] += 1
+                        raise e
+
+                    timing.add_ns(compiled.get_timing, perf_counter_ns() - tic)
+
+                    if self.read_once:
+                        persist.store(instance, self.name, key, value)
                 else:
-                    value = self.fget(instance, key)
-            except Exception as e:
-                instance.log_error('While getting {}: {}', name, e)
-                raise e
-
-            instance.timing.add('get_' + name, time.time() - tic)
-
-            instance.log_debug('(raw) Got {} for {}', value, name)
-            try:
-                value = self.post_get(value, instance, key)
-            except Exception as e:
-                instance.log_error('While post-processing {} for {}: {}', value, name, e)
-                raise e
-
-            instance.log_info('Got {} for {}', value, name, lantz_feat=(name, str(value)))
-
-            self.set_cache(instance, value, key)
-
-        return value
+                    value = persisted
+                    if info:
+                        instance.log_info('Getting {} from persistent cache', name)
+
+                if instance.log_enabled(logging.DEBUG):
+                    instance.log_debug('(raw) Got {} for {}', value, name)
+                try:
+                    tic = perf_counter_ns()
+                    value = self._post_get(compiled, value, instance, key)
+                except Exception as e:
+                    instance.log_error('While post-processing {} for {}: {}', value, name, e)
+                    instance.errors[compiled.get_timing] += 1
+                    raise e
+                timing.add_ns(compiled.get_post_timing, perf_counter_ns() - tic)
+
+                if info:
+                    instance.log_info('Got {} for {}', value, name, lantz_feat=(name, str(value)))
+
+                self.set_cache(instance, value, key)
+
+            return value
+        finally:
+            if tracing:
+                trace.record(instance, compiled.get_timing, 'feat', start, _trace_args(key))
 
     def set(self, instance, value, force=False, key=MISSING):
-        name = self.name + ('' if key is MISSING else '[{!r}]'.format(key))
+        compiled = self.compiled(instance, key)
+        name = compiled.name
 
         if self.fset is None:
             raise AttributeError('{} is a read-only feature'.format(name))
 
         # This part calls to the underlying get function wrapping
         # and timing, caching, logging and error handling
-        with instance._lock:
-            current_value = self.get_cache(instance, key)
-
-            if not force and value == current_value:
-                instance.log_info('No need to set {} = {} (current={}, force={})', name, value, current_value, force)
-                return
-
-            instance.log_info('Setting {} = {} (current={}, force={})', name, value, current_value, force)
-
-            try:
-                t_value = self.pre_set(value, instance, key)
-            except Exception as e:
-                instance.log_error('While pre-processing {} for {}: {}', value, name, e)
-                raise e
-            instance.log_debug('(raw) Setting {} = {}', name, t_value)
-
-            try:
-                tic = time.time()
-                if key is MISSING:
-                    self.fset(instance, t_value)
-                else:
-                    self.fset(instance, key, t_value)
-            except Exception as e:
-                instance.log_error('While setting {} to {}. {}', name, value, e)
-                raise e
-
-            instance.timing.add('set_' + name, time.time() - tic)
-
-            instance.log_info('{} was set to {}', name, value, lantz_feat=(name, str(value)))
-
+        timing = instance.timing
+        tracing = trace.enabled
+        tic = start = perf_counter_ns()
+        try:
+            with instance._lock:
+                timing.add_ns(compiled.set_lock_timing, perf_counter_ns() - tic)
+                current_value = self._current(instance, key)
+                info = instance.log_enabled(logging.INFO)
+
+                if not force and not _differs(current_value, value):
+                    if info:
+                        instance.log_info('No need to set {} = {} (current={}, force={})', name, value, current_value, force)
+                    return
+
+                if info:
+                    instance.log_info('Setting {} = {} (current={}, force={})', name, value, current_value, force)
+
+                try:
+                    tic = perf_counter_ns()
+                    t_value = self._pre_set(compiled, value, instance, key)
+                except Exception as e:
+                    instance.log_error('While pre-processing {} for {}: {}', value, name, e)
+                    instance.errors[compiled.set_timing] += 1
+                    raise e
+                timing.add_ns(compiled.set_pre_timing, perf_counter_ns() - tic)
+                if instance.log_enabled(logging.DEBUG):
+                    instance.log_debug('(raw) Setting {} = {}', name, t_value)
+
+                try:
+                    tic = perf_counter_ns()
+                    if key is MISSING:
+                        self.fset(instance, t_value)
+                    else:
+                        self.fset(instance, key, t_value)
+                except Exception as e:
+                    instance.log_error('While setting {} to {}. {}', name, value, e)
+                    instance.errors[compiled.set_timing] += 1
+                    raise e
+
+                timing.add_ns(compiled.set_timing, perf_counter_ns() - tic)
+
+                if info:
+                    instance.log_info('{} was set to {}', name, value, lantz_feat=(name, str(value)))
+
+                self._set_done(instance, value, key)
+        finally:
+            if tracing:
+                trace.record(instance, compiled.set_timing, 'feat', start, _trace_args(key, value=value))
+
+    def _set_done(self, instance, value, key=MISSING):
+        """Update the cache after a successful set, or defer the update
+        until the end of the batch if the instance is within one.
+        """
+        if instance._batch is None:
             self.set_cache(instance, value, key)
+        else:
+            instance._batch.add_update(self, value, key)
+
+    def _current(self, instance, key=MISSING):
+        """Return the value set within the current batch of the instance
+        (which is not yet in the cache) or the cached value.
+        """
+        batch = instance._batch
+        if batch is not None:
+            value = batch.pending.get((self, key), MISSING)
+            if value is not MISSING:
+                return value
+        return self.get_cache(instance, key)
 
     def __get__(self, instance, owner=None):
         return self.get(instance)
@@ -295,23 +594,35 @@ class Feat(object):
         raise AttributeError('{} is a permanent feat of {}'.format(self.name, instance.__class__.__name__))
 
     def get_cache(self, instance, key=MISSING):
+        return self._state(instance).value
+
+    def cache_age(self, instance, key=MISSING):
+        """Return the time in seconds since the cached value was last
+        updated, or None if there is no cached value.
+        """
         try:
-            return self.value[instance]
+            return time.monotonic() - self._state(instance).timestamp[key]
         except KeyError:
-            return MISSING
+            return None
 
     def set_cache(self, instance, value, key=MISSING):
         old_value = self.get_cache(instance, key)
+        compiled = self.compiled(instance, key)
+        state = self._state(instance)
 
-        if value == old_value:
+        timestamp = state.timestamp[key] = time.monotonic()
+        if compiled.history:
+            instance._record_history(compiled, timestamp, value)
+
+        if not _differs(old_value, value):
             return
 
         if isinstance(value, Q_):
             value = copy.copy(value)
 
-        self.value[instance] = value
+        state.value = value
 
-        getattr(instance, self.name + '_changed').emit(value, old_value)
+        instance._emit_changed(self.name, compiled, value, old_value)
 
 
 class DictFeat(Feat):
@@ -321,34 +632,214 @@ class DictFeat(Feat):
     Takes the same parameters as `Feat`, plus:
 
     :param keys: List/tuple restricts the keys to the specified ones.
+    :param fget_many: getter for multiple keys in a single instrument
+                      transaction. It takes a list of keys and returns
+                      a sequence of values in the same order.
+    :param fset_many: setter for multiple keys in a single instrument
+                      transaction. It takes a dictionary mapping keys
+                      to values.
 
     """
 
     def __init__(self, fget=MISSING, fset=None, doc=None, *,
-                 keys=None, **kwargs):
+                 keys=None, fget_many=None, fset_many=None, **kwargs):
         super().__init__(fget, fset, doc, **kwargs)
-        self.modifiers[MISSING][MISSING]['keys'] = keys
+        self.modifiers['keys'] = keys
+        self.fget_many = fget_many
+        self.fset_many = fset_many
 
+    def getter_many(self, func):
+        self.fget_many = func
+        return self
+
+    def setter_many(self, func):
+        self.fset_many = func
+        return self
+
+    def _compile(self, instance, key):
+        return _DictCompiled(self, instance, key)
 
     def getitem(self, instance, key):
-        keys = _dget(self.modifiers, instance, key)['keys']
-        if keys and not key in keys:
+        compiled = self.compiled(instance, key)
+        if not compiled.valid:
             raise KeyError('{} is not valid key for {} {}'.format(key, self.name,
-                                                                    keys))
-        if isinstance(keys, dict):
-            key = keys[key]
+                                                                    compiled.keys))
 
-        return self.get(instance, instance.__class__, key)
+        return self.get(instance, instance.__class__, compiled.target)
 
     def setitem(self, instance, key, value, force=False):
-        keys = _dget(self.modifiers, instance, key)['keys']
-        if keys and not key in keys:
+        compiled = self.compiled(instance, key)
+        if not compiled.valid:
             raise KeyError('{} is not valid key for {} {}'.format(key, self.name,
-                                                                    keys))
-        if isinstance(keys, dict):
-            key = keys[key]
+                                                                    compiled.keys))
+
+        self.set(instance, value, force, compiled.target)
+
+    def _targets(self, instance, keys):
+        targets = []
+        for key in keys:
+            compiled = self.compiled(instance, key)
+            if not compiled.valid:
+                raise KeyError('{} is not valid key for {} {}'.format(key, self.name,
+                                                                        compiled.keys))
+            targets.append(compiled.target)
+        return targets
+
+    def get_many(self, instance, keys, max_age=None):
+        """Get the values for multiple keys.
+
+        If `fget_many` is defined, values that cannot be taken from the cache
+        are queried in a single instrument transaction. Otherwise, each key
+        is queried independently.
+
+        :param keys: iterable of keys.
+        :param max_age: see `Feat.get`.
+        :return: a dictionary mapping keys to values.
+        """
+        keys = list(keys)
+        targets = self._targets(instance, keys)
+
+        if self.fget_many is None:
+            return {key: self.get(instance, instance.__class__, target, max_age)
+                    for key, target in zip(keys, targets)}
+
+        out = {}
+        pending = []
+        for key, target in zip(keys, targets):
+            compiled = self.compiled(instance, target)
+            current = self._fresh_cache(instance, target, compiled, max_age)
+            if current is MISSING:
+                pending.append((key, target))
+            else:
+                instance.cache_hits[compiled.get_timing] += 1
+                out[key] = current
+
+        if not pending:
+            return out
 
-        self.set(instance, value, force, key)
+        name = self.name
+        targets = [target for _, target in pending]
+
+        tracing = trace.enabled
+        tic = start = perf_counter_ns()
+        try:
+            with instance._lock:
+                instance.timing.add_ns('get_many_' + name + '.lock', perf_counter_ns() - tic)
+                info = instance.log_enabled(logging.INFO)
+                if info:
+                    instance.log_info('Getting {} for {}', name, targets)
+
+                try:
+                    tic = perf_counter_ns()
+                    values = self.fget_many(instance, targets)
+                except Exception as e:
+                    instance.log_error('While getting {} for {}: {}', name, targets, e)
+                    instance.errors['get_many_' + name] += 1
+                    raise e
+
+                instance.timing.add_ns('get_many_' + name, perf_counter_ns() - tic)
+
+                if instance.log_enabled(logging.DEBUG):
+                    instance.log_debug('(raw) Got {} for {} {}', values, name, targets)
+
+                for (key, target), value in zip(pending, values):
+                    compiled = self.compiled(instance, target)
+                    try:
+                        value = self._post_get(compiled, value, instance, target)
+                    except Exception as e:
+                        instance.log_error('While post-processing {} for {}: {}', value, compiled.name, e)
+                        instance.errors['get_many_' + name] += 1
+                        raise e
+
+                    if info:
+                        instance.log_info('Got {} for {}', value, compiled.name,
+                                          lantz_feat=(compiled.name, str(value)))
+
+                    self.set_cache(instance, value, target)
+                    out[key] = value
+
+            return out
+        finally:
+            if tracing:
+                trace.record(instance, 'get_many_' + name, 'feat', start, {'keys': targets})
+
+    def set_many(self, instance, values, force=False):
+        """Set the values for multiple keys.
+
+        If `fset_many` is defined, values that differ from the cache
+        (or all if force is True) are sent in a single instrument transaction.
+        Otherwise, each key is set independently.
+
+        :param values: a dictionary mapping keys to values.
+        :param force: apply change even when the cache says it is not necessary.
+        """
+        keys = list(values.keys())
+        targets = self._targets(instance, keys)
+
+        if self.fset_many is None:
+            for key, target in zip(keys, targets):
+                self.set(instance, values[key], force, target)
+            return
+
+        name = self.name
+
+        tracing = trace.enabled
+        tic = start = perf_counter_ns()
+        try:
+            with instance._lock:
+                instance.timing.add_ns('set_many_' + name + '.lock', perf_counter_ns() - tic)
+                info = instance.log_enabled(logging.INFO)
+
+                pending = []
+                for key, target in zip(keys, targets):
+                    compiled = self.compiled(instance, target)
+                    value = values[key]
+                    current_value = self._current(instance, target)
+                    if not force and not _differs(current_value, value):
+                        if info:
+                            instance.log_info('No need to set {} = {} (current={}, force={})',
+                                              compiled.name, value, current_value, force)
+                        continue
+
+                    try:
+                        t_value = self._pre_set(compiled, value, instance, target)
+                    except Exception as e:
+                        instance.log_error('While pre-processing {} for {}: {}', value, compiled.name, e)
+                        instance.errors['set_many_' + name] += 1
+                        raise e
+
+                    pending.append((target, value, t_value))
+
+                if not pending:
+                    return
+
+                if info:
+                    instance.log_info('Setting {} = {} (force={})', name,
+                                      {target: value for target, value, _ in pending}, force)
+
+                t_values = {target: t_value for target, _, t_value in pending}
+                if instance.log_enabled(logging.DEBUG):
+                    instance.log_debug('(raw) Setting {} = {}', name, t_values)
+
+                try:
+                    tic = perf_counter_ns()
+                    self.fset_many(instance, t_values)
+                except Exception as e:
+                    instance.log_error('While setting {} to {}. {}', name, t_values, e)
+                    instance.errors['set_many_' + name] += 1
+                    raise e
+
+                instance.timing.add_ns('set_many_' + name, perf_counter_ns() - tic)
+
+                for target, value, _ in pending:
+                    if info:
+                        key_name = self.compiled(instance, target).name
+                        instance.log_info('{} was set to {}', key_name, value,
+                                          lantz_feat=(key_name, str(value)))
+                    self._set_done(instance, value, target)
+        finally:
+            if tracing:
+                trace.record(instance, 'set_many_' + name, 'feat', start, {'values': values})
 
     def __get__(self, instance, owner=None):
         if not instance:
@@ -368,32 +859,47 @@ class DictFeat(Feat):
         raise AttributeError('{} is a permanent attribute from {}', self.name, instance.__class__.__name__)
 
     def get_cache(self, instance, key=MISSING):
-        keys = _dget(self.modifiers, instance, key)['keys']
-        if instance not in self.value:
-            self.value[instance] = dict()
-        if isinstance(keys, dict):
-            keys = keys.values()
-        if keys and key not in keys:
+        compiled = self.compiled(instance, key)
+        state = self._state(instance)
+        values = state.value
+        if values is MISSING:
+            values = state.value = dict()
+        if not compiled.cacheable:
+            keys = compiled.keys
+            if isinstance(keys, dict):
+                keys = keys.values()
             raise KeyError('{} is not valid key for {} {}'.format(key, self.name,
                                                                   keys))
         if key is MISSING:
-            return self.value[instance]
+            return values
         else:
-            return self.value[instance].get(key, MISSING)
+            return values.get(key, MISSING)
 
     def set_cache(self, instance, value, key=MISSING):
         old_value = self.get_cache(instance, key)
+        compiled = self.compiled(instance, key)
+        state = self._state(instance)
+
+        timestamp = state.timestamp[key] = time.monotonic()
+        if compiled.history and key is not MISSING:
+            instance._record_history(compiled, timestamp, value)
 
-        if value == old_value:
+        if not _differs(old_value, value):
             return
 
         if key is MISSING:
             assert isinstance(value, dict)
-            self.value[instance] = value
+            state.value = value
         else:
-            self.value[instance][key] = value
+            state.value[key] = value
 
-        getattr(instance, self.name + '_changed').emit(value, old_value, {'key': key})
+        instance._emit_changed(self.name, compiled, value, old_value, {'key': key})
+
+
+def _trace_args(key, **args):
+    if key is not MISSING:
+        args['key'] = key
+    return args
 
 
 def _dochelper(feat):
@@ -403,7 +909,7 @@ def _dochelper(feat):
     doc = ''
     predoc = ''
 
-    modifiers = feat.modifiers[MISSING][MISSING]
+    modifiers = feat.modifiers
 
     if isinstance(feat, DictFeat):
         predoc = ':keys: {}\n\n'.format(modifiers.get('keys', None) or 'ANY')
@@ -415,6 +921,10 @@ def _dochelper(feat):
         doc += ':units: {}\n'.format(modifiers['units'])
     if modifiers['limits']:
         doc += ':limits: {}\n'.format(modifiers['limits'])
+    if modifiers['cache_ttl'] is not None:
+        doc += ':cache ttl: {} s\n'.format(modifiers['cache_ttl'])
+    if modifiers['history']:
+        doc += ':history: {} points\n'.format(modifiers['history'])
     if modifiers['processors']:
         docpg = []
         docps = []
@@ -447,22 +957,13 @@ class FeatProxy(object):
         super().__setattr__('key', key)
 
     def __getattr__(self, item):
-        modifiers = _dget(self.feat.modifiers, self.instance, self.key)
-
-        if item not in modifiers:
+        if item not in self.feat.modifiers:
             return getattr(self.feat, item)
 
-        return modifiers[item]
+        return self.feat.modifier(self.instance, self.key, item)
 
     def __setattr__(self, item, value):
-        _modifiers = _dget(self.feat.modifiers, MISSING, MISSING)
-
-        if item not in _modifiers:
-            raise AttributeError()
-
-        _dset(self.feat.modifiers, {item: value}, self.instance, self.key)
-
-        self.feat.rebuild(self.instance, self.key, build_doc=False, store=True)
+        self.feat.set_modifier(self.instance, self.key, item, value)
 
     def __getitem__(self, key):
         if not isinstance(self.feat, DictFeat):
@@ -484,5 +985,15 @@ class _DictFeatAccesor(object):
     def __setitem__(self, key, value):
         DictFeat.setitem(self.df, self.instance, key, value)
 
+    def get_many(self, keys, max_age=None):
+        """Get the values for multiple keys, returning a dictionary.
+        """
+        return DictFeat.get_many(self.df, self.instance, keys, max_age)
+
+    def set_many(self, values, force=False):
+        """Set the values for multiple keys given as a dictionary.
+        """
+        DictFeat.set_many(self.df, self.instance, values, force)
+
     def __repr__(self):
-        return repr(self.df.value[self.instance])
+        return repr(self.df.get_cache(self.instance))
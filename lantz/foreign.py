@@ -17,6 +17,8 @@ from ctypes import cast, POINTER, c_uint64, c_double
 from itertools import chain
 
 from lantz import Driver
+from lantz import trace
+from lantz.stats import perf_counter_ns
 
 
 class Wrapper(object):
@@ -237,7 +239,11 @@ class LibraryDriver(Driver):
         new_args, collect = self._preprocess_args(name, *args)
 
         try:
+            tic = perf_counter_ns()
             ret = func(*new_args)
+            self.timing.add_ns('lib_' + name, perf_counter_ns() - tic)
+            if trace.enabled:
+                trace.record(self, 'lib_' + name, 'transport', tic, {'args': args})
 
         except Exception as e:
             raise Exception('While calling {} with {} (was {}): {}'.format(
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+    lantz.group
+    ~~~~~~~~~~~
+
+    Implements DriverGroup, a container to update, refresh and call
+    actions on several drivers (e.g. an array of identical instruments)
+    concurrently, using the same scheduler as `initialize_many`.
+
+    :copyright: 2015 by Lantz Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import functools
+
+from .scheduler import schedule
+
+
+class DriverGroup(object):
+    """Group of drivers on which operations are applied concurrently.
+
+    Each operation returns a `lantz.scheduler.ScheduleReport` with the
+    value returned by each driver in `results` and the exceptions raised
+    in `exceptions` (both keyed by driver name), so that a failing driver
+    does not prevent the operation on the others.
+
+    Actions defined in all the drivers can be called on the group
+    directly::
+
+        lasers = DriverGroup([Cobolt0601(port) for port in ports])
+        lasers.update(power=Q_(10, 'mW'))
+        report = lasers.refresh('idn')
+        lasers.enable()
+
+    :param drivers: an iterable of drivers (with unique names).
+    :param max_concurrency: maximum number of drivers running an operation
+                            at the same time. None means no limit.
+    :param timeout: maximum time in seconds for each driver. Exceeding it
+                    is reported as a TimeoutError.
+    """
+
+    def __init__(self, drivers, max_concurrency=None, timeout=None):
+        self.drivers = tuple(drivers)
+        names = [driver.name for driver in self.drivers]
+        if len(set(names)) != len(names):
+            raise ValueError('Driver names in a group must be unique: {}'.format(names))
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+
+    def __repr__(self):
+        return '<DriverGroup {}>'.format(', '.join(self.names))
+
+    def __len__(self):
+        return len(self.drivers)
+
+    def __iter__(self):
+        return iter(self.drivers)
+
+    def __getitem__(self, item):
+        """Return a driver by index or by name.
+        """
+        if isinstance(item, str):
+            for driver in self.drivers:
+                if driver.name == item:
+                    return driver
+            raise KeyError(item)
+        return self.drivers[item]
+
+    def __getattr__(self, item):
+        if item.startswith('_') or not self.drivers or \
+                not all(item in driver._lantz_actions for driver in self.drivers):
+            raise AttributeError('{!r} is not an action of all drivers in the group'.format(item))
+        action = functools.partial(self.call, item)
+        action.__doc__ = '(Group) ' + (self.drivers[0]._lantz_actions[item].__doc__ or '')
+        return action
+
+    @property
+    def names(self):
+        return [driver.name for driver in self.drivers]
+
+    def apply(self, fn, drivers=None):
+        """Call fn(driver) for each driver concurrently.
+
+        :param fn: callable taking the driver.
+        :param drivers: the drivers of the group to use. Default None, meaning all.
+        :rtype: lantz.scheduler.ScheduleReport
+        """
+        return schedule(self.drivers if drivers is None else drivers, fn,
+                        concurrent=True, max_concurrency=self.max_concurrency,
+                        timeout=self.timeout, on_exception=_ignore)
+
+    def update(self, newstate=None, *, force=False, batch=False, **kwargs):
+        """Update all drivers with the same values (see `Driver.update`).
+
+        :rtype: lantz.scheduler.ScheduleReport
+        """
+        def _update(driver):
+            return driver.update(newstate, force=force, batch=batch, **kwargs)
+        return self.apply(_update)
+
+    def update_each(self, states, *, force=False, batch=False):
+        """Update each driver with its own values.
+
+        :param states: dictionary mapping driver name to the new state of that driver.
+        :type states: dict
+        :rtype: lantz.scheduler.ScheduleReport
+        """
+        unknown = set(states) - set(self.names)
+        if unknown:
+            raise KeyError('Unknown drivers: {}'.format(', '.join(sorted(unknown))))
+
+        def _update(driver):
+            return driver.update(states[driver.name], force=force, batch=batch)
+        return self.apply(_update, [driver for driver in self.drivers if driver.name in states])
+
+    def refresh(self, keys=None, *, max_age=None, force_refresh=False):
+        """Refresh all drivers (see `Driver.refresh`). The value returned by
+        each driver is stored in the `results` of the report.
+
+        :rtype: lantz.scheduler.ScheduleReport
+        """
+        def _refresh(driver):
+            return driver.refresh(keys, max_age=max_age, force_refresh=force_refresh)
+        return self.apply(_refresh)
+
+    def call(self, action_name, *args, **kwargs):
+        """Call an action with the same arguments on all drivers.
+
+        :rtype: lantz.scheduler.ScheduleReport
+        """
+        def _call(driver):
+            return getattr(driver, action_name)(*args, **kwargs)
+        _call.__name__ = action_name
+        return self.apply(_call)
+
+
+def _ignore(driver, ex):
+    # Exceptions are collected in the report.
+    pass
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+    lantz.history
+    ~~~~~~~~~~~~~
+
+    Implements a fixed size buffer to record the values of Feats and DictFeats
+    (enabled with the `history` modifier) together with the time.monotonic()
+    timestamp of each cache update.
+
+    :copyright: 2015 by Lantz Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import threading
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from . import Q_
+
+
+class RingBuffer(object):
+    """Fixed size buffer of (timestamp, value) pairs backed by NumPy arrays.
+
+    Each point is written twice (at i and i + capacity) so that the last
+    points are always contiguous in memory and can be returned as views.
+    Memory usage is therefore fixed and independent of the session length.
+
+    Scalar numbers and quantities are stored as float64 (quantities as
+    magnitudes in the given units or in the units of the first value),
+    anything else as objects.
+
+    :param capacity: maximum number of points kept.
+    :param units: units of the values. Numbers are assumed to be in these units.
+    """
+
+    def __init__(self, capacity, units=None):
+        if np is None:
+            raise RuntimeError('NumPy is required to record the history of feats.')
+        capacity = int(capacity)
+        if capacity < 1:
+            raise ValueError('capacity must be a positive integer, not {}'.format(capacity))
+        self.capacity = capacity
+        self.units = self._default_units = Q_(1, units).units if units else None
+        self._lock = threading.Lock()
+        self._times = np.empty(2 * capacity, dtype=np.float64)
+        self._values = None
+        #: Total number of points appended.
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def __repr__(self):
+        return '<RingBuffer {}/{} points>'.format(len(self), self.capacity)
+
+    def _allocate(self, value):
+        if self.units is not None:
+            dtype = np.float64
+        elif isinstance(value, Q_) and isinstance(value.magnitude, (int, float)):
+            self.units = value.units
+            dtype = np.float64
+        elif isinstance(value, (int, float)):
+            dtype = np.float64
+        else:
+            dtype = object
+        self._values = np.empty(2 * self.capacity, dtype=dtype)
+
+    def append(self, timestamp, value):
+        """Append a point, overwriting the oldest one if the buffer is full.
+        """
+        with self._lock:
+            if self._values is None:
+                self._allocate(value)
+
+            if self.units is not None and isinstance(value, Q_):
+                if value.units != self.units:
+                    value = value.to(self.units).magnitude
+                else:
+                    value = value.magnitude
+
+            pos = self.count % self.capacity
+            try:
+                self._values[pos] = value
+            except (TypeError, ValueError):
+                # A value that does not fit a number, store everything as objects.
+                self._values = self._values.astype(object)
+                self._values[pos] = value
+            self._values[pos + self.capacity] = value
+            self._times[pos] = self._times[pos + self.capacity] = timestamp
+            self.count += 1
+
+    def extend(self, timestamps, values):
+        """Append several points.
+        """
+        for timestamp, value in zip(timestamps, values):
+            self.append(timestamp, value)
+
+    def get(self, since=None, max_points=None):
+        """Return the recorded points as a (timestamps, values) tuple of arrays,
+        from the oldest to the newest.
+
+        The arrays are views into the buffer (no copy is made) and will be
+        overwritten by new points once the buffer is full: copy them to keep
+        them around. Values are returned as a Quantity if the feat has units.
+
+        :param since: only return points with timestamp >= since
+                      (compare with time.monotonic()).
+        :param max_points: only return the last max_points points.
+        """
+        with self._lock:
+            size = len(self)
+            end = self.count % self.capacity + self.capacity
+            start = end - size
+            if max_points is not None:
+                start = max(start, end - int(max_points))
+            times = self._times[start:end]
+            if since is not None:
+                start += int(np.searchsorted(times, since, side='left'))
+                times = self._times[start:end]
+            if self._values is None:
+                values = np.empty(0, dtype=np.float64)
+            else:
+                values = self._values[start:end]
+
+        if self.units is not None:
+            values = Q_(values, self.units)
+        return times, values
+
+    def clear(self):
+        """Remove all points.
+        """
+        with self._lock:
+            self.count = 0
+            self._values = None
+            self.units = self._default_units
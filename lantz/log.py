@@ -23,10 +23,6 @@ from logging.handlers import SocketHandler, DEFAULT_TCP_LOGGING_PORT, DEFAULT_UD
 from socketserver import (ThreadingUDPServer, DatagramRequestHandler,
                           ThreadingTCPServer, StreamRequestHandler)
 
-from colorama import Fore, Back, Style
-
-from stringparser import Parser
-
 class _LogRecord(logging.LogRecord):
 
     def getMessage(self):
@@ -80,7 +76,11 @@ class ColorizingFormatter(logging.Formatter):
     """
 
 
-    SPLIT_COLOR = Parser('{0:s}<color>{1:s}</color>{2:s}')
+    #: stringparser.Parser splitting the text to colorize, built when colors are enabled.
+    SPLIT_COLOR = None
+
+    #: Code to reset the color, set when colors are enabled.
+    RESET_ALL = ''
 
     SCHEME = {'bw': {logging.DEBUG: '',
                      logging.INFO: '',
@@ -91,6 +91,9 @@ class ColorizingFormatter(logging.Formatter):
 
     @classmethod
     def add_color_schemes(cls, style, fore, back):
+        from stringparser import Parser
+        cls.SPLIT_COLOR = Parser('{0:s}<color>{1:s}</color>{2:s}')
+        cls.RESET_ALL = style.RESET_ALL
         cls.format = cls.color_format
         cls.SCHEME.update(bright={DEBUG: style.NORMAL,
                                   INFO: style.NORMAL,
@@ -134,7 +137,7 @@ class ColorizingFormatter(logging.Formatter):
         """
         if record.levelno in self._scheme:
             color = self._scheme[record.levelno]
-            return color + message + Style.RESET_ALL
+            return color + message + self.RESET_ALL
 
         return message
 
@@ -152,6 +155,14 @@ class ColorizingFormatter(logging.Formatter):
 
 
 def init_colorama():
+    """Initialize colorama (if available) to colorize the log in the terminal.
+    It is called when first needed (see `log_to_screen`).
+
+    :return: (colorama available, default format)
+    """
+    global colorama, DEFAULT_FMT
+    if colorama is not None:
+        return colorama, DEFAULT_FMT
     try:
         from colorama import Fore, Back, Style, init as colorama_init
         colorama_init()
@@ -164,7 +175,9 @@ def init_colorama():
         DEFAULT_FMT = '{asctime} {levelname:8s} {message}'
     return colorama, DEFAULT_FMT
 
-colorama, DEFAULT_FMT = init_colorama()
+#: True if colorama is available, None if not yet initialized.
+colorama = None
+DEFAULT_FMT = '{asctime} {levelname:8s} {message}'
 
 
 class BaseServer(object):
@@ -329,6 +342,7 @@ def log_to_screen(level=logging.INFO, scheme='blackbg'):
     """
     handler = logging.StreamHandler()
     handler.setLevel(level)
+    init_colorama()
     if not colorama:
         scheme = 'bw'
     handler.setFormatter(ColorizingFormatter(fmt=DEFAULT_FMT, scheme=scheme, style='{'))
@@ -11,6 +11,7 @@
 
 from collections import ChainMap
 import types
+import threading
 
 import visa
 
@@ -18,6 +19,8 @@ from .errors import NotSupportedError
 from .driver import Driver
 from .log import LOGGER
 from .processors import ParseProcessor
+from . import trace
+from .stats import perf_counter_ns
 
 
 #: Cache of parsing functions.
@@ -40,6 +43,17 @@ def get_resource_manager():
     return _resource_manager
 
 
+def _join(first, separator, second):
+    """Join two commands with separator, without repeating the end of the
+    separator if the second command already starts with it
+    (e.g. ';:' and ':VOLT 1' give ';:VOLT 1').
+    """
+    for size in range(len(separator), 0, -1):
+        if second.startswith(separator[-size:]):
+            return first + separator[:-size] + second
+    return first + separator + second
+
+
 class MessageBasedDriver(Driver):
     """Base class for message based drivers using PyVISA as underlying library.
 
@@ -73,6 +87,11 @@ class MessageBasedDriver(Driver):
     #: :type: str | list | tuple | None
     MODEL_CODE = None
 
+    #: String used to join the commands written within a `batch` into a
+    #: single message. None means that commands are sent one by one.
+    #: :type: str | None
+    BATCH_SEPARATOR = None
+
     #: Stores a reference to a PyVISA ResourceManager.
     #: :type: visa.ResourceManager
     __resource_manager = None
@@ -341,8 +360,16 @@ class MessageBasedDriver(Driver):
         :param recv_args: (termination, encoding) to override class defaults
         """
 
-        self.write(command, *send_args)
-        return self.read(*recv_args)
+        if not trace.enabled:
+            self.write(command, *send_args)
+            return self.read(*recv_args)
+
+        tic = perf_counter_ns()
+        try:
+            self.write(command, *send_args)
+            return self.read(*recv_args)
+        finally:
+            trace.record(self, 'query', 'transport', tic, {'command': command})
 
     def parse_query(self, command, *,
                     send_args=(None, None), recv_args=(None, None),
@@ -369,11 +396,43 @@ class MessageBasedDriver(Driver):
         :param encoding: encoding to transform string to bytes to override class
                          defined default.
 
-        :return: number of bytes sent.
+        :return: number of bytes sent (0 if the command was collected
+                 by a batch).
 
         """
+        batch = self._batch
+        if batch is not None and batch.thread == threading.get_ident():
+            batch.commands.append((command, termination, encoding))
+            return 0
         self.log_debug('Writing {!r}', command)
-        return self.resource.write(command, termination, encoding)
+        tic = perf_counter_ns()
+        ret = self.resource.write(command, termination, encoding)
+        self.timing.add_ns('write', perf_counter_ns() - tic)
+        if trace.enabled:
+            trace.record(self, 'write', 'transport', tic, {'command': command})
+        return ret
+
+    def _send_batch(self, batch):
+        """Send the commands collected during a batch, joining consecutive
+        ones with the same termination and encoding using BATCH_SEPARATOR.
+        """
+        commands, batch.commands = batch.commands, []
+        if self.BATCH_SEPARATOR is None:
+            messages = commands
+        else:
+            messages = []
+            for command, termination, encoding in commands:
+                if messages and messages[-1][1:] == (termination, encoding):
+                    command = _join(messages.pop()[0], self.BATCH_SEPARATOR, command)
+                messages.append((command, termination, encoding))
+
+        for command, termination, encoding in messages:
+            self.log_debug('Writing {!r}', command)
+            tic = perf_counter_ns()
+            self.resource.write(command, termination, encoding)
+            self.timing.add_ns('write', perf_counter_ns() - tic)
+            if trace.enabled:
+                trace.record(self, 'write', 'transport', tic, {'command': command})
 
     def read(self, termination=None, encoding=None):
         """Receive string from instrument.
@@ -383,6 +442,14 @@ class MessageBasedDriver(Driver):
         :param encoding: encoding to transform bytes to string (overrides class default)
         :return: string encoded from received bytes
         """
-        ret =  self.resource.read(termination, encoding)
+        batch = self._batch
+        if batch is not None and batch.commands and batch.thread == threading.get_ident():
+            # The answer might depend on the commands collected so far.
+            self._send_batch(batch)
+        tic = perf_counter_ns()
+        ret = self.resource.read(termination, encoding)
+        self.timing.add_ns('read', perf_counter_ns() - tic)
+        if trace.enabled:
+            trace.record(self, 'read', 'transport', tic, {'answer': ret})
         self.log_debug('Read {!r}', ret)
         return ret
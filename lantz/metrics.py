@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+    lantz.metrics
+    ~~~~~~~~~~~~~
+
+    Exposes the statistics of all live drivers in OpenMetrics text format
+    (e.g. to be scraped by Prometheus) through an opt-in local HTTP endpoint::
+
+        from lantz import metrics
+        metrics.serve(9464)    # http://127.0.0.1:9464/metrics
+
+    For each driver (labels `driver`, `cls` and `driver_id`, a number
+    distinguishing drivers with the same name) and timing key (label `key`,
+    see `Driver.timing`):
+
+    - lantz_duration_seconds: histogram of the durations.
+    - lantz_errors: operations that raised an exception.
+    - lantz_cache_hits: values served from the cache or memoized.
+    - lantz_cache_hit_ratio: hits / (hits + instrument reads).
+    - lantz_queued_tasks: asynchronous tasks waiting in the executor.
+    - lantz_queue_wait_seconds: histogram of the time that asynchronous
+      tasks waited in the executor.
+
+    :copyright: 2015 by Lantz Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import threading
+import itertools
+from weakref import WeakKeyDictionary
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from .log import get_logger
+
+logger = get_logger('lantz.metrics', False)
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+#: Upper bounds of the histogram buckets are 2 ** exponent seconds
+#: (from about 1 us to 64 s), which are bucket edges of `lantz.stats.LogHistogram`.
+BUCKET_EXPONENTS = range(-20, 7)
+
+_SERVER = None
+
+#: driver: number identifying it in the labels.
+_IDS = WeakKeyDictionary()
+_IDS_LOCK = threading.Lock()
+_NEXT_ID = itertools.count()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join('{}="{}"'.format(name, _escape(value))
+                          for name, value in labels.items()) + '}'
+
+
+def _driver_id(driver):
+    with _IDS_LOCK:
+        try:
+            return _IDS[driver]
+        except KeyError:
+            value = _IDS[driver] = next(_NEXT_ID)
+            return value
+
+
+def _cumulative(histogram, exponents):
+    """Return the number of values lower or equal than 2 ** exponent
+    for each exponent.
+    """
+    below = histogram.zero + sum(histogram.negative.values())
+    positive = sorted(histogram.positive.items())
+    out = []
+    position = 0
+    for exponent in exponents:
+        limit = exponent * histogram.resolution
+        # The upper edge of bucket index is 2 ** ((index + 1) / resolution).
+        while position < len(positive) and positive[position][0] + 1 <= limit:
+            below += positive[position][1]
+            position += 1
+        out.append(below)
+    return out
+
+
+def _histogram(lines, name, state, bounds, common, key=None):
+    """Append the lines of a histogram of the values of a RunningState.
+    """
+    keys = {} if key is None else {'key': key}
+    counts = _cumulative(state.histogram, BUCKET_EXPONENTS) + [state.count]
+    for bound, count in zip(bounds, counts):
+        lines.append('{}_bucket{} {}'.format(name, _labels(**keys, le=bound, **common), count))
+    labels = _labels(**keys, **common)
+    lines.append('{}_count{} {}'.format(name, labels, state.count))
+    if not state.histogram.negative:
+        # Not allowed with negative observations (e.g. clock adjustments).
+        lines.append('{}_sum{} {!r}'.format(name, labels, float(state.sum)))
+
+
+def render(drivers=None):
+    """Return the metrics of the drivers in OpenMetrics text format.
+
+    :param drivers: iterable of drivers. Default None, meaning all live drivers.
+    :rtype: str
+    """
+    if drivers is None:
+        from .driver import live_drivers
+        drivers = live_drivers()
+    drivers = sorted(((driver.name, _driver_id(driver), driver) for driver in drivers),
+                     key=lambda item: item[:2])
+
+    durations = ['# TYPE lantz_duration_seconds histogram',
+                 '# UNIT lantz_duration_seconds seconds']
+    errors = ['# TYPE lantz_errors counter']
+    hits = ['# TYPE lantz_cache_hits counter']
+    ratios = ['# TYPE lantz_cache_hit_ratio gauge']
+    queued = ['# TYPE lantz_queued_tasks gauge']
+    waits = ['# TYPE lantz_queue_wait_seconds histogram',
+             '# UNIT lantz_queue_wait_seconds seconds']
+
+    bounds = ['{:g}'.format(2. ** exponent) for exponent in BUCKET_EXPONENTS] + ['+Inf']
+
+    for name, driver_id, driver in drivers:
+        common = dict(driver=name, cls=driver.__class__.__name__, driver_id=driver_id)
+
+        for key, state in sorted(list(driver.timing.items())):
+            _histogram(durations, 'lantz_duration_seconds', state, bounds, common, key)
+
+        for key, count in sorted(list(driver.errors.items())):
+            errors.append('lantz_errors_total{} {}'.format(_labels(key=key, **common), count))
+
+        for key, count in sorted(list(driver.cache_hits.items())):
+            labels = _labels(key=key, **common)
+            hits.append('lantz_cache_hits_total{} {}'.format(labels, count))
+            reads = driver.timing[key].count if key in driver.timing else 0
+            ratios.append('lantz_cache_hit_ratio{} {!r}'.format(labels, count / (count + reads)))
+
+        queued.append('lantz_queued_tasks{} {}'.format(_labels(**common), driver.queued_tasks))
+
+        wait = driver.queue_wait
+        if wait is not None and wait.count:
+            _histogram(waits, 'lantz_queue_wait_seconds', wait, bounds, common)
+
+    return '\n'.join(durations + errors + hits + ratios + queued + waits + ['# EOF', ''])
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        try:
+            body = render().encode('utf-8')
+        except Exception as e:
+            logger.error('While rendering metrics: {}', e)
+            self.send_error(500)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug('{} - {}', self.address_string(), format % args)
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+
+def serve(port=9464, host='127.0.0.1'):
+    """Start serving the metrics of all live drivers in a background thread.
+
+    :param port: TCP port (0 means any free port).
+    :param host: address to bind. The default only accepts local connections.
+    :return: the server, its address is in `server_address`.
+    :raises: RuntimeError if already serving.
+    """
+    global _SERVER
+    if _SERVER is not None:
+        raise RuntimeError('Metrics are already served at {}'.format(_SERVER.server_address))
+    server = _Server((host, port), _Handler)
+    thread = threading.Thread(target=server.serve_forever, name='lantz metrics')
+    thread.daemon = True
+    thread.start()
+    _SERVER = server
+    logger.info('Serving metrics at http://{}:{}/metrics', *server.server_address[:2])
+    return server
+
+
+def stop():
+    """Stop serving metrics.
+    """
+    global _SERVER
+    server, _SERVER = _SERVER, None
+    if server is not None:
+        server.shutdown()
+        server.server_close()
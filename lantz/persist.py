@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+    lantz.persist
+    ~~~~~~~~~~~~~
+
+    Implements an opt-in persistent cache for `read_once` feats, allowing
+    to skip querying identification and capability values on every start.
+
+    Raw values (before post-processing) are stored in a local file keyed by
+    driver class and resource name. The entry of a driver is discarded when
+    the driver version changes or, if the driver defines PERSIST_FIRMWARE,
+    when the value of that feat (read once per process) changes.
+
+    Usage::
+
+        from lantz import persist
+        persist.enable()
+
+    :copyright: 2015 by Lantz Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import os
+import atexit
+import pickle
+import threading
+from weakref import WeakKeyDictionary
+
+from .feat import MISSING
+from .log import get_logger
+
+logger = get_logger('lantz.persist', False)
+
+#: Default location of the cache file.
+DEFAULT_FILENAME = os.path.join(os.path.expanduser('~'), '.lantz', 'persist.pickle')
+
+#: Active store, None if disabled.
+#: :type: Store
+_STORE = None
+
+
+def enable(filename=None):
+    """Enable the persistent cache.
+
+    :param filename: file used to store the cache. Defaults to DEFAULT_FILENAME.
+    """
+    global _STORE
+    if _STORE is not None:
+        _STORE.save()
+    _STORE = Store(filename or DEFAULT_FILENAME)
+    atexit.register(_STORE.save)
+
+
+def disable():
+    """Save and disable the persistent cache.
+    """
+    global _STORE
+    if _STORE is not None:
+        _STORE.save()
+    _STORE = None
+
+
+def save():
+    """Write the persistent cache to disk (this is also done at exit).
+    """
+    if _STORE is not None:
+        _STORE.save()
+
+
+def clear(driver=None):
+    """Clear the persistent cache, for all drivers or for a given one.
+    """
+    if _STORE is not None:
+        _STORE.clear(driver)
+
+
+def lookup(driver, feat_name, key=MISSING):
+    """Return the raw value stored for a feat of a driver,
+    or MISSING if not found or the cache is disabled.
+    """
+    if _STORE is None:
+        return MISSING
+    return _STORE.lookup(driver, feat_name, key)
+
+
+def store(driver, feat_name, key, raw_value):
+    """Store the raw value of a feat of a driver if the cache is enabled.
+    """
+    if _STORE is not None:
+        _STORE.store(driver, feat_name, key, raw_value)
+
+
+def driver_ident(driver):
+    """Return the string identifying a driver in the cache,
+    or None if the driver does not have a resource_name.
+    """
+    resource_name = getattr(driver, 'resource_name', None)
+    if not resource_name:
+        return None
+    cls = driver.__class__
+    return '{}.{}::{}'.format(cls.__module__, cls.__name__, resource_name)
+
+
+def driver_version(driver):
+    """Return the version string of the driver. Entries stored with a different
+    version are discarded.
+    """
+    from . import __version__
+    return '{}:{}'.format(__version__, getattr(driver.__class__, '__version__', ''))
+
+
+class Store(object):
+    """Persistent cache backed by a pickle file.
+
+    :param filename: file used to store the cache.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._lock = threading.RLock()
+        self._dirty = False
+        #: driver: validated entry
+        self._entries = WeakKeyDictionary()
+        #: driver: entry which firmware is being read
+        self._validating = WeakKeyDictionary()
+        self.data = self._load()
+
+    def _load(self):
+        try:
+            with open(self.filename, 'rb') as fp:
+                data = pickle.load(fp)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            # A truncated or stale file can raise almost anything while unpickling.
+            logger.warning('Ignoring persistent cache {}: {!r}', self.filename, e)
+            return {}
+        if not isinstance(data, dict):
+            logger.warning('Ignoring persistent cache {}: unexpected content', self.filename)
+            return {}
+        return data
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            folder = os.path.dirname(self.filename)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            tmp = self.filename + '.tmp'
+            with open(tmp, 'wb') as fp:
+                pickle.dump(self.data, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.filename)
+            self._dirty = False
+
+    def clear(self, driver=None):
+        with self._lock:
+            if driver is None:
+                self.data = {}
+                self._entries = WeakKeyDictionary()
+            else:
+                self.data.pop(driver_ident(driver), None)
+                self._entries.pop(driver, None)
+            self._dirty = True
+
+    def _entry(self, driver, validating=False):
+        """Return the validated entry of a driver, or None if the driver
+        cannot be cached or its firmware cannot be read.
+
+        :param validating: also return the entry which firmware is being read
+                           (used to store the firmware value itself).
+        """
+        try:
+            return self._entries[driver]
+        except KeyError:
+            pass
+
+        if validating:
+            entry = self._validating.get(driver)
+            if entry is not None:
+                return entry
+
+        ident = driver_ident(driver)
+        if ident is None:
+            return None
+
+        with self._lock:
+            version = driver_version(driver)
+            entry = self.data.get(ident)
+            if entry is None or entry['version'] != version:
+                entry = self.data[ident] = {'version': version, 'firmware': None, 'values': {}}
+                self._dirty = True
+
+        firmware_feat = getattr(driver, 'PERSIST_FIRMWARE', None)
+        if firmware_feat:
+            # The entry is only used once validated, but reading the firmware stores it.
+            self._validating[driver] = entry
+            try:
+                firmware = str(driver._lantz_features[firmware_feat].get(driver, force_refresh=True))
+            except Exception as e:
+                logger.warning('Not using the persistent cache for {}, '
+                               'could not read {}: {!r}', driver.name, firmware_feat, e)
+                return None
+            finally:
+                self._validating.pop(driver, None)
+
+            with self._lock:
+                if entry['firmware'] != firmware:
+                    entry['values'] = {name_key: value for name_key, value in entry['values'].items()
+                                       if name_key[0] == firmware_feat}
+                    entry['firmware'] = firmware
+                    self._dirty = True
+
+        with self._lock:
+            self._entries[driver] = entry
+
+        return entry
+
+    def lookup(self, driver, feat_name, key=MISSING):
+        entry = self._entry(driver)
+        if entry is None:
+            return MISSING
+        return entry['values'].get((feat_name, None if key is MISSING else key), MISSING)
+
+    def store(self, driver, feat_name, key, raw_value):
+        entry = self._entry(driver, validating=True)
+        if entry is None:
+            return
+        with self._lock:
+            entry['values'][(feat_name, None if key is MISSING else key)] = raw_value
+            self._dirty = True
@@ -8,10 +8,15 @@
 """
 
 import warnings
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
 
 from . import Q_
 from .log import LOGGER as _LOG
-from stringparser import Parser
 
 
 class DimensionalityWarning(Warning):
@@ -22,6 +27,21 @@ def _do_nothing(value):
     return value
 
 
+def _is_array(value):
+    """Return True if value is a NumPy array.
+    """
+    return np is not None and isinstance(value, np.ndarray)
+
+
+def _to_float(value):
+    """Convert a number to float, or a NumPy array to a float array
+    (without copying if it already is).
+    """
+    if _is_array(value):
+        return value.astype(float, copy=False)
+    return float(value)
+
+
 def _getitem(a, b):
     """Return a[b] or if not found a[type(b)]
     """
@@ -32,6 +52,44 @@ def _getitem(a, b):
 
 getitem = _getitem
 
+
+#: Maximum number of (source units, target units) pairs which conversion
+#: factors are cached, the least recently used are discarded.
+FACTORS_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=FACTORS_CACHE_SIZE)
+def conversion_factors(source, target):
+    """Return (scale, offset) such that a magnitude in source units times
+    scale plus offset is the magnitude in target units, or None if the
+    conversion is not affine (or not possible). Results are cached
+    (see FACTORS_CACHE_SIZE).
+
+    :param source: source units (as stored in Quantity._units).
+    :param target: target units (as stored in Quantity._units).
+
+        >>> conversion_factors(Q_(1, 'V')._units, Q_(1, 'mV')._units)
+        (1000.0, 0)
+    """
+    try:
+        zero = Q_(0., source).to(target).magnitude
+        if zero == 0:
+            factors = (Q_(1., source).to(target).magnitude, 0)
+        else:
+            # Offset units (e.g. temperatures). A large step reduces the
+            # rounding error in the scale, a third point checks linearity.
+            scale = (Q_(1000., source).to(target).magnitude - zero) / 1000.
+            check = Q_(-1000., source).to(target).magnitude
+            if abs(check - (zero - 1000. * scale)) > 1e-9 * max(abs(check), 1.):
+                factors = None
+            else:
+                factors = (scale, zero)
+    except Exception:
+        factors = None
+
+    return factors
+
+
 def convert_to(units, on_dimensionless='warn', on_incompatible='raise',
                return_float=False):
     """Return a function that convert a Quantity to to another units.
@@ -66,9 +124,25 @@ def convert_to(units, on_dimensionless='warn', on_incompatible='raise',
         raise ValueError("{} is not a valid value for 'units'. "
                          "It should be either str or Quantity")
 
+    target = units._units
+
+    if units.magnitude == 1:
+        # Avoids the multiplication (and copying arrays).
+        def _with_units(magnitude):
+            return Q_(_to_float(magnitude), target)
+    else:
+        def _with_units(magnitude):
+            return _to_float(magnitude) * units
+
     if return_float:
         def _inner(value):
             if isinstance(value, Q_):
+                factors = conversion_factors(value._units, target)
+                if factors is not None:
+                    scale, offset = factors
+                    if offset:
+                        return value.magnitude * scale + offset
+                    return value.magnitude * scale
                 try:
                     return value.to(units).magnitude
                 except ValueError as e:
@@ -91,11 +165,17 @@ def convert_to(units, on_dimensionless='warn', on_incompatible='raise',
                         _LOG.warn(msg)
 
                 # on_incompatible == 'ignore'
-                return float(value)
+                return _to_float(value)
         return _inner
     else:
         def _inner(value):
             if isinstance(value, Q_):
+                factors = conversion_factors(value._units, target)
+                if factors is not None:
+                    scale, offset = factors
+                    if offset:
+                        return Q_(value.magnitude * scale + offset, target)
+                    return Q_(value.magnitude * scale, target)
                 try:
                     return value.to(units)
                 except ValueError as e:
@@ -107,7 +187,7 @@ def convert_to(units, on_dimensionless='warn', on_incompatible='raise',
                         _LOG.warn(msg)
 
                 # on_incompatible == 'ignore'
-                return float(value.magnitude) * units
+                return _with_units(value.magnitude)
             else:
                 if not units.dimensionless:
                     if on_dimensionless == 'raise':
@@ -118,7 +198,7 @@ def convert_to(units, on_dimensionless='warn', on_incompatible='raise',
                         _LOG.warn(msg)
 
                 # on_incompatible == 'ignore'
-                return float(value) * units
+                return _with_units(value)
         return _inner
 
 
@@ -243,6 +323,7 @@ class ParseProcessor(Processor):
     @classmethod
     def to_callable(cls, obj):
         if isinstance(obj, str):
+            from stringparser import Parser
             return Parser(obj)
         raise TypeError('parse_params argument must be a string or a callable, '
                         'not {}'.format(obj))
@@ -348,8 +429,23 @@ def check_range_and_coerce_step(low, high, step=None):
         >>> checker(1), checker(5.4), checker(10)
         (1, 5, 10)
 
+    NumPy arrays are checked and coerced as a whole::
+
+        >>> checker(np.array([1., 5.4, 10.]))
+        array([ 1.,  5., 10.])
+
     """
     def _inner(value):
+        if _is_array(value):
+            if value.size:
+                vmin, vmax = value.min(), value.max()
+                if not (low <= vmin and vmax <= high):
+                    raise ValueError('{} not in range ({}, {})'.format(vmin if vmin < low else vmax,
+                                                                       low, high))
+            if step:
+                value = np.round((value - low) / step) * step + low
+            return value
+
         if not (low <= value <= high):
             raise ValueError('{} not in range ({}, {})'.format(value, low, high))
         if step:
@@ -376,6 +472,12 @@ def check_membership(container):
     """
 
     def _inner(value):
+        if _is_array(value):
+            for item in np.unique(value).tolist():
+                if item not in container:
+                    raise ValueError('{!r} not in {}'.format(item, container))
+            return value
+
         if value not in container:
             raise ValueError('{!r} not in {}'.format(value, container))
         return value
@@ -392,9 +494,24 @@ def get_mapping(container):
         ...
         ValueError: 0 not in ('A', 'B')
 
+    NumPy arrays are mapped using a lookup table built from their unique
+    elements::
+
+        >>> getter(np.array(['A', 'B', 'A']))
+        array([42, 43, 42])
+
     """
 
     def _inner(key):
+        if _is_array(key):
+            keys, inverse = np.unique(key, return_inverse=True)
+            keys = keys.tolist()
+            for item in keys:
+                if item not in container:
+                    raise ValueError("{!r} not in {}".format(item, tuple(container.keys())))
+            table = np.asarray([container[item] for item in keys])
+            return table[inverse].reshape(key.shape)
+
         if key not in container:
             raise ValueError("{!r} not in {}".format(key, tuple(container.keys())))
         return container[key]
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+    lantz.scheduler
+    ~~~~~~~~~~~~~~~
+
+    Implements the scheduler used by `initialize_many` and `finalize_many`
+    to run a driver method on a group of drivers following a dependency
+    graph. Each driver starts as soon as its own dependencies are done.
+
+    :copyright: 2015 by Lantz Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import time
+from concurrent import futures
+
+
+class ScheduleReport(object):
+    """Timing of a scheduled operation on a group of drivers.
+
+    All times are in seconds, relative to the start of the operation.
+    """
+
+    def __init__(self, dependencies):
+        #: name: set of names that had to finish before starting.
+        self.dependencies = dependencies
+
+        #: name: start time
+        self.starts = {}
+
+        #: name: end time
+        self.ends = {}
+
+        #: name: exception raised (or TimeoutError if it did not finish in time).
+        self.exceptions = {}
+
+        #: name: value returned by the method.
+        self.results = {}
+
+        #: total time of the operation.
+        self.total = 0.
+
+    @property
+    def durations(self):
+        """Dictionary mapping driver name to duration.
+        """
+        return {name: self.ends[name] - start for name, start in self.starts.items()
+                if name in self.ends}
+
+    @property
+    def critical_path(self):
+        """List of driver names, from first to last, of the chain of
+        dependencies that determined the total time.
+        """
+        if not self.ends:
+            return []
+        name = max(self.ends, key=self.ends.get)
+        path = [name]
+        while True:
+            deps = [dep for dep in self.dependencies.get(name, ()) if dep in self.ends]
+            if not deps:
+                break
+            name = max(deps, key=self.ends.get)
+            path.append(name)
+        return path[::-1]
+
+    def __str__(self):
+        lines = ['{:<20} {:>10} {:>10} {:>10}'.format('driver', 'start', 'end', 'duration')]
+        for name, start in sorted(self.starts.items(), key=lambda item: item[1]):
+            end = self.ends.get(name, float('nan'))
+            status = ' ({})'.format(self.exceptions[name].__class__.__name__) if name in self.exceptions else ''
+            lines.append('{:<20} {:>10.3f} {:>10.3f} {:>10.3f}{}'.format(name, start, end, end - start, status))
+        lines.append('total: {:.3f} s, critical path: {}'.format(self.total, ' -> '.join(self.critical_path)))
+        return '\n'.join(lines)
+
+
+def _graph(drivers, dependencies, reverse):
+    """Return a dictionary mapping each driver name to the set of names
+    that must finish before it starts.
+    """
+    names = [driver.name for driver in drivers]
+    graph = {name: set() for name in names}
+    for name, deps in (dependencies or {}).items():
+        if name not in graph:
+            continue
+        for dep in deps:
+            if dep not in graph:
+                continue
+            if reverse:
+                graph[dep].add(name)
+            else:
+                graph[name].add(dep)
+    return graph
+
+
+class _Run(object):
+    """State of a scheduled operation, shared by `schedule` and `schedule_async`.
+    """
+
+    def __init__(self, drivers, method, dependencies, reverse, max_concurrency,
+                 on_done, on_exception):
+        drivers = tuple(drivers)
+        self.by_name = {driver.name: driver for driver in drivers}
+        self.graph = _graph(drivers, dependencies, reverse)
+        self.report = ScheduleReport({name: set(deps) for name, deps in self.graph.items()})
+        self.pending = [driver.name for driver in drivers]
+        self.max_concurrency = max_concurrency
+        self.on_done = on_done
+        self.on_exception = on_exception
+
+        if isinstance(method, str):
+            self.method_name = method
+            self.call = lambda driver: getattr(driver, method)()
+        else:
+            self.method_name = getattr(method, '__name__', 'method')
+            self.call = method
+
+        self.t0 = time.monotonic()
+
+    def now(self):
+        return time.monotonic() - self.t0
+
+    def ready(self, running):
+        """Yield the drivers that can start, marking them as started.
+        """
+        for name in [name for name in self.pending if not self.graph[name]]:
+            if self.max_concurrency and running >= self.max_concurrency:
+                break
+            self.pending.remove(name)
+            self.report.starts[name] = self.now()
+            running += 1
+            yield self.by_name[name]
+
+    def check_stalled(self):
+        """Raise ValueError if nothing is running and no pending driver can start.
+        """
+        if self.pending and not any(not self.graph[name] for name in self.pending):
+            raise ValueError('Circular dependency among {}'.format(', '.join(self.pending)))
+
+    def wait_time(self, timeout, running):
+        """Return the time until the first running driver exceeds the timeout.
+        """
+        if timeout is None:
+            return None
+        now = self.now()
+        return max(0., min(self.report.starts[name] + timeout - now for name in running))
+
+    def expired(self, timeout, name):
+        return timeout is not None and self.now() - self.report.starts[name] >= timeout
+
+    def timeout_error(self, name, timeout):
+        return futures.TimeoutError('{}.{} did not finish within {} s'.format(name, self.method_name, timeout))
+
+    def finish(self, name, ex, result=None):
+        report = self.report
+        report.ends[name] = self.now()
+        for deps in self.graph.values():
+            deps.discard(name)
+        if ex is None:
+            report.results[name] = result
+            if self.on_done:
+                self.on_done(self.by_name[name])
+        else:
+            report.exceptions[name] = ex
+            if not self.on_exception:
+                report.total = report.ends[name]
+                raise ex
+            self.on_exception(self.by_name[name], ex)
+
+    def done(self):
+        self.report.total = self.now()
+        return self.report
+
+
+def schedule(drivers, method, dependencies=None, reverse=False,
+             concurrent=True, max_concurrency=None, timeout=None,
+             on_start=None, on_done=None, on_exception=None):
+    """Call a method on each driver following a dependency graph.
+
+    :param drivers: an iterable of drivers.
+    :param method: name of the method to be called (e.g. 'initialize'),
+                   or a callable taking the driver.
+    :param dependencies: dictionary mapping each driver name to an iterable
+                         of the names it depends on.
+    :param reverse: use the dependencies in reverse (e.g. for finalization).
+    :param concurrent: run the method in the driver executor, overlapping
+                       independent drivers. Otherwise, drivers are run one
+                       by one in the calling thread.
+    :param max_concurrency: maximum number of drivers running at the same time.
+                            None means no limit.
+    :param timeout: maximum time in seconds for each driver (only when concurrent).
+                    A driver exceeding it is reported as failed with a TimeoutError,
+                    even though its method keeps running in the background.
+    :param on_start: callable taking the driver, called before the method.
+    :param on_done: callable taking the driver, called after the method succeeded.
+    :param on_exception: callable taking the driver and the exception. If not
+                         given, the exception is raised.
+    :rtype: ScheduleReport
+    """
+    run = _Run(drivers, method, dependencies, reverse,
+               max_concurrency if concurrent else 1, on_done, on_exception)
+    call = run.call
+    running = {}
+
+    while run.pending or running:
+        for driver in run.ready(len(running)):
+            if on_start:
+                on_start(driver)
+            if concurrent:
+                running[driver._submit(call, driver)] = driver.name
+            else:
+                try:
+                    result = call(driver)
+                except Exception as ex:
+                    run.finish(driver.name, ex)
+                else:
+                    run.finish(driver.name, None, result)
+
+        if not running:
+            run.check_stalled()
+            continue
+
+        done, _ = futures.wait(list(running), timeout=run.wait_time(timeout, running.values()),
+                               return_when=futures.FIRST_COMPLETED)
+
+        for fut in done:
+            ex = fut.exception()
+            run.finish(running.pop(fut), ex, None if ex is not None else fut.result())
+
+        for fut, name in list(running.items()):
+            if run.expired(timeout, name):
+                del running[fut]
+                fut.cancel()
+                run.finish(name, run.timeout_error(name, timeout))
+
+    return run.done()
+
+
+async def schedule_async(drivers, method, dependencies=None, reverse=False,
+                         max_concurrency=None, timeout=None,
+                         on_start=None, on_done=None, on_exception=None):
+    """Coroutine to call a method on each driver following a dependency graph,
+    running the blocking calls in the executor of the drivers
+    (see `lantz.aio.run`). Parameters and report are the same as `schedule`
+    with concurrent=True.
+
+    :rtype: ScheduleReport
+    """
+    import asyncio
+    from .aio import run as _run
+
+    run = _Run(drivers, method, dependencies, reverse, max_concurrency, on_done, on_exception)
+    call = run.call
+    running = {}
+
+    while run.pending or running:
+        for driver in run.ready(len(running)):
+            if on_start:
+                on_start(driver)
+            running[asyncio.ensure_future(_run(driver, call, driver))] = driver.name
+
+        if not running:
+            run.check_stalled()
+            continue
+
+        done, _ = await asyncio.wait(list(running), timeout=run.wait_time(timeout, running.values()),
+                                     return_when=asyncio.FIRST_COMPLETED)
+
+        for fut in done:
+            ex = fut.exception()
+            run.finish(running.pop(fut), ex, None if ex is not None else fut.result())
+
+        for fut, name in list(running.items()):
+            if run.expired(timeout, name):
+                del running[fut]
+                fut.cancel()
+                run.finish(name, run.timeout_error(name, timeout))
+
+    return run.done()
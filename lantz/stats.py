@@ -3,14 +3,24 @@
     lantz.stats
     ~~~~~~~~~~~
 
-    Implements an statistical accumulator
+    Implements an statistical accumulator with a fixed memory histogram
+    to estimate percentiles (e.g. of the latency of instrument operations).
 
     :copyright: 2015 by Lantz Authors, see AUTHORS for more details.
     :license: BSD, see LICENSE for more details.
 """
 
+import math
 from collections import namedtuple
 
+try:
+    from time import perf_counter_ns
+except ImportError:  # pragma: no cover (Python < 3.7)
+    from time import perf_counter as _perf_counter
+
+    def perf_counter_ns():
+        return int(_perf_counter() * 1e9)
+
 #: Data structure
 Stats = namedtuple('Stats', 'last count mean std min max')
 
@@ -27,31 +37,109 @@ def stats(state):
     if not state.count:
         return Stats(0, 0, 0, 0, 0, 0)
 
-    mean = state.sum / state.count
-    std = (float(state.sum2 - 2.0 * state.sum * mean + state.count * mean ** 2.0) / float(state.count)) ** 0.5
+    std = (state.m2 / state.count) ** 0.5
     return Stats(state.last, state.count,
-                 mean, std, state.min, state.max)
+                 state.mean, std, state.min, state.max)
+
+
+class LogHistogram(object):
+    """Histogram with logarithmic buckets, each covering a fixed fraction
+    of its value (about 9% for 8 buckets per power of two).
+
+    The memory used is bounded by the range of the values (e.g. less than
+    400 buckets between 1 ns and 1 hour) and not by their number.
+
+    Bucket `i` counts the values `v` with
+    `2 ** (i / resolution) < abs(v) <= 2 ** ((i + 1) / resolution)`,
+    so powers of two are upper edges.
+
+    :param resolution: number of buckets per power of two.
+    """
+
+    __slots__ = ('resolution', 'positive', 'negative', 'zero', 'count')
+
+    def __init__(self, resolution=8):
+        self.resolution = resolution
+        #: bucket index: count
+        self.positive = {}
+        self.negative = {}
+        self.zero = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value > 0:
+            index = math.ceil(math.log2(value) * self.resolution) - 1
+            self.positive[index] = self.positive.get(index, 0) + 1
+        elif value < 0:
+            index = math.ceil(math.log2(-value) * self.resolution) - 1
+            self.negative[index] = self.negative.get(index, 0) + 1
+        else:
+            self.zero += 1
+
+    def _value(self, index):
+        # Geometric center of the bucket.
+        return 2. ** ((index + .5) / self.resolution)
+
+    def _buckets(self):
+        """Yield (value, count) from the lowest to the highest value.
+        """
+        for index in sorted(self.negative, reverse=True):
+            yield -self._value(index), self.negative[index]
+        if self.zero:
+            yield 0., self.zero
+        for index in sorted(self.positive):
+            yield self._value(index), self.positive[index]
+
+    def percentiles(self, percentiles):
+        """Return the estimated values below which the given percentages
+        of the values fall.
+
+        :param percentiles: iterable of numbers between 0 and 100.
+        :return: list of values (nan if there are no values).
+        """
+        percentiles = list(percentiles)
+        if not self.count:
+            return [float('nan')] * len(percentiles)
+
+        out = [None] * len(percentiles)
+        order = sorted(range(len(percentiles)), key=percentiles.__getitem__)
+        buckets = self._buckets()
+        value, cumulative = next(buckets)
+        for position in order:
+            rank = percentiles[position] / 100. * self.count
+            while cumulative < rank:
+                try:
+                    bucket_value, count = next(buckets)
+                except StopIteration:
+                    break
+                value = bucket_value
+                cumulative += count
+            out[position] = value
+        return out
 
 
 class RunningState(object):
     """Accumulator for events.
 
+    The mean and the variance are updated with Welford's algorithm,
+    which is numerically stable for long runs. A `LogHistogram`
+    allows to estimate percentiles.
+
     :param value: first value to add.
     """
 
+    __slots__ = ('last', 'count', 'sum', 'sum2', 'mean', 'm2', 'min', 'max', 'histogram')
+
     def __init__(self, value=None):
+        self.last = self.count = self.sum = self.sum2 = 0
+        self.mean = self.m2 = 0.
+        self.min = float('inf')
+        self.max = float('-inf')
+        self.histogram = LogHistogram()
         if value is not None:
             self.add(value)
 
-    def __getattr__(self, key):
-        if key in ('last', 'count', 'sum', 'sum2'):
-            return 0
-        if key == 'min':
-            return float('inf')
-        if key == 'max':
-            return float('-inf')
-        raise AttributeError('{} is not a valid attribute of RunningState'.format(key))
-
     def add(self, value):
         """Add to the accumulator.
 
@@ -61,8 +149,33 @@ class RunningState(object):
         self.count += 1
         self.sum += value
         self.sum2 += value * value
-        self.min = min(self.min, value)
-        self.max = max(self.max, value)
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.histogram.add(value)
+
+    def percentiles(self, percentiles):
+        """Return estimated percentiles, clipped to the observed minimum and maximum
+        (which are returned exactly for 0 and 100).
+
+        :param percentiles: iterable of numbers between 0 and 100.
+        :rtype: list
+        """
+        percentiles = list(percentiles)
+        if not self.count:
+            return self.histogram.percentiles(percentiles)
+        out = []
+        for percentile, value in zip(percentiles, self.histogram.percentiles(percentiles)):
+            if percentile <= 0:
+                value = self.min
+            elif percentile >= 100:
+                value = self.max
+            out.append(min(max(value, self.min), self.max))
+        return out
 
 
 class RunningStats(dict):
@@ -80,9 +193,30 @@ class RunningStats(dict):
         else:
             super().__setitem__(key, RunningState(value))
 
+    def add_ns(self, key, nanoseconds):
+        """Add a duration measured with `perf_counter_ns`, stored in seconds.
+
+        :param key: category to which the event should be added.
+        :param nanoseconds: duration in nanoseconds.
+        """
+        self.add(key, nanoseconds * 1e-9)
+
     def stats(self, key):
         """Return the statistics for the current accumulator.
 
         :rtype: Stats.
         """
         return stats(super().__getitem__(key))
+
+    def percentiles(self, key, percentiles=(50, 90, 99)):
+        """Return the estimated percentiles for the current accumulator,
+        without storing the values.
+
+        Example::
+
+            driver.timing.percentiles('get_temperature', [50, 99, 99.9])
+
+        :param percentiles: iterable of numbers between 0 and 100.
+        :rtype: list
+        """
+        return super().__getitem__(key).percentiles(percentiles)
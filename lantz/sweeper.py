@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+    lantz.sweeper
+    ~~~~~~~~~~~~~
+
+    Implements sweeps: setting a feat to a sequence of values and
+    measuring one or more quantities at each point, in a worker thread
+    (without Qt timers, unlike `lantz.ui.blocks.scan.Scan`).
+
+    Results are stored in a NumPy structured array, allocated for all
+    points when the first one is measured, with a `timestamp` field
+    (time.time() at the start of the measurement), a field for the set
+    value and one for each measurement. Quantities are stored as
+    magnitudes (see `Sweep.units`).
+
+    :copyright: 2015 by Lantz Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import time
+import functools
+import threading
+from concurrent import futures
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from . import Q_
+from .feat import MISSING, DictFeat, FeatProxy
+from .stats import RunningStats
+
+
+def _resolve(spec):
+    """Return (driver or None, feat, key, name) for a feat given as
+    a FeatProxy (e.g. `inst.feats.frequency`) or a (driver, feat name[, key])
+    tuple. feat is None for any other object.
+    """
+    if isinstance(spec, FeatProxy):
+        driver, feat, key = spec.instance, spec.feat, spec.key
+    elif isinstance(spec, tuple) and len(spec) in (2, 3):
+        driver, feat = spec[0], spec[0]._lantz_features[spec[1]]
+        key = spec[2] if len(spec) == 3 else MISSING
+    elif isinstance(spec, functools.partial) and spec.args:
+        # e.g. bound Action
+        return spec.args[0], None, MISSING, getattr(getattr(spec, '__wrapped__', None), '__name__', None)
+    else:
+        return getattr(spec, '__self__', None), None, MISSING, getattr(spec, '__name__', None)
+
+    if isinstance(feat, DictFeat) and key is MISSING:
+        raise ValueError('A key is required to sweep or measure DictFeat {}'.format(feat.name))
+
+    return driver, feat, key, feat.name if key is MISSING else '{}[{!r}]'.format(feat.name, key)
+
+
+def _setter(spec, force):
+    driver, feat, key, name = _resolve(spec)
+    if feat is None:
+        if not callable(spec):
+            raise TypeError('Cannot set {!r}'.format(spec))
+        return driver, spec, name or 'value'
+    if isinstance(feat, DictFeat):
+        return driver, lambda value: feat.setitem(driver, key, value, force), name
+    return driver, lambda value: feat.set(driver, value, force), name
+
+
+def _getter(spec, default_name):
+    driver, feat, key, name = _resolve(spec)
+    if feat is None:
+        if not callable(spec):
+            raise TypeError('Cannot measure {!r}'.format(spec))
+        return driver, spec, name or default_name
+    if isinstance(feat, DictFeat):
+        return driver, lambda: feat.getitem(driver, key), name
+    return driver, lambda: feat.get(driver), name
+
+
+def _field(name, value):
+    """Return the dtype field and the units to store a value.
+    """
+    if isinstance(value, Q_):
+        units, value = value.units, value.magnitude
+    else:
+        units = None
+    if isinstance(value, np.ndarray):
+        return (name, value.dtype, value.shape), units
+    if isinstance(value, (bool, int, float, np.number)):
+        return (name, np.float64), units
+    return (name, object), units
+
+
+class Sweep(object):
+    """Set a feat to each value of a sequence and measure at each point.
+
+    :param target: what to set. A FeatProxy (e.g. `inst.feats.frequency`
+                   or `inst.feats.voltage['ch1']`), a (driver, feat name[, key])
+                   tuple or a callable taking the value.
+    :param values: values to set.
+    :param measure: what to measure at each point: a FeatProxy, a tuple
+                    as above or a callable without arguments (e.g. a bound
+                    Action), a list of them or a dictionary mapping field
+                    names to them.
+    :param settle: time in seconds to wait after setting before measuring.
+    :param force: set the value even when the cache says it is not necessary.
+    :param pipeline: set the next value while measuring the current point.
+                     Only use it when the measurement does not depend on the
+                     value being set while it runs (e.g. it reads data acquired
+                     before, or the new value takes effect on a trigger).
+                     Ignored when the driver of target also measures, as
+                     its lock would serialize both operations anyway.
+    :param callback: called in the worker thread after each point with the
+                     index and the row of the array.
+    """
+
+    def __init__(self, target, values, measure=None, settle=0., *, force=False,
+                 pipeline=False, callback=None):
+        if np is None:
+            raise RuntimeError('NumPy is required to run a sweep.')
+
+        set_driver, self._set, self.name = _setter(target, force)
+
+        if measure is None:
+            items = []
+        elif isinstance(measure, dict):
+            items = list(measure.items())
+        else:
+            if (not isinstance(measure, (list, tuple)) or
+                    (isinstance(measure, tuple) and len(measure) in (2, 3) and isinstance(measure[1], str))):
+                measure = [measure]
+            items = [(None, spec) for spec in measure]
+
+        getters = []
+        drivers = set()
+        for index, (name, spec) in enumerate(items):
+            driver, getter, default_name = _getter(spec, 'measure{}'.format(index))
+            name = name or default_name
+            if name in ('timestamp', self.name) or name in [n for n, _ in getters]:
+                raise ValueError('Duplicated field name {!r} in sweep'.format(name))
+            drivers.add(id(driver))
+            getters.append((name, getter))
+
+        #: (field name, callable) of the measurements.
+        self.measure = getters
+
+        self.values = list(values)
+        self.settle = settle
+        self.pipeline = pipeline and set_driver is not None and id(set_driver) not in drivers
+        self.callback = callback
+
+        #: structured array with all points (see `result`), None until
+        #: the first point is measured.
+        self.data = None
+
+        #: field name: units of the stored magnitudes (None for unit-less).
+        self.units = {}
+
+        #: number of points measured.
+        self.count = 0
+
+        #: timing statistics in seconds per point (keys: set, settle, measure, point
+        #: and measure_<field name>).
+        self.timing = RunningStats()
+
+        #: exception raised in the worker thread, if any.
+        self.exception = None
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='sweep ' + self.name)
+        self._thread.daemon = True
+
+    def __repr__(self):
+        return '<Sweep of {} {}/{} points>'.format(self.name, self.count, len(self.values))
+
+    def start(self):
+        """Start the sweep in the worker thread.
+        """
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Request the sweep to stop after the current point.
+        """
+        self._stop.set()
+
+    @property
+    def done(self):
+        return self._thread.ident is not None and not self._thread.is_alive()
+
+    def wait(self, timeout=None):
+        """Wait until the sweep finishes.
+
+        :return: True if the sweep finished.
+        """
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def result(self, timeout=None):
+        """Wait until the sweep finishes and return the measured points.
+
+        :return: structured array with the measured points.
+        :raises: futures.TimeoutError if not finished in time, or the exception
+                 raised while sweeping.
+        """
+        if not self.wait(timeout):
+            raise futures.TimeoutError()
+        if self.exception is not None:
+            raise self.exception
+        if self.data is None:
+            return np.empty(0, dtype=[('timestamp', np.float64), (self.name, object)])
+        return self.data[:self.count]
+
+    def _timed_set(self, value):
+        tic = time.perf_counter()
+        self._set(value)
+        self.timing.add('set', time.perf_counter() - tic)
+
+    def _allocate(self, value, measured):
+        fields = [('timestamp', np.float64)]
+        for name, item in [(self.name, value)] + measured:
+            field, units = _field(name, item)
+            fields.append(field)
+            self.units[name] = units
+        self.data = np.zeros(len(self.values), dtype=fields)
+
+    def _store(self, index, timestamp, value, measured):
+        if self.data is None:
+            self._allocate(value, measured)
+        row = self.data[index]
+        row['timestamp'] = timestamp
+        for name, item in [(self.name, value)] + measured:
+            units = self.units[name]
+            if isinstance(item, Q_):
+                item = item.to(units).magnitude if units is not None else item.magnitude
+            row[name] = item
+        return row
+
+    def _run(self):
+        pool = futures.ThreadPoolExecutor(1) if self.pipeline else None
+        pending = None
+        perf_counter = time.perf_counter
+        try:
+            for index, value in enumerate(self.values):
+                if self._stop.is_set():
+                    break
+
+                tic = perf_counter()
+                if pending is None:
+                    self._timed_set(value)
+                else:
+                    pending.result()
+                    pending = None
+
+                if self.settle:
+                    settle_tic = perf_counter()
+                    if self._stop.wait(self.settle):
+                        break
+                    self.timing.add('settle', perf_counter() - settle_tic)
+
+                timestamp = time.time()
+                if pool is not None and index + 1 < len(self.values):
+                    pending = pool.submit(self._timed_set, self.values[index + 1])
+
+                measure_tic = perf_counter()
+                measured = []
+                for name, getter in self.measure:
+                    item_tic = perf_counter()
+                    measured.append((name, getter()))
+                    self.timing.add('measure_' + name, perf_counter() - item_tic)
+                toc = perf_counter()
+                self.timing.add('measure', toc - measure_tic)
+
+                row = self._store(index, timestamp, value, measured)
+                self.count = index + 1
+                self.timing.add('point', toc - tic)
+
+                if self.callback is not None:
+                    self.callback(index, row)
+        except Exception as e:
+            self.exception = e
+        finally:
+            if pending is not None:
+                try:
+                    pending.result()
+                except Exception as e:
+                    if self.exception is None:
+                        self.exception = e
+            if pool is not None:
+                pool.shutdown()
+
+
+def sweep(target, values, measure=None, settle=0., *, force=False, pipeline=False,
+          callback=None, background=False):
+    """Set a feat to each value of a sequence and measure at each point
+    (see `Sweep` for the parameters).
+
+    Example::
+
+        data = sweep(fungen.feats.frequency, np.linspace(1, 10, 100),
+                     measure=[lockin.feats.x, lockin.feats.y], settle=.1)
+        plot(data['frequency'], data['x'])
+
+    :param background: return the running Sweep instead of waiting for it.
+    :return: structured array with the measured points (or the Sweep).
+    """
+    job = Sweep(target, values, measure, settle, force=force, pipeline=pipeline,
+                callback=callback).start()
+    if background:
+        return job
+    return job.result()
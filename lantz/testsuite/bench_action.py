@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+    Benchmark calling actions with the precompiled argument binder
+    against the previous implementation (inspect.getcallargs on every call
+    and unconditional logging).
+
+    Run with::
+
+        python -m lantz.testsuite.bench_action
+"""
+
+import time
+import timeit
+
+from lantz import Driver, Action, Q_
+
+NUMBER = 20000
+
+
+def legacy_call(self, instance, *args, **kwargs):
+    """Action.call before the argument binder.
+    """
+    import inspect
+
+    name = self.__name__
+
+    with instance._lock:
+        if args or kwargs:
+            instance.log_info('Calling {} with ({}, {}))', name, args, kwargs)
+        else:
+            instance.log_info('Calling {}', name)
+
+        values = inspect.getcallargs(self.func, *(instance, ) + args, **kwargs)
+        fargs = self.args
+        values = tuple(values[farg] for farg in fargs)[1:]
+        if len(values) == 1:
+            t_values = (self.pre_action(values[0], instance), )
+        else:
+            t_values = self.pre_action(values, instance)
+
+        if args or kwargs:
+            instance.log_debug('(raw) Calling {} with {}', name, t_values)
+
+        tic = time.time()
+        out = self.func(instance, *t_values)
+        instance.timing.add(name, time.time() - tic)
+        instance.log_info('{} returned {}', name, out)
+
+        return out
+
+
+class BenchDriver(Driver):
+
+    @Action()
+    def read_scalar(self):
+        return 1.
+
+    @Action()
+    def count_rate(self, channel):
+        return channel
+
+    @Action()
+    def move(self, axis, position, wait=True):
+        return position
+
+    @Action(units='mm')
+    def abs_position(self, position):
+        return position
+
+
+CASES = (('no arguments', 'read_scalar', (), {}),
+         ('one argument', 'count_rate', (1, ), {}),
+         ('default', 'move', (1, 2.), {}),
+         ('keyword', 'move', (1, ), {'position': 2.}),
+         ('units', 'abs_position', (Q_(3, 'mm'), ), {}))
+
+
+def main():
+    obj = BenchDriver()
+    print('{:>14} {:>12} {:>14} {:>8}'.format('case', 'legacy (us)', 'compiled (us)', 'ratio'))
+    for case, name, args, kwargs in CASES:
+        action = obj._lantz_actions[name]
+        new = getattr(obj, name)
+
+        t_legacy = min(timeit.repeat(lambda: legacy_call(action, obj, *args, **kwargs),
+                                     number=NUMBER, repeat=3)) / NUMBER * 1e6
+        t_new = min(timeit.repeat(lambda: new(*args, **kwargs),
+                                  number=NUMBER, repeat=3)) / NUMBER * 1e6
+
+        print('{:>14} {:>12.2f} {:>14.2f} {:>8.1f}'.format(case, t_legacy, t_new, t_legacy / t_new))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+    Benchmark the time to import lantz, and to use the parts that are
+    loaded on demand (units and drivers).
+
+    Run with::
+
+        python -m lantz.testsuite.bench_import
+
+    Each import is measured in a new interpreter, best of REPEAT.
+"""
+
+import sys
+import json
+import subprocess
+
+REPEAT = 5
+
+CASES = (('import lantz', 'import lantz'),
+         ('+ Q_', 'import lantz; lantz.Q_(1, "V")'),
+         ('+ Driver', 'import lantz; lantz.Q_(1, "V"); from lantz import Driver'))
+
+CODE = '''
+import time
+tic = time.perf_counter()
+{}
+print(time.perf_counter() - tic)
+'''
+
+
+def measure(statement):
+    out = subprocess.check_output([sys.executable, '-c', CODE.format(statement)])
+    return float(out.decode('utf-8').splitlines()[-1])
+
+
+def main():
+    print('{:>12} {:>10}'.format('case', 'time (ms)'))
+    for name, statement in CASES:
+        best = min(measure(statement) for _ in range(REPEAT))
+        print('{:>12} {:>10.1f}'.format(name, best * 1e3))
+
+
+if __name__ == '__main__':
+    main()
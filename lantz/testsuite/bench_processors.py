@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+    Benchmark unit conversion using cached conversion factors against
+    plain pint conversion.
+
+    Run with::
+
+        python -m lantz.testsuite.bench_processors
+"""
+
+import timeit
+
+from lantz import Q_
+from lantz.processors import convert_to
+
+NUMBER = 20000
+
+CASES = (('V', 'mV'), ('ms', 's'), ('Hz', 'kHz'), ('degC', 'K'))
+
+
+def main():
+    print('{:>12} {:>12} {:>12} {:>12} {:>8}'.format('from', 'to', 'pint (us)', 'cached (us)', 'ratio'))
+    for source, target in CASES:
+        value = Q_(3.2, source)
+        target_q = Q_(1, target)
+        cached = convert_to(target, return_float=True)
+
+        t_pint = min(timeit.repeat(lambda: value.to(target_q).magnitude,
+                                   number=NUMBER, repeat=3)) / NUMBER * 1e6
+        t_cached = min(timeit.repeat(lambda: cached(value),
+                                     number=NUMBER, repeat=3)) / NUMBER * 1e6
+
+        print('{:>12} {:>12} {:>12.2f} {:>12.2f} {:>8.1f}'.format(source, target, t_pint,
+                                                                   t_cached, t_pint / t_cached))
+
+
+if __name__ == '__main__':
+    main()
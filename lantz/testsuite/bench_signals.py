@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+    Benchmark driver instantiation and changed signal emission
+    with the Qt and pure Python signal backends.
+
+    Run with::
+
+        python -m lantz.testsuite.bench_signals
+
+    Each backend is measured in a subprocess, as it is selected on import.
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+NUMBER = 2000
+
+FEATS = 20
+
+
+def measure():
+    import timeit
+    from lantz import Driver, Feat
+    from lantz.utils import signals
+
+    def _feat(index):
+        def fget(self):
+            return index
+        return Feat(fget)
+
+    BenchDriver = type(Driver)('BenchDriver', (Driver, ),
+                               {'eggs{}'.format(index): _feat(index) for index in range(FEATS)})
+
+    obj = BenchDriver()
+    obj.eggs0_changed.connect(lambda new, old: None)
+    emit = obj.eggs0_changed.emit
+
+    return {'backend': signals.BACKEND,
+            'instantiation': min(timeit.repeat(BenchDriver, number=NUMBER // 10, repeat=3)) / (NUMBER // 10) * 1e6,
+            'emit': min(timeit.repeat(lambda: emit(1, 0), number=NUMBER, repeat=3)) / NUMBER * 1e6}
+
+
+def main():
+    print('{:>10} {:>22} {:>12}'.format('backend', 'instantiation (us)', 'emit (us)'))
+    for backend in ('qt', 'python'):
+        env = dict(os.environ, LANTZ_SIGNALS=backend)
+        try:
+            out = subprocess.check_output([sys.executable, '-m', 'lantz.testsuite.bench_signals', '--measure'],
+                                          env=env)
+        except subprocess.CalledProcessError:
+            print('{:>10} {:>22}'.format(backend, 'not available'))
+            continue
+        result = json.loads(out.decode('utf-8').splitlines()[-1])
+        print('{backend:>10} {instantiation:>22.2f} {emit:>12.2f}'.format(**result))
+
+
+if __name__ == '__main__':
+    if '--measure' in sys.argv:
+        print(json.dumps(measure()))
+    else:
+        main()
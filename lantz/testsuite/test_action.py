@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import time
 import unittest
-from lantz import Driver, Action, Q_
+from lantz import Driver, Feat, Action, Q_
 
 
 class aDriver(Driver):
@@ -26,6 +27,10 @@ class aDriver(Driver):
     def run5(self, x, y, z):
         return x, y, z
 
+    @Action()
+    def run6(self, x, y=2, z=3):
+        return x, y, z
+
 
 class ActionTest(unittest.TestCase):
 
@@ -48,6 +53,18 @@ class ActionTest(unittest.TestCase):
         obj = aDriver()
         self.assertEqual(obj.run5(1, 'a', 3), (1, 1, '3'))
 
+    def test_arguments(self):
+        obj = aDriver()
+        self.assertEqual(obj.run6(1), (1, 2, 3))
+        self.assertEqual(obj.run6(1, 4), (1, 4, 3))
+        self.assertEqual(obj.run6(1, 4, 5), (1, 4, 5))
+        self.assertEqual(obj.run6(1, z=5), (1, 2, 5))
+        self.assertEqual(obj.run6(z=5, x=0), (0, 2, 5))
+        self.assertEqual(obj.run5(1, z=3, y='b'), (1, 2, '3'))
+        self.assertRaises(TypeError, obj.run6)
+        self.assertRaises(TypeError, obj.run6, 1, 2, 3, 4)
+        self.assertRaises(TypeError, obj.run2, spam=1)
+
     def test_instance_specific(self):
         x = aDriver()
         y = aDriver()
@@ -58,5 +75,62 @@ class ActionTest(unittest.TestCase):
         self.assertEqual(x.run4(val), 3)
 
 
+    def test_memoize(self):
+
+        class memoDriver(Driver):
+
+            calls = 0
+
+            @Feat()
+            def grating(self):
+                return self._grating
+
+            @grating.setter
+            def grating(self, value):
+                self._grating = value
+
+            @Action(invalidated_by=['grating'])
+            def catalog(self, channel=1):
+                self.calls += 1
+                return channel, self._grating
+
+            @Action(ttl=.05)
+            def timings(self):
+                self.calls += 1
+                return self.calls
+
+        obj, other = memoDriver(), memoDriver()
+        obj.grating = 1
+        other.grating = 2
+        self.assertEqual(obj.catalog(), (1, 1))
+        self.assertEqual(obj.catalog(1), (1, 1))
+        self.assertEqual(obj.catalog(channel=2), (2, 1))
+        self.assertEqual(obj.calls, 2)
+        self.assertEqual(other.catalog(), (1, 2))
+
+        obj.grating = 3
+        self.assertEqual(obj.catalog(), (1, 3))
+        self.assertEqual(obj.calls, 3)
+        self.assertEqual(other.catalog(), (1, 2))
+        self.assertEqual(other.calls, 1)
+
+        obj.catalog.invalidate()
+        obj.catalog()
+        self.assertEqual(obj.calls, 4)
+
+        first = obj.timings()
+        self.assertEqual(obj.timings(), first)
+        time.sleep(.06)
+        self.assertEqual(obj.timings(), first + 1)
+
+        def define():
+            class badDriver(Driver):
+                @Action(invalidated_by=['spam'])
+                def catalog(self):
+                    pass
+
+        self.assertRaises(ValueError, define)
+
+
 if __name__ == '__main__':
     unittest.main()
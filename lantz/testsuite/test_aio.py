@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+import time
+import asyncio
+import threading
+import unittest
+
+from lantz import Driver, Feat, DictFeat, Action, Q_
+from lantz import initialize_many_async, finalize_many_async
+from lantz.executor import SharedExecutor
+
+
+class aioDriver(Driver):
+
+    def __init__(self, events=None, **kwargs):
+        super().__init__(**kwargs)
+        self._eggs = 1
+        self._ham = {}
+        self.threads = set()
+        self.events = events if events is not None else []
+
+    @Feat(units='s')
+    def eggs(self):
+        self.threads.add(threading.get_ident())
+        return self._eggs
+
+    @eggs.setter
+    def eggs(self, value):
+        self._eggs = value
+
+    @Feat(read_once=True)
+    def idn(self):
+        return 'aio'
+
+    @DictFeat(keys=('a', 'b'))
+    def ham(self, key):
+        return self._ham.get(key, 0)
+
+    @ham.setter
+    def ham(self, key, value):
+        self._ham[key] = value
+
+    @Action()
+    def double(self, value):
+        time.sleep(.01)
+        return 2 * value
+
+    @Action()
+    def initialize(self):
+        self.events.append(('start', self.name))
+        time.sleep(.02)
+        self.events.append(('initialized', self.name))
+
+    @Action()
+    def finalize(self):
+        self.events.append(('finalized', self.name))
+
+
+class AioTest(unittest.TestCase):
+
+    def test_get_set(self):
+        obj = aioDriver()
+
+        async def main():
+            self.assertEqual(await obj.aget('eggs'), Q_(1, 's'))
+            await obj.aset('eggs', Q_(2, 's'))
+            self.assertEqual(await obj.aget('eggs'), Q_(2, 's'))
+            await obj.aset('ham', 3, 'a')
+            self.assertEqual(await obj.aget('ham', 'a'), 3)
+            with self.assertRaises(KeyError):
+                await obj.aget('ham', 'c')
+            self.assertEqual(await obj.aget('idn'), 'aio')
+            self.assertEqual(await obj.double.aio(3), 6)
+
+        asyncio.run(main())
+        self.assertNotIn(threading.get_ident(), obj.threads)
+
+    def test_serialized(self):
+        obj = aioDriver()
+
+        async def main():
+            return await asyncio.gather(*[obj.double.aio(value) for value in range(5)])
+
+        tic = time.time()
+        self.assertEqual(asyncio.run(main()), [0, 2, 4, 6, 8])
+        self.assertGreaterEqual(time.time() - tic, .05)
+
+    def test_executor(self):
+        # Calls share the executor (and the queue) of the other asynchronous methods.
+        obj = aioDriver()
+        obj.executor = SharedExecutor(1)
+        refreshed = obj.refresh_async('eggs')
+
+        async def main():
+            return await asyncio.gather(obj.aget('eggs', max_age=0), obj.double.aio(3))
+
+        self.assertEqual(asyncio.run(main()), [Q_(1, 's'), 6])
+        refreshed.result(1)
+        self.assertEqual(obj.executor.wait_time(obj).count, 3)
+        obj.executor.shutdown()
+
+    def test_many(self):
+        log = []
+        drivers = [aioDriver(log, name='d{}'.format(index)) for index in range(3)]
+        dependencies = {'d2': ('d0', )}
+
+        report = asyncio.run(initialize_many_async(drivers, register_finalizer=False,
+                                                   dependencies=dependencies))
+        self.assertEqual(set(log[:2]), {('start', 'd0'), ('start', 'd1')})
+        self.assertLess(log.index(('initialized', 'd0')), log.index(('start', 'd2')))
+        self.assertEqual(report.critical_path, ['d0', 'd2'])
+
+        del log[:]
+        asyncio.run(finalize_many_async(drivers, dependencies=dependencies))
+        self.assertLess(log.index(('finalized', 'd2')), log.index(('finalized', 'd0')))
+
+        with self.assertRaises(ValueError):
+            asyncio.run(initialize_many_async(drivers, register_finalizer=False,
+                                              dependencies={'d0': ['d1'], 'd1': ['d0']}))
+
+        failed = []
+        report = asyncio.run(initialize_many_async(drivers[:1], register_finalizer=False,
+                                                   timeout=.005,
+                                                   on_exception=lambda driver, ex: failed.append(ex)))
+        self.assertIn('d0', report.exceptions)
+        self.assertIsInstance(failed[0], TimeoutError)
+
+    def test_cached(self):
+        obj = aioDriver()
+        obj.ham['a'] = 2
+
+        async def main():
+            return await obj.aget('ham', 'a', max_age=10)
+
+        self.assertEqual(asyncio.run(main()), 2)
+        self.assertEqual(obj.cache_hits["get_ham['a']"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
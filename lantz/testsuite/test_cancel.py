@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+import unittest
+
+from lantz import Driver, Action
+from lantz.cancel import CancelToken
+from lantz.errors import ActionCancelled, DeadlineExceeded, LantzTimeoutError
+
+
+class cameraDriver(Driver):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.aborted = threading.Event()
+        self.started = threading.Event()
+
+    @Action(abort='abort_acquisition')
+    def wait_for_acquisition(self):
+        # Blocking call that only returns when aborted.
+        self.started.set()
+        self.aborted.wait(5)
+        return 'done'
+
+    @Action()
+    def abort_acquisition(self):
+        self.aborted.set()
+
+    @Action(timeout=.1)
+    def line_scan(self, points, *, token):
+        for point in range(points):
+            if token.wait(.01):
+                token.check()
+        return points
+
+    @Action()
+    def idn(self):
+        return 'camera'
+
+
+class CancelTest(unittest.TestCase):
+
+    def test_token(self):
+        token = CancelToken()
+        called = []
+        token.add_callback(lambda: called.append(1))
+        self.assertFalse(token.cancelled)
+        self.assertIsNone(token.remaining())
+        token.check()
+        self.assertTrue(token.cancel())
+        self.assertFalse(token.cancel())
+        self.assertEqual(called, [1])
+        self.assertRaises(ActionCancelled, token.check)
+        self.assertTrue(token.wait())
+
+        token = CancelToken(.02)
+        self.assertFalse(token.wait(.001))
+        self.assertTrue(token.wait())
+        self.assertTrue(token.expired)
+        self.assertRaises(DeadlineExceeded, token.check)
+        self.assertTrue(issubclass(DeadlineExceeded, LantzTimeoutError))
+
+    def test_abort_running(self):
+        obj = cameraDriver()
+        fut = obj.wait_for_acquisition_async()
+        self.assertTrue(obj.started.wait(1))
+
+        tic = time.monotonic()
+        fut.abort()
+        self.assertRaises(ActionCancelled, fut.result, 1)
+        self.assertLess(time.monotonic() - tic, .5)
+        self.assertTrue(obj.aborted.is_set())
+
+        # The lock was released.
+        self.assertEqual(obj.idn(), 'camera')
+
+    def test_deadline(self):
+        obj = cameraDriver()
+        self.assertEqual(obj.line_scan(3), 3)
+
+        tic = time.monotonic()
+        self.assertRaises(DeadlineExceeded, obj.line_scan, 1000)
+        self.assertLess(time.monotonic() - tic, .5)
+
+        self.assertEqual(obj.line_scan(20, token=CancelToken(1)), 20)
+
+    def test_waiting_for_lock(self):
+        obj = cameraDriver()
+        result = []
+
+        def call():
+            try:
+                obj.line_scan(1, token=CancelToken(.05))
+            except Exception as e:
+                result.append(e)
+
+        with obj._lock:
+            thread = threading.Thread(target=call)
+            thread.start()
+            thread.join(1)
+            self.assertFalse(thread.is_alive())
+        self.assertIsInstance(result[0], DeadlineExceeded)
+
+
+if __name__ == '__main__':
+    unittest.main()
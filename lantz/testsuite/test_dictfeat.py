@@ -293,5 +293,88 @@ class DictFeatTest(unittest.TestCase):
         self.assertEqual(str(x.eggs[1].units), 'second')
         self.assertEqual(str(x.eggs[2].units), 'millisecond')
 
+    def test_keys_in_instance(self):
+
+        class Ham(Driver):
+
+            @DictFeat(keys=(1, 2))
+            def eggs(self_, key):
+                return key * 10
+
+        x = Ham()
+        y = Ham()
+        self.assertEqual(x.eggs[1], 10)
+        self.assertRaises(KeyError, lambda: x.eggs[3])
+        x.feats.eggs.keys = (1, 2, 3)
+        self.assertEqual(x.eggs[3], 30)
+        self.assertRaises(KeyError, lambda: y.eggs[3])
+
+    def test_many(self):
+
+        class Ham(Driver):
+
+            def __init__(self_):
+                super().__init__()
+                self_._eggs = {1: 10, 2: 20, 3: 30}
+                self_.transactions = 0
+
+            @DictFeat(keys={'a': 1, 'b': 2, 'c': 3}, units='s')
+            def eggs(self_, key):
+                self_.transactions += 1
+                return self_._eggs[key]
+
+            @eggs.setter
+            def eggs(self_, key, value):
+                self_.transactions += 1
+                self_._eggs[key] = value
+
+            @eggs.getter_many
+            def eggs(self_, keys):
+                self_.transactions += 1
+                return [self_._eggs[key] for key in keys]
+
+            @eggs.setter_many
+            def eggs(self_, values):
+                self_.transactions += 1
+                self_._eggs.update(values)
+
+            @DictFeat(keys=(1, 2))
+            def ham(self_, key):
+                self_.transactions += 1
+                return key
+
+            @ham.setter
+            def ham(self_, key, value):
+                self_.transactions += 1
+
+        obj = Ham()
+        changed = []
+        obj.eggs_changed.connect(lambda new, old, other: changed.append((other['key'], new)))
+
+        self.assertEqual(obj.eggs.get_many(['a', 'c']), {'a': Q_(10, 's'), 'c': Q_(30, 's')})
+        self.assertEqual(obj.transactions, 1)
+        self.assertEqual(obj.recall('eggs'), {1: Q_(10, 's'), 3: Q_(30, 's')})
+        self.assertEqual(changed, [(1, Q_(10, 's')), (3, Q_(30, 's'))])
+
+        obj.eggs.set_many({'a': Q_(10, 's'), 'b': Q_(500, 'ms')})
+        self.assertEqual(obj.transactions, 2)
+        self.assertEqual(obj._eggs, {1: 10, 2: 0.5, 3: 30})
+        self.assertEqual(obj.recall('eggs')[2], Q_(0.5, 's'))
+        self.assertRaises(KeyError, obj.eggs.get_many, ['a', 'd'])
+
+        obj.transactions = 0
+        self.assertEqual(obj.ham.get_many((1, 2)), {1: 1, 2: 2})
+        self.assertEqual(obj.transactions, 2)
+        obj.ham.set_many({1: 5, 2: 6})
+        self.assertEqual(obj.transactions, 4)
+        self.assertEqual(obj.recall('ham'), {1: 5, 2: 6})
+
+        # Values are compared with those set earlier in the batch.
+        with obj.batch():
+            obj.eggs.set_many({'a': Q_(1, 's')})
+            obj.eggs.set_many({'a': Q_(10, 's')})
+        self.assertEqual(obj._eggs[1], 10)
+        self.assertEqual(obj.recall('eggs')[1], Q_(10, 's'))
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import pickle
 import unittest
 from time import sleep
 
-from lantz import Driver, Feat, Action, Q_
-from lantz.driver import Self
+from lantz import Driver, Feat, DictFeat, Action, Q_
+from lantz.driver import Self, Snapshot
+from lantz.feat import MISSING
 
 SLEEP = .1
 WAIT = .2
@@ -144,6 +146,136 @@ class DriverTest(unittest.TestCase):
         sleep(2 * SLEEP + WAIT)
         self.assertEqual(obj.unfinished_tasks, 0)
 
+    def test_batch(self):
+
+        class batchDriver(aDriver):
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.sent = []
+
+            @Feat()
+            def bacon(self):
+                return 0
+
+            @bacon.setter
+            def bacon(self, value):
+                self._batch.commands.append('BACON {}'.format(value))
+
+            def _send_batch(self, batch):
+                self.sent.append(';'.join(batch.commands))
+                batch.commands = []
+
+        obj = batchDriver()
+        changed = []
+        obj.eggs_changed.connect(lambda new, old: changed.append(new))
+
+        with obj.batch():
+            obj.eggs = 1
+            with obj.batch():
+                obj.bacon = 2
+            obj.bacon = 3
+            self.assertEqual(obj._eggs, 1)
+            self.assertEqual(obj.recall('eggs'), MISSING)
+            self.assertEqual(changed, [])
+            self.assertEqual(obj.sent, [])
+
+        self.assertEqual(obj.sent, ['BACON 2;BACON 3'])
+        self.assertEqual(obj.recall(('eggs', 'bacon')), {'eggs': 1, 'bacon': 3})
+        self.assertEqual(changed, [1])
+
+        def fail():
+            with obj.batch():
+                obj.eggs = 4
+                obj.bacon = 5
+                raise ValueError
+        self.assertRaises(ValueError, fail)
+        self.assertEqual(obj.sent, ['BACON 2;BACON 3'])
+        self.assertEqual(obj.recall(('eggs', 'bacon')), {'eggs': 1, 'bacon': 3})
+        self.assertIsNone(obj._batch)
+
+        obj.update(eggs=6, bacon=7, batch=True)
+        self.assertEqual(obj.sent, ['BACON 2;BACON 3', 'BACON 7'])
+        self.assertEqual(obj.recall(('eggs', 'bacon')), {'eggs': 6, 'bacon': 7})
+
+        # Values are compared with those set earlier in the batch.
+        with obj.batch():
+            obj.bacon = 8
+            obj.bacon = 7
+            obj.bacon = 7
+        self.assertEqual(obj.sent[-1], 'BACON 8;BACON 7')
+        self.assertEqual(obj.recall('bacon'), 7)
+
+    def test_snapshot(self):
+
+        class snapshotDriver(aDriver):
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.sets = []
+                self.batches = 0
+
+            @DictFeat(keys=('a', 'b'), units='V')
+            def volts(self, key):
+                return 0
+
+            @volts.setter
+            def volts(self, key, value):
+                self.sets.append((key, value))
+
+            @Feat()
+            def idn(self):
+                return 'X'
+
+            def _send_batch(self, batch):
+                self.batches += 1
+
+        obj = snapshotDriver()
+        obj.update(eggs=1, ham=2)
+        obj.volts['a'] = Q_(1, 'V')
+        obj.volts['b'] = Q_(2, 'V')
+        obj.idn
+
+        snapshot = obj.snapshot()
+        self.assertEqual(snapshot.values, {'eggs': 1, 'ham': 2, 'idn': 'X',
+                                           'volts': {'a': Q_(1, 'V'), 'b': Q_(2, 'V')}})
+        self.assertEqual(pickle.loads(pickle.dumps(snapshot)), snapshot)
+        self.assertEqual(Snapshot.from_dict(snapshot.to_dict()), snapshot)
+        self.assertEqual(obj.diff(snapshot), {})
+        self.assertEqual(obj.restore(snapshot), {})
+
+        obj.eggs = 3
+        obj.volts['b'] = Q_(3000, 'mV')
+        obj.volts['a'] = Q_(1000, 'mV')
+        del obj.sets[:]
+        self.assertEqual(obj.restore(snapshot), {'eggs': 1, 'volts': {'b': Q_(2, 'V')}})
+        self.assertEqual(obj._eggs, 1)
+        self.assertEqual(obj.sets, [('b', 2)])
+        self.assertEqual(obj.batches, 1)
+        self.assertEqual(obj.diff(snapshot), {})
+
+        self.assertEqual(set(obj.restore(snapshot, force=True)), {'eggs', 'ham', 'volts'})
+        self.assertEqual(obj.batches, 2)
+        self.assertEqual(obj.snapshot(('eggs', )).values, {'eggs': 1})
+
+    def test_timing(self):
+
+        class timingDriver(aDriver):
+
+            @Action(units='s')
+            def wait(self, value):
+                return value
+
+        obj = timingDriver()
+        obj.eggs = 1
+        obj.refresh('eggs')
+        obj.wait(Q_(1, 'ms'))
+        for key in ('get_eggs', 'get_eggs.lock', 'get_eggs.post',
+                    'set_eggs', 'set_eggs.lock', 'set_eggs.pre',
+                    'wait', 'wait.lock', 'wait.pre'):
+            self.assertEqual(obj.timing.stats(key).count, 1, key)
+            self.assertLess(obj.timing.stats(key).last, 1)
+
     def test_refresh(self):
         obj = aDriver()
         obj._eggs = 1
@@ -372,6 +504,41 @@ class DriverTest(unittest.TestCase):
         self.assertEqual(x.feats.a_value.units, 'ms')
         self.assertEqual(x.a_value, Q_(1, 'ms'))
 
+        # Dependencies are registered for every instance.
+        y = X()
+        self.assertEqual(y.a_value, Q_(1, 's'))
+        y.a_value_units = 'us'
+        self.assertEqual(y.a_value, Q_(1, 'us'))
+        self.assertEqual(x.a_value, Q_(1, 'ms'))
+
+    def test_modifier_overlay(self):
+
+        class X(Driver):
+
+            @Feat(units='s', limits=(10, ))
+            def eggs(self):
+                return 1
+
+            @eggs.setter
+            def eggs(self, value):
+                pass
+
+        x, y = X(), X()
+        feat = X.eggs
+        modifiers = feat.modifiers
+        x.feats.eggs.units = 'ms'
+        self.assertIs(feat.modifiers, modifiers)
+        self.assertEqual(feat.modifiers['units'], 's')
+        self.assertEqual(x.feats.eggs.units, 'ms')
+        self.assertEqual(x.feats.eggs.limits, (10, ))
+        self.assertEqual(x.eggs, Q_(1, 'ms'))
+        self.assertEqual(y.eggs, Q_(1, 's'))
+
+        # Invalid values are rejected and the previous one is kept.
+        self.assertRaises(Exception, setattr, x.feats.eggs, 'units', 'not a unit')
+        self.assertEqual(x.feats.eggs.units, 'ms')
+        self.assertRaises(AttributeError, setattr, x.feats.eggs, 'spam', 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+import unittest
+
+from lantz import Driver, Feat, DictFeat
+from lantz import emission
+from lantz.emission import Immediate, MaxRate, PerTick, EmissionCounts
+
+
+class FakeSignal(object):
+
+    def __init__(self):
+        self.history = []
+
+    def emit(self, *args):
+        self.history.append(args)
+
+
+class aDriver(Driver):
+
+    def __init__(self):
+        super().__init__()
+        self._eggs = 0
+
+    @Feat()
+    def eggs(self):
+        return self._eggs
+
+    @eggs.setter
+    def eggs(self, value):
+        self._eggs = value
+
+    @DictFeat(emission=Immediate())
+    def ham(self, key):
+        return key
+
+    @ham.setter
+    def ham(self, key, value):
+        pass
+
+
+class EmissionTest(unittest.TestCase):
+
+    def test_max_rate(self):
+        signal = FakeSignal()
+        emitter = MaxRate(10).emitter(signal)
+        emitter.emit(1, 0)
+        emitter.emit(2, 1)
+        emitter.emit(3, 2)
+        emitter.emit(4, 3)
+        self.assertEqual(signal.history, [(1, 0)])
+        time.sleep(.2)
+        self.assertEqual(signal.history, [(1, 0), (4, 1)])
+        self.assertEqual(emitter.counts, EmissionCounts(2, 0, 2))
+
+    def test_per_tick(self):
+        signal = FakeSignal()
+        callbacks = []
+        emitter = PerTick(callbacks.append).emitter(signal)
+        emitter.emit(1, 0, {'key': 'a'})
+        emitter.emit(2, 1, {'key': 'a'})
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(signal.history, [])
+        callbacks.pop()()
+        self.assertEqual(signal.history, [(2, 0, {'key': 'a'})])
+        emitter.emit(3, 2, {'key': 'a'})
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(emitter.counts, EmissionCounts(1, 1, 0))
+
+    def test_per_tick_qt(self):
+        from lantz.utils.qt import QtCore
+        app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+        # The scheduler is created by the first emitter, here in a worker.
+        emission._QT_SCHEDULER = None
+        signal = FakeSignal()
+        emitters = []
+        emitted_in = []
+        done = threading.Event()
+
+        def emit():
+            emitter = PerTick().emitter(signal)
+            emitters.append(emitter)
+            emitter.emit(1, 0, {'key': 'a'})
+            emitter.emit(2, 1, {'key': 'a'})
+            # Stay alive (without running an event loop) until emitted.
+            done.wait(5)
+
+        signal.emit = lambda *args: (emitted_in.append(threading.current_thread()),
+                                     signal.history.append(args))
+        worker = threading.Thread(target=emit)
+        worker.start()
+
+        deadline = time.time() + 2
+        while not signal.history and time.time() < deadline:
+            app.processEvents()
+            time.sleep(.01)
+        done.set()
+        worker.join()
+
+        self.assertEqual(signal.history, [(2, 0, {'key': 'a'})])
+        self.assertEqual(emitted_in, [threading.current_thread()])
+        self.assertEqual(emitters[0].counts, EmissionCounts(1, 1, 0))
+
+    def test_driver(self):
+        obj = aDriver()
+        changed = []
+        obj.eggs_changed.connect(lambda new, old: changed.append(new))
+
+        obj.eggs = 1
+        self.assertEqual(changed, [1])
+        self.assertEqual(obj.emission_counts(), {})
+
+        obj.emission_policy = MaxRate(.1)
+        for value in range(2, 6):
+            obj.eggs = value
+        self.assertEqual(changed, [1, 2])
+        obj.flush_emissions()
+        self.assertEqual(changed, [1, 2, 5])
+        self.assertEqual(obj.emission_counts(), {'eggs': EmissionCounts(2, 0, 2)})
+
+        obj.feats.eggs.emission = Immediate()
+        obj.eggs = 6
+        self.assertEqual(changed, [1, 2, 5, 6])
+
+        self.assertEqual(obj.ham[1], 1)
+        obj.ham[1] = 2
+        self.assertEqual(obj.emission_counts()['ham[1]'], EmissionCounts(2, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
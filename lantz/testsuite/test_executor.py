@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+import unittest
+
+from lantz import Driver, Feat
+from lantz.executor import SharedExecutor, INTERACTIVE, NORMAL, BULK
+
+
+class Owner(object):
+    pass
+
+
+class executorDriver(Driver):
+
+    executor = SharedExecutor(2)
+
+    def __init__(self):
+        super().__init__()
+        self._eggs = 0
+
+    @Feat()
+    def eggs(self):
+        time.sleep(.02)
+        return self._eggs
+
+    @eggs.setter
+    def eggs(self, value):
+        self._eggs = value
+
+
+class ExecutorTest(unittest.TestCase):
+
+    def test_serialized(self):
+        executor = SharedExecutor(4)
+        owner = Owner()
+        running = []
+        overlap = []
+
+        def task(value):
+            running.append(value)
+            overlap.append(len(running))
+            time.sleep(.01)
+            running.remove(value)
+            return value
+
+        futs = [executor.submit(owner, NORMAL, task, value) for value in range(5)]
+        self.assertEqual([fut.result() for fut in futs], list(range(5)))
+        self.assertEqual(max(overlap), 1)
+
+        # Different owners run concurrently
+        barrier = threading.Barrier(2, timeout=1)
+        futs = [executor.submit(Owner(), NORMAL, barrier.wait) for _ in range(2)]
+        for fut in futs:
+            fut.result()
+
+        executor.shutdown()
+
+    def test_priority_and_cancel(self):
+        executor = SharedExecutor(1)
+        owner = Owner()
+        order = []
+        started = threading.Event()
+        event = threading.Event()
+
+        def block():
+            started.set()
+            event.wait(1)
+
+        executor.submit(owner, NORMAL, block)
+        started.wait(1)
+        bulk = executor.submit(owner, BULK, order.append, 'bulk')
+        normal = executor.submit(owner, NORMAL, order.append, 'normal')
+        cancelled = executor.submit(owner, NORMAL, order.append, 'cancelled')
+        interactive = executor.submit(owner, INTERACTIVE, order.append, 'interactive')
+
+        self.assertEqual(executor.queue_depth(owner), 4)
+        self.assertTrue(cancelled.cancel())
+        self.assertEqual(executor.queue_depth(owner), 3)
+
+        event.set()
+        bulk.result(1)
+        self.assertEqual(order, ['interactive', 'normal', 'bulk'])
+        self.assertTrue(interactive.done() and normal.done())
+        self.assertEqual(executor.queue_depth(), 0)
+        self.assertEqual(executor.timing.stats('wait').count, 4)
+        self.assertEqual(executor.wait_time(owner).count, 4)
+        self.assertIsNone(executor.wait_time(Owner()))
+
+        executor.shutdown()
+        self.assertRaises(RuntimeError, executor.submit, owner, NORMAL, order.append, 1)
+
+    def test_idle_timeout(self):
+        executor = SharedExecutor(3, idle_timeout=.05)
+        futs = [executor.submit(Owner(), NORMAL, time.sleep, .01) for _ in range(3)]
+        for fut in futs:
+            fut.result()
+        self.assertEqual(len(executor._threads), 3)
+        time.sleep(.2)
+        self.assertEqual(len(executor._threads), 0)
+        self.assertEqual(executor._waking, 0)
+
+        self.assertEqual(executor.submit(Owner(), NORMAL, sum, (1, 2)).result(1), 3)
+
+    def test_idle_timeout_race(self):
+        # Submissions racing with workers timing out must not be lost.
+        executor = SharedExecutor(2, idle_timeout=1e-4)
+        owners = [Owner() for _ in range(4)]
+        for repeat in range(300):
+            futs = [executor.submit(owner, NORMAL, sum, (repeat, 1)) for owner in owners]
+            for fut in futs:
+                self.assertEqual(fut.result(1), repeat + 1)
+            self.assertGreaterEqual(executor._idle, 0)
+            self.assertGreaterEqual(executor._waking, 0)
+            time.sleep(repeat % 3 * 1e-4)
+        executor.shutdown()
+
+    def test_driver(self):
+        obj = executorDriver()
+        # Otherwise the interactive refresh might run before the update.
+        obj.update_async(eggs=1).result(1)
+        futs = [obj.refresh_async('eggs', priority=BULK) for _ in range(3)]
+        interactive = obj.refresh_async('eggs', priority=INTERACTIVE)
+        self.assertEqual(interactive.result(1), 1)
+        self.assertFalse(futs[-1].done())
+        for fut in futs:
+            self.assertEqual(fut.result(1), 1)
+        self.assertEqual(obj.unfinished_tasks, 0)
+        self.assertEqual(obj.queued_tasks, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
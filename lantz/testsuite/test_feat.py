@@ -4,6 +4,8 @@ import time
 import logging
 import unittest
 
+import numpy as np
+
 from lantz import Driver, Feat, Q_
 from lantz.feat import MISSING
 from lantz.log import get_logger
@@ -126,6 +128,38 @@ class FeatTest(unittest.TestCase):
         self.assertEqual(obj.serialno, 23199292)
         self.assertEqual(obj.serialno, 23199292)
 
+    def test_cache_ttl(self):
+
+        class Ham(Driver):
+
+            _reads = 0
+
+            @Feat(cache_ttl=10)
+            def eggs(self_):
+                self_._reads += 1
+                return self_._reads
+
+            @Feat()
+            def bacon(self_):
+                self_._reads += 1
+                return self_._reads
+
+        obj = Ham()
+        self.assertEqual(obj.eggs, 1)
+        self.assertEqual(obj.eggs, 1)
+        self.assertEqual(obj.refresh('eggs', max_age=0), 2)
+        self.assertEqual(obj.eggs, 2)
+        self.assertLess(obj.feats.eggs.cache_age(obj), 10)
+
+        obj.feats.eggs.cache_ttl = None
+        self.assertEqual(obj.eggs, 3)
+        self.assertEqual(obj.eggs, 4)
+
+        self.assertEqual(obj.bacon, 5)
+        self.assertEqual(obj.refresh('bacon', max_age=10), 5)
+        self.assertEqual(obj.refresh(('bacon', ), max_age=10), (5, ))
+        self.assertEqual(obj.bacon, 6)
+
     def test_limits(self):
 
         class Spam(Driver):
@@ -168,6 +202,60 @@ class FeatTest(unittest.TestCase):
             self.assertRaises(ValueError, setattr, obj, "eggs", Q_(11. * mult, units))
             self.assertRaises(ValueError, setattr, obj, "eggs", Q_(0.9 * mult, units))
 
+    def test_array(self):
+
+        class Spam(Driver):
+
+            _wave = None
+
+            @Feat(limits=(0, 10), units='volt')
+            def wave(self_):
+                return self_._wave
+
+            @wave.setter
+            def wave(self_, value):
+                self_._wave = value
+
+        obj = Spam()
+        changed = []
+        obj.wave_changed.connect(lambda new, old: changed.append(new))
+
+        wave = np.linspace(0, 1, 5)
+        obj.wave = wave
+        np.testing.assert_allclose(obj._wave, wave)
+        obj.wave = Q_(wave * 1000, 'millivolt')
+        np.testing.assert_allclose(obj._wave, wave)
+        np.testing.assert_allclose(obj.wave.to('volt').magnitude, wave)
+        np.testing.assert_allclose(changed[0], wave)
+        self.assertRaises(ValueError, setattr, obj, 'wave', wave * 20)
+
+    def test_subclass_hooks(self):
+
+        class ScaledFeat(Feat):
+
+            def post_get(self, value, instance=None, key=MISSING):
+                return super().post_get(value, instance, key) * 10
+
+            def pre_set(self, value, instance=None, key=MISSING):
+                return super().pre_set(value, instance, key) / 10
+
+        class Spam(Driver):
+
+            _eggs = 1
+
+            @ScaledFeat(units='second')
+            def eggs(self_):
+                return self_._eggs
+
+            @eggs.setter
+            def eggs(self_, value):
+                self_._eggs = value
+
+        obj = Spam()
+        self.assertEqual(obj.eggs, Q_(10, 'second'))
+        obj.eggs = Q_(50, 'second')
+        self.assertEqual(obj._eggs, 5)
+
     def test_set_units(self):
 
         class Spam(Driver):
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+import time
+import unittest
+
+from lantz import Driver, Feat, Action, DriverGroup
+
+DELAY = .1
+
+
+class groupDriver(Driver):
+
+    def __init__(self, fail=False, **kwargs):
+        super().__init__(**kwargs)
+        self.fail = fail
+        self._power = 0
+
+    @Feat()
+    def power(self):
+        time.sleep(DELAY)
+        return self._power
+
+    @power.setter
+    def power(self, value):
+        time.sleep(DELAY)
+        if self.fail:
+            raise ValueError(self.name)
+        self._power = value
+
+    @Action()
+    def enable(self, value=True):
+        return (self.name, value)
+
+
+class GroupTest(unittest.TestCase):
+
+    def test_group(self):
+        group = DriverGroup([groupDriver(name='laser{}'.format(index)) for index in range(4)])
+        self.assertEqual(len(group), 4)
+        self.assertIs(group['laser2'], group[2])
+
+        tic = time.perf_counter()
+        report = group.update(power=3)
+        self.assertLess(time.perf_counter() - tic, 2 * DELAY)
+        self.assertEqual(report.exceptions, {})
+        self.assertEqual([driver._power for driver in group], [3] * 4)
+
+        report = group.refresh('power', force_refresh=True)
+        self.assertEqual(report.results, {name: 3 for name in group.names})
+
+        report = group.update_each({'laser0': {'power': 1}, 'laser3': {'power': 2}})
+        self.assertEqual(set(report.results), {'laser0', 'laser3'})
+        self.assertEqual([driver._power for driver in group], [1, 3, 3, 2])
+        self.assertRaises(KeyError, group.update_each, {'spam': {'power': 1}})
+
+        report = group.enable(False)
+        self.assertEqual(report.results['laser1'], ('laser1', False))
+        self.assertRaises(AttributeError, getattr, group, 'spam')
+
+    def test_exceptions(self):
+        group = DriverGroup([groupDriver(name='ok'), groupDriver(fail=True, name='bad')],
+                            max_concurrency=1)
+        report = group.update(power=5)
+        self.assertEqual(set(report.exceptions), {'bad'})
+        self.assertIsInstance(report.exceptions['bad'], ValueError)
+        self.assertEqual(group['ok']._power, 5)
+
+        self.assertRaises(ValueError, DriverGroup, [groupDriver(name='x'), groupDriver(name='x')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import time
+import unittest
+
+import numpy as np
+
+from lantz import Driver, Feat, DictFeat, Q_
+from lantz.history import RingBuffer
+
+
+class historyDriver(Driver):
+
+    def __init__(self):
+        super().__init__()
+        self._temperature = 0
+        self._ham = {}
+
+    @Feat(units='K', history=5)
+    def temperature(self):
+        return self._temperature
+
+    @temperature.setter
+    def temperature(self, value):
+        self._temperature = value
+
+    @Feat()
+    def eggs(self):
+        return 'eggs'
+
+    @DictFeat(history=3)
+    def ham(self, key):
+        return self._ham.get(key, 0)
+
+    @ham.setter
+    def ham(self, key, value):
+        self._ham[key] = value
+
+
+class HistoryTest(unittest.TestCase):
+
+    def test_ring_buffer(self):
+        buffer = RingBuffer(4)
+        times, values = buffer.get()
+        self.assertEqual(len(times), 0)
+        self.assertEqual(len(values), 0)
+
+        for value in range(3):
+            buffer.append(float(value), value * 10)
+        times, values = buffer.get()
+        np.testing.assert_equal(times, [0., 1., 2.])
+        np.testing.assert_equal(values, [0, 10, 20])
+
+        for value in range(3, 7):
+            buffer.append(float(value), value * 10)
+        self.assertEqual(len(buffer), 4)
+        times, values = buffer.get()
+        np.testing.assert_equal(times, [3., 4., 5., 6.])
+        np.testing.assert_equal(values, [30, 40, 50, 60])
+        # Views into the buffer, not copies.
+        self.assertIs(values.base, buffer._values)
+
+        np.testing.assert_equal(buffer.get(since=4.5)[1], [50, 60])
+        np.testing.assert_equal(buffer.get(max_points=3)[1], [40, 50, 60])
+        np.testing.assert_equal(buffer.get(since=3.5, max_points=1)[1], [60])
+        self.assertEqual(len(buffer.get(since=10)[0]), 0)
+
+        buffer.append(7., 'spam')
+        self.assertEqual(list(buffer.get()[1]), [40, 50, 60, 'spam'])
+
+    def test_units(self):
+        buffer = RingBuffer(3)
+        buffer.append(0., Q_(1, 'V'))
+        buffer.append(1., Q_(500, 'mV'))
+        times, values = buffer.get()
+        self.assertEqual(values.units, Q_(1, 'V').units)
+        np.testing.assert_allclose(values.magnitude, [1., .5])
+
+    def test_driver(self):
+        obj = historyDriver()
+        start = time.monotonic()
+        for value in range(7):
+            obj.temperature = Q_(value, 'K')
+        self.assertEqual(obj.temperature, Q_(6, 'K'))
+
+        times, values = obj.history('temperature')
+        np.testing.assert_equal(values.magnitude, [3, 4, 5, 6, 6])
+        self.assertTrue(np.all(times >= start))
+        self.assertTrue(np.all(np.diff(times) >= 0))
+
+        times, values = obj.history('temperature', since=times[-2], max_points=10)
+        self.assertEqual(len(times), 2)
+
+        obj.ham[1] = 2
+        obj.ham[1] = 3
+        obj.ham[2] = 5
+        np.testing.assert_equal(obj.history('ham', key=1)[1], [2, 3])
+        np.testing.assert_equal(obj.history('ham', key=2)[1], [5])
+
+        self.assertRaises(ValueError, obj.history, 'eggs')
+        obj.feats.eggs.history = 2
+        obj.eggs
+        self.assertEqual(list(obj.history('eggs')[1]), ['eggs'])
+
+        obj.feats.temperature.history = 2
+        np.testing.assert_equal(obj.history('temperature')[1].magnitude, [6, 6])
+
+
+if __name__ == '__main__':
+    unittest.main()
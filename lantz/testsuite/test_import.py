@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import json
+import subprocess
+import unittest
+
+#: Modules that must not be loaded by `import lantz`.
+HEAVY = ('pint', 'pkg_resources', 'PyQt4', 'PyQt5', 'PySide', 'colorama', 'stringparser',
+         'numpy', 'lantz.driver')
+
+CODE = '''
+import sys, json
+import lantz
+print(json.dumps([name for name in %r if name in sys.modules]))
+''' % (HEAVY, )
+
+
+def loaded():
+    """Import lantz in a new interpreter returning which heavy modules
+    were loaded (see bench_import for the time it takes).
+    """
+    out = subprocess.check_output([sys.executable, '-c', CODE])
+    return json.loads(out.decode('utf-8').splitlines()[-1])
+
+
+class ImportTest(unittest.TestCase):
+
+    def test_import(self):
+        # Loading the heavy modules is what made the import slow.
+        self.assertEqual(loaded(), [])
+
+    def test_lazy(self):
+        code = ('import sys, lantz\n'
+                'assert "pint" not in sys.modules\n'
+                'assert not isinstance(1, lantz.Q_)\n'
+                'assert "pint" not in sys.modules\n'
+                'q = lantz.Q_(1, "V")\n'
+                'assert isinstance(q, lantz.Q_)\n'
+                # Q_ is a proxy to the Quantity class of the registry (built
+                # on first use), so use isinstance and not type(q) is Q_.
+                'assert type(q) is lantz.ureg.Quantity\n'
+                'assert type(q) is not lantz.Q_\n'
+                'assert issubclass(type(q), lantz.Q_)\n'
+                'assert q * lantz.ureg.s == lantz.Q_(1, "V*s")\n'
+                'from lantz import Driver\n'
+                'assert "lantz.driver" in sys.modules\n')
+        subprocess.check_call([sys.executable, '-c', code])
+
+
+if __name__ == '__main__':
+    unittest.main()
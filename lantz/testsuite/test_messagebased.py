@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import unittest
+
+from lantz import Driver, Feat
+
+from lantz.drivers.scpi import SCPIDriver, build_feat
+
+try:
+    from lantz.messagebased import MessageBasedDriver
+except ImportError:  # PyVISA is not installed.
+    MessageBasedDriver = None
+
+
+class FakeResource(object):
+    """Resource recording the messages written and answering queries.
+    """
+
+    def __init__(self):
+        self.written = []
+        self.answers = {}
+
+    def write(self, command, termination=None, encoding=None):
+        self.written.append(command)
+        return len(command)
+
+    def read(self, termination=None, encoding=None):
+        return self.answers.get(self.written[-1], '')
+
+
+@unittest.skipIf(MessageBasedDriver is None, 'PyVISA is not installed')
+class MessageBasedTest(unittest.TestCase):
+
+    def driver(self):
+
+        class batchDriver(MessageBasedDriver):
+
+            BATCH_SEPARATOR = ';'
+
+            def __init__(self):
+                # Skip opening a VISA resource.
+                Driver.__init__(self)
+                self.resource = FakeResource()
+
+            @Feat()
+            def eggs(self):
+                return int(self.query('EGGS?'))
+
+            @eggs.setter
+            def eggs(self, value):
+                self.write('EGGS {}'.format(value))
+
+            @Feat()
+            def ham(self):
+                return int(self.query('HAM?'))
+
+            @ham.setter
+            def ham(self, value):
+                self.write('HAM {}'.format(value))
+
+        return batchDriver()
+
+    def scpi_driver(self):
+
+        class scpiDriver(SCPIDriver, MessageBasedDriver):
+
+            def __init__(self):
+                # Skip opening a VISA resource.
+                Driver.__init__(self)
+                self.resource = FakeResource()
+
+            @build_feat('SOUR:VOLT')
+            def voltage(self):
+                "Output voltage"
+
+            @build_feat(':SOUR:FREQ')
+            def frequency(self):
+                "Output frequency"
+
+        return scpiDriver()
+
+    def test_batch(self):
+        obj = self.driver()
+        with obj.batch():
+            obj.eggs = 1
+            obj.ham = 2
+            self.assertEqual(obj.resource.written, [])
+        self.assertEqual(obj.resource.written, ['EGGS 1;HAM 2'])
+        self.assertEqual(obj.recall(('eggs', 'ham')), {'eggs': 1, 'ham': 2})
+
+    def test_flush_before_read(self):
+        obj = self.driver()
+        obj.resource.answers['HAM 2;EGGS?'] = '4'
+        with obj.batch():
+            obj.ham = 2
+            # The answer might depend on the commands collected so far.
+            self.assertEqual(obj.eggs, 4)
+            self.assertEqual(obj.resource.written, ['HAM 2;EGGS?'])
+            obj.ham = 3
+        self.assertEqual(obj.resource.written, ['HAM 2;EGGS?', 'HAM 3'])
+
+    def test_revert_within_batch(self):
+        obj = self.driver()
+        obj.eggs = 1
+        with obj.batch():
+            obj.eggs = 2
+            obj.eggs = 1
+        self.assertEqual(obj.resource.written, ['EGGS 1', 'EGGS 2;EGGS 1'])
+        self.assertEqual(obj.recall('eggs'), 1)
+
+    def test_batch_other_thread(self):
+        obj = self.driver()
+        with obj.batch():
+            obj.eggs = 1
+            # Only the thread that opened the batch adds commands to it.
+            thread = threading.Thread(target=obj.write, args=('HAM 2', ))
+            thread.start()
+            thread.join()
+            self.assertEqual(obj.resource.written, ['HAM 2'])
+        self.assertEqual(obj.resource.written, ['HAM 2', 'EGGS 1'])
+
+    def test_scpi_batch(self):
+        obj = self.scpi_driver()
+        obj.update(voltage=1, frequency=2, batch=True)
+        # The leading colon of a command is not repeated after the separator.
+        self.assertEqual(obj.resource.written, ['SOUR:VOLT 1;:SOUR:FREQ 2'])
+        self.assertEqual(obj.recall(('voltage', 'frequency')), {'voltage': 1, 'frequency': 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from urllib.request import urlopen
+
+from lantz import Driver, Feat, Action
+from lantz import metrics
+
+
+class metricsDriver(Driver):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._gain = 1
+
+    @Feat(cache_ttl=60)
+    def gain(self):
+        return self._gain
+
+    @gain.setter
+    def gain(self, value):
+        if value < 0:
+            raise ValueError('negative gain')
+        self._gain = value
+
+    @Action(memoize=True)
+    def idn(self):
+        return 'metrics'
+
+
+class MetricsTest(unittest.TestCase):
+
+    def test_render(self):
+        obj = metricsDriver(name='amp"1')
+        obj.gain
+        obj.gain
+        obj.idn()
+        obj.idn()
+        obj.idn()
+        try:
+            obj.gain = -1
+        except ValueError:
+            pass
+
+        text = metrics.render([obj])
+        self.assertTrue(text.endswith('# EOF\n'))
+        self.assertIn('# TYPE lantz_duration_seconds histogram', text)
+        labels = 'driver="amp\\"1",cls="metricsDriver",driver_id="{}"'.format(metrics._driver_id(obj))
+        self.assertIn('lantz_duration_seconds_count{key="get_gain",' + labels + '} 1', text)
+        self.assertIn('lantz_duration_seconds_bucket{key="get_gain",le="+Inf",' + labels + '} 1', text)
+        self.assertIn('lantz_duration_seconds_bucket{key="get_gain",le="64",' + labels + '} 1', text)
+        self.assertIn('lantz_errors_total{key="set_gain",' + labels + '} 1', text)
+        self.assertIn('lantz_cache_hits_total{key="get_gain",' + labels + '} 1', text)
+        self.assertIn('lantz_cache_hits_total{key="idn",' + labels + '} 2', text)
+        self.assertIn('lantz_cache_hit_ratio{key="get_gain",' + labels + '} 0.5', text)
+        self.assertIn('lantz_queued_tasks{' + labels + '} 0', text)
+        self.assertNotIn('lantz_queue_wait_seconds_count{' + labels + '}', text)
+
+        obj.refresh_async('gain').result(1)
+        text = metrics.render([obj])
+        self.assertIn('lantz_queue_wait_seconds_count{' + labels + '} 1', text)
+        self.assertIn('lantz_queue_wait_seconds_bucket{le="+Inf",' + labels + '} 1', text)
+
+        # Cumulative bucket counts are not decreasing.
+        counts = [int(line.rsplit(' ', 1)[1]) for line in text.splitlines()
+                  if line.startswith('lantz_duration_seconds_bucket{key="get_gain"')]
+        self.assertEqual(counts, sorted(counts))
+
+    def test_edges(self):
+        obj = metricsDriver(name='edges')
+        obj.timing.add('exact', 2 ** -10)
+        obj.timing.add('exact', 2 ** -10 * 1.01)
+        obj.timing.add('negative', -1e-3)
+        other = metricsDriver(name='edges')
+
+        text = metrics.render([obj, other])
+        labels = 'driver="edges",cls="metricsDriver",driver_id="{}"'.format(metrics._driver_id(obj))
+        # Buckets count the values lower or equal than the bound.
+        self.assertIn('lantz_duration_seconds_bucket{key="exact",le="0.000976562",' + labels + '} 1', text)
+        self.assertIn('lantz_duration_seconds_bucket{key="exact",le="0.00195312",' + labels + '} 2', text)
+        self.assertIn('lantz_duration_seconds_sum{key="exact",' + labels + '}', text)
+        self.assertNotIn('lantz_duration_seconds_sum{key="negative",', text)
+
+        # Drivers with the same name are distinguished.
+        queued = [line for line in text.splitlines() if line.startswith('lantz_queued_tasks{')]
+        self.assertEqual(len(queued), 2)
+        self.assertNotEqual(metrics._driver_id(obj), metrics._driver_id(other))
+
+    def test_serve(self):
+        obj = metricsDriver(name='served')
+        obj.gain
+        server = metrics.serve(0)
+        try:
+            self.assertRaises(RuntimeError, metrics.serve, 0)
+            url = 'http://{}:{}/metrics'.format(*server.server_address[:2])
+            with urlopen(url, timeout=5) as response:
+                self.assertEqual(response.headers['Content-Type'], metrics.CONTENT_TYPE)
+                text = response.read().decode('utf-8')
+        finally:
+            metrics.stop()
+        self.assertIn('driver="served"', text)
+        self.assertTrue(text.endswith('# EOF\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from lantz import Driver, Feat, persist
+
+
+class persistDriver(Driver):
+
+    PERSIST_FIRMWARE = 'firmware'
+
+    reads = None
+    firmware_value = '1.0'
+
+    def __init__(self, resource_name='COM1'):
+        super().__init__()
+        self.resource_name = resource_name
+
+    @Feat(read_once=True)
+    def firmware(self):
+        self.reads.append('firmware')
+        if self.firmware_value is None:
+            raise IOError('busy')
+        return self.firmware_value
+
+    @Feat(read_once=True, units='s')
+    def delay(self):
+        self.reads.append('delay')
+        return 2
+
+    @Feat()
+    def eggs(self):
+        self.reads.append('eggs')
+        return 3
+
+
+class PersistTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, 'persist.pickle')
+        persist.enable(self.filename)
+        persistDriver.reads = []
+        persistDriver.firmware_value = '1.0'
+
+    def tearDown(self):
+        persist.disable()
+        shutil.rmtree(self.folder)
+
+    def restart(self):
+        persist.disable()
+        persist.enable(self.filename)
+        persistDriver.reads = []
+
+    def test_persist(self):
+        obj = persistDriver()
+        self.assertEqual(obj.delay.magnitude, 2)
+        self.assertEqual(obj.eggs, 3)
+        self.assertEqual(persistDriver.reads, ['firmware', 'delay', 'eggs'])
+
+        self.restart()
+        obj = persistDriver()
+        self.assertEqual(obj.delay.magnitude, 2)
+        self.assertEqual(obj.eggs, 3)
+        # Only the firmware is read to validate the cached values
+        self.assertEqual(persistDriver.reads, ['firmware', 'eggs'])
+
+        # A different resource is not shared
+        other = persistDriver('COM2')
+        self.assertEqual(other.delay.magnitude, 2)
+        self.assertEqual(persistDriver.reads, ['firmware', 'eggs', 'firmware', 'delay'])
+
+        obj.refresh('delay', force_refresh=True)
+        self.assertEqual(persistDriver.reads[-1], 'delay')
+
+    def test_firmware(self):
+        obj = persistDriver()
+        self.assertEqual(obj.delay.magnitude, 2)
+
+        self.restart()
+        persistDriver.firmware_value = '1.1'
+        obj = persistDriver()
+        self.assertEqual(obj.delay.magnitude, 2)
+        self.assertEqual(persistDriver.reads, ['firmware', 'delay'])
+
+    def test_firmware_error(self):
+        obj = persistDriver()
+        self.assertEqual(obj.delay.magnitude, 2)
+
+        # Cached values are not used until the firmware is validated.
+        self.restart()
+        persistDriver.firmware_value = None
+        obj = persistDriver()
+        self.assertEqual(obj.delay.magnitude, 2)
+        self.assertIn('delay', persistDriver.reads)
+
+        self.restart()
+        persistDriver.firmware_value = '1.0'
+        obj = persistDriver()
+        self.assertEqual(obj.delay.magnitude, 2)
+        self.assertEqual(persistDriver.reads, ['firmware'])
+
+    def test_corrupt(self):
+        persist.disable()
+        for content in (b'', b'garbage', b'\x80\xff.', b'I1x\n.', b'\x80\x04K\x01.'):
+            with open(self.filename, 'wb') as fp:
+                fp.write(content)
+            persist.enable(self.filename)
+            obj = persistDriver()
+            self.assertEqual(obj.delay.magnitude, 2)
+            persist.disable()
+
+    def test_disabled(self):
+        persist.disable()
+        obj = persistDriver()
+        self.assertEqual(obj.delay.magnitude, 2)
+        self.assertFalse(os.path.exists(self.filename))
+
+        persistDriver.reads = []
+        obj = persistDriver()
+        self.assertEqual(obj.delay.magnitude, 2)
+        self.assertEqual(persistDriver.reads, ['delay'])
+
+
+if __name__ == '__main__':
+    unittest.main()
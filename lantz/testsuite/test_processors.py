@@ -3,6 +3,8 @@
 import unittest
 import doctest
 
+import numpy as np
+
 from lantz import Q_
 
 import lantz.processors as processors
@@ -45,5 +47,44 @@ class TestProcessors(unittest.TestCase):
 
         self.assertRaises(ValueError, processors.convert_to(V, on_dimensionless='raise'), 1000)
 
+    def test_conversion_factors(self):
+        self.assertEqual(processors.conversion_factors(mv._units, V._units), (0.001, 0))
+        self.assertIsNone(processors.conversion_factors(Hz._units, V._units))
+        scale, offset = processors.conversion_factors(Q_(1, 'degC')._units, Q_(1, 'K')._units)
+        self.assertAlmostEqual(scale, 1.)
+        self.assertAlmostEqual(offset, 273.15)
+
+        self.assertAlmostEqual(processors.convert_to('K', return_float=True)(Q_(25, 'degC')), 298.15)
+        self.assertEqual(processors.convert_to('mV')(Q_(2, 'V')), Q_(2000, 'mV'))
+        self.assertEqual(processors.conversion_factors.cache_info().maxsize,
+                         processors.FACTORS_CACHE_SIZE)
+
+        # Values without units are multiplied by the target.
+        self.assertEqual(processors.convert_to(Q_(10, 'mV'), on_dimensionless='ignore')(3), Q_(30, 'mV'))
+
+    def test_arrays(self):
+        values = np.linspace(0, 1, 11)
+
+        out = processors.ToQuantityProcessor('ms')(values)
+        self.assertIsInstance(out, Q_)
+        self.assertIs(out.magnitude, values)
+        np.testing.assert_allclose(processors.FromQuantityProcessor('s')(out), values / 1000)
+        np.testing.assert_allclose(processors.FromQuantityProcessor('s')(values), values)
+
+        conv = processors.RangeProcessor(((0, 1, .5), ))
+        np.testing.assert_allclose(conv(values), np.round(values * 2) / 2)
+        self.assertRaises(ValueError, conv, values + .1)
+        self.assertRaises(ValueError, conv, values - .1)
+        np.testing.assert_equal(conv(np.array([])), np.array([]))
+
+        conv = processors.MapProcessor({'on': 1, 'off': 0})
+        np.testing.assert_equal(conv(np.array(['on', 'off', 'on'])), np.array([1, 0, 1]))
+        self.assertRaises(ValueError, conv, np.array(['on', 'spam']))
+
+        conv = processors.MapProcessor({1, 2})
+        keys = np.array([[1, 2], [2, 1]])
+        self.assertIs(conv(keys), keys)
+        self.assertRaises(ValueError, conv, np.array([1, 3]))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import time
+import unittest
+from concurrent import futures
+
+from lantz import Driver, Action, initialize_many, finalize_many
+
+
+class schedulerDriver(Driver):
+
+    def __init__(self, events, duration=0., fail=False, **kwargs):
+        super().__init__(**kwargs)
+        self.events = events
+        self.duration = duration
+        self.fail = fail
+
+    @Action()
+    def initialize(self):
+        self.events.append(('start', self.name))
+        time.sleep(self.duration)
+        if self.fail:
+            raise ValueError(self.name)
+        self.events.append(('end', self.name))
+
+    @Action()
+    def finalize(self):
+        self.events.append(('finalize', self.name))
+
+
+class SchedulerTest(unittest.TestCase):
+
+    def drivers(self, **durations):
+        events = []
+        return events, [schedulerDriver(events, duration, name=name)
+                        for name, duration in sorted(durations.items())]
+
+    def test_overlap(self):
+        # slow does not block b, which only depends on a.
+        events, drivers = self.drivers(a=.01, b=.01, slow=.2, c=.01)
+        dependencies = {'b': ['a'], 'c': ['slow', 'b']}
+
+        report = initialize_many(drivers, register_finalizer=False,
+                                 concurrent=True, dependencies=dependencies)
+        self.assertLess(events.index(('end', 'b')), events.index(('end', 'slow')))
+        self.assertGreater(events.index(('start', 'c')), events.index(('end', 'slow')))
+        self.assertEqual(report.critical_path, ['slow', 'c'])
+        self.assertEqual(set(report.durations), {'a', 'b', 'c', 'slow'})
+        self.assertGreaterEqual(report.durations['slow'], .2)
+        self.assertIn('critical path: slow -> c', str(report))
+
+        del events[:]
+        report = finalize_many(drivers, concurrent=True, dependencies=dependencies)
+        self.assertEqual(events[0], ('finalize', 'c'))
+        self.assertLess(events.index(('finalize', 'b')), events.index(('finalize', 'a')))
+
+    def test_serial(self):
+        events, drivers = self.drivers(a=0, b=0, c=0)
+        report = initialize_many(drivers, register_finalizer=False,
+                                 dependencies={'a': ['c'], 'b': ['a']})
+        self.assertEqual([name for kind, name in events if kind == 'start'], ['c', 'a', 'b'])
+        self.assertEqual(report.critical_path, ['c', 'a', 'b'])
+
+        self.assertRaises(ValueError, initialize_many, drivers, register_finalizer=False,
+                          dependencies={'a': ['b'], 'b': ['a']})
+
+    def test_concurrency_and_timeout(self):
+        events, drivers = self.drivers(a=.05, b=.05, c=.05, slow=.5)
+
+        initialize_many(drivers[:3], register_finalizer=False,
+                        concurrent=True, max_concurrency=2)
+        starts = [index for index, (kind, _) in enumerate(events) if kind == 'start']
+        ends = [index for index, (kind, _) in enumerate(events) if kind == 'end']
+        self.assertGreater(starts[2], ends[0])
+
+        failed = []
+        report = initialize_many(drivers, register_finalizer=False,
+                                 concurrent=True, timeout=.2,
+                                 on_exception=lambda driver, ex: failed.append((driver.name, ex)))
+        self.assertEqual([name for name, _ in failed], ['slow'])
+        self.assertIsInstance(failed[0][1], futures.TimeoutError)
+        self.assertIn('slow', report.exceptions)
+        self.assertLess(report.total, .4)
+
+    def test_exception(self):
+        events = []
+        drivers = [schedulerDriver(events, fail=True, name='a')]
+        self.assertRaises(ValueError, initialize_many, drivers,
+                          register_finalizer=False, concurrent=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import subprocess
+import unittest
+
+from lantz.utils.signals import PySignal, PySuperObject
+
+
+class Emitter(PySuperObject):
+
+    changed = PySignal(object, object)
+
+
+class SignalsTest(unittest.TestCase):
+
+    def test_signal(self):
+        first, second = Emitter(), Emitter()
+        received = []
+
+        def both(new, old):
+            received.append((new, old))
+
+        def only_new(new):
+            received.append(new)
+
+        first.changed.connect(both)
+        first.changed.connect(only_new)
+        first.changed.emit(1, 0)
+        self.assertEqual(received, [(1, 0), 1])
+
+        second.changed.emit(2, 1)
+        self.assertEqual(received, [(1, 0), 1])
+
+        first.changed.disconnect(both)
+        first.changed.emit(3, 1)
+        self.assertEqual(received, [(1, 0), 1, 3])
+        self.assertRaises(TypeError, first.changed.disconnect, both)
+
+        first.changed.disconnect()
+        first.changed.emit(4, 3)
+        self.assertEqual(received, [(1, 0), 1, 3])
+
+        self.assertIsInstance(Emitter.changed, PySignal)
+        self.assertIs(first.changed, first.changed)
+
+    def test_backend(self):
+        code = ('import sys\n'
+                'from lantz import Driver, Feat\n'
+                'from lantz.utils import signals\n'
+                'class D(Driver):\n'
+                '    @Feat()\n'
+                '    def eggs(self):\n'
+                '        return 2\n'
+                'd = D()\n'
+                'values = []\n'
+                'd.eggs_changed.connect(lambda new, old: values.append(new))\n'
+                'd.eggs\n'
+                'assert values == [2], values\n'
+                'assert signals.BACKEND == "python"\n'
+                'assert not [name for name in sys.modules if name.startswith(("PyQt", "PySide"))]\n')
+        env = dict(os.environ, LANTZ_SIGNALS='python')
+        subprocess.check_call([sys.executable, '-c', code], env=env)
+
+
+if __name__ == '__main__':
+    unittest.main()
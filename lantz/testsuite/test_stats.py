@@ -30,3 +30,28 @@ class StatsTest(unittest.TestCase):
                 self.assertAlmostEqual(s.std, np.std(values[:ndx]))
                 self.assertAlmostEqual(s.min, np.min(values[:ndx]))
                 self.assertAlmostEqual(s.max, np.max(values[:ndx]))
+
+    def test_stability(self):
+        x = RunningStats()
+        values = 1e9 + np.random.random(1000)
+        for value in values:
+            x.add('key', value)
+        self.assertAlmostEqual(x.stats('key').std, np.std(values), places=6)
+
+    def test_percentiles(self):
+        x = RunningStats()
+        values = np.random.RandomState(0).lognormal(-7, 1, 10000)
+        for value in values:
+            x.add('latency', value)
+
+        expected = np.percentile(values, [50, 99, 99.9])
+        for estimated, value in zip(x.percentiles('latency', [50, 99, 99.9]), expected):
+            self.assertLess(abs(estimated - value) / value, .1)
+
+        self.assertLess(len(x['latency'].histogram.positive), 150)
+        self.assertEqual(x.percentiles('latency', [0, 100]), [values.min(), values.max()])
+
+        x.add('signed', -1.)
+        x.add('signed', 0.)
+        x.add('signed', 1.)
+        self.assertEqual(x.percentiles('signed', [0, 50, 100]), [-1., 0., 1.])
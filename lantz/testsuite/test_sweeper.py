@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+import unittest
+
+import numpy as np
+
+import lantz
+from lantz import Driver, Feat, DictFeat, Action, Q_
+from lantz.sweeper import Sweep
+
+
+class sourceDriver(Driver):
+
+    def __init__(self, delay=0., **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.sets = []
+        self._frequency = 0
+
+    @Feat(units='Hz')
+    def frequency(self):
+        return self._frequency
+
+    @frequency.setter
+    def frequency(self, value):
+        time.sleep(self.delay)
+        self.sets.append((value, threading.current_thread().name))
+        self._frequency = value
+
+    @DictFeat(keys=('a', 'b'), units='V')
+    def volts(self, key):
+        return 0
+
+    @volts.setter
+    def volts(self, key, value):
+        self.sets.append((key, value))
+
+
+class meterDriver(Driver):
+
+    def __init__(self, source, delay=0., **kwargs):
+        super().__init__(**kwargs)
+        self.source = source
+        self.delay = delay
+
+    @Feat(units='mV')
+    def x(self):
+        time.sleep(self.delay)
+        return 2 * self.source._frequency
+
+    @Action()
+    def trace(self):
+        return np.arange(3.)
+
+
+class SweeperTest(unittest.TestCase):
+
+    def test_sweep(self):
+        source = sourceDriver()
+        meter = meterDriver(source)
+        data = lantz.sweep(source.feats.frequency, Q_([1, 2, 3], 'kHz'),
+                           measure=[meter.feats.x, meter.trace])
+
+        self.assertEqual(data.dtype.names, ('timestamp', 'frequency', 'x', 'trace'))
+        np.testing.assert_array_equal(data['frequency'], [1, 2, 3])
+        np.testing.assert_array_equal(data['x'], [2000, 4000, 6000])
+        self.assertEqual(data['trace'].shape, (3, 3))
+        self.assertTrue(np.all(np.diff(data['timestamp']) >= 0))
+        self.assertEqual([value for value, _ in source.sets], [1000, 2000, 3000])
+
+        data = source.sweep('frequency', Q_(range(2), 'Hz'), measure={'b': (source, 'volts', 'b')})
+        self.assertEqual(data.dtype.names, ('timestamp', 'frequency', 'b'))
+        self.assertEqual(len(data), 2)
+
+    def test_units_and_timing(self):
+        source = sourceDriver()
+        meter = meterDriver(source)
+        job = Sweep((source, 'frequency'), [Q_(1, 'Hz'), Q_(1, 'kHz')],
+                    measure=meter.feats.x, settle=.01).start()
+        data = job.result(1)
+        self.assertEqual(str(job.units['frequency']), 'hertz')
+        np.testing.assert_array_equal(data['frequency'], [1, 1000])
+        for key in ('set', 'settle', 'measure', 'measure_x', 'point'):
+            self.assertEqual(job.timing.stats(key).count, 2)
+        self.assertGreaterEqual(job.timing.stats('settle').min, .01)
+
+        self.assertRaises(ValueError, Sweep, source.feats.volts, [1])
+        self.assertRaises(ValueError, Sweep, source.feats.frequency, [1], measure=[meter.feats.x, meter.feats.x])
+
+    def test_pipeline(self):
+        source = sourceDriver(delay=.05)
+        meter = meterDriver(source, delay=.05)
+
+        tic = time.perf_counter()
+        data = lantz.sweep(source.feats.frequency, Q_([1, 2, 3, 4], 'Hz'), measure=meter.feats.x)
+        serial = time.perf_counter() - tic
+
+        source.sets = []
+        tic = time.perf_counter()
+        job = lantz.sweep(source.feats.frequency, Q_([1, 2, 3, 4], 'Hz'), measure=meter.feats.x,
+                          pipeline=True, background=True)
+        data = job.result()
+        self.assertTrue(job.pipeline)
+        self.assertLess(time.perf_counter() - tic, serial * .8)
+        self.assertEqual([value for value, _ in source.sets], [1, 2, 3, 4])
+        self.assertEqual(len(data), 4)
+
+        # The same driver cannot overlap.
+        self.assertFalse(Sweep(source.feats.frequency, [1], measure=source.feats.volts['a'],
+                               pipeline=True).pipeline)
+
+    def test_stop_and_exception(self):
+        source = sourceDriver()
+
+        def measure():
+            if len(source.sets) == 2:
+                job.stop()
+            return 0
+
+        job = Sweep(source.feats.frequency, Q_(range(10), 'Hz'), measure=measure)
+        data = job.start().result(1)
+        self.assertEqual(len(data), 2)
+        self.assertEqual(data.dtype.names, ('timestamp', 'frequency', 'measure'))
+
+        def fail():
+            raise ValueError
+
+        self.assertRaises(ValueError, lantz.sweep, source.feats.frequency, Q_(range(3), 'Hz'), measure=fail)
+
+
+if __name__ == '__main__':
+    unittest.main()
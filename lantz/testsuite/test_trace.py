@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import threading
+import unittest
+
+from lantz import Driver, Feat, DictFeat, Action
+from lantz import trace
+
+
+class traceDriver(Driver):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._power = 1
+        self._channels = {1: 0, 2: 0}
+
+    @Feat()
+    def power(self):
+        return self._power
+
+    @power.setter
+    def power(self, value):
+        self._power = value
+
+    @DictFeat(keys=(1, 2))
+    def channel(self, key):
+        return self._channels[key]
+
+    @Action()
+    def step(self, value):
+        self.power = value
+        return self.power
+
+
+class TraceTest(unittest.TestCase):
+
+    def tearDown(self):
+        trace.stop()
+
+    def test_off(self):
+        trace.start()
+        trace.stop()
+        obj = traceDriver()
+        obj.step(2)
+        self.assertEqual(trace.events(), [])
+
+    def test_nested(self):
+        obj = traceDriver(name='tracer')
+        buffer = io.StringIO()
+        with trace.tracing():
+            obj.step(3)
+            thread = threading.Thread(target=lambda: obj.channel[2], name='worker')
+            thread.start()
+            thread.join()
+        obj.step(4)
+        trace.dump(buffer)
+
+        data = json.loads(buffer.getvalue())
+        spans = [event for event in data['traceEvents'] if event['ph'] == 'X']
+        self.assertEqual([span['name'] for span in spans],
+                         ['set_power', 'get_power', 'step', 'get_channel[2]'])
+        set_span, get_span, step_span, channel_span = spans
+
+        self.assertEqual(step_span['cat'], 'action')
+        self.assertEqual(step_span['args'], {'driver': 'tracer', 'args': '(3,)', 'kwargs': '{}'})
+        self.assertEqual(set_span['args'], {'driver': 'tracer', 'value': 3})
+        self.assertEqual(channel_span['args'], {'driver': 'tracer', 'key': 2})
+
+        # Feat spans are nested within the action span.
+        for span in (set_span, get_span):
+            self.assertEqual(span['tid'], step_span['tid'])
+            self.assertGreaterEqual(span['ts'], step_span['ts'])
+            self.assertLessEqual(span['ts'] + span['dur'], step_span['ts'] + step_span['dur'])
+
+        self.assertNotEqual(channel_span['tid'], step_span['tid'])
+        names = {event['tid']: event['args']['name']
+                 for event in data['traceEvents'] if event['ph'] == 'M'}
+        self.assertEqual(names[channel_span['tid']], 'worker')
+
+    def test_max_events(self):
+        obj = traceDriver()
+        with trace.tracing(max_events=2):
+            for value in range(5):
+                obj.power = value
+        self.assertEqual([span['args']['value'] for span in trace.events()
+                          if span['ph'] == 'X'], [3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
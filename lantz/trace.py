@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+    lantz.trace
+    ~~~~~~~~~~~
+
+    Records nested spans of feat, action and transport calls (e.g.
+    Action -> Feat.get -> MessageBasedDriver.query -> write/read) of all
+    drivers and threads, and writes them in the Chrome trace event format
+    to be shown as a flame chart in chrome://tracing or Perfetto::
+
+        from lantz import trace
+
+        with trace.tracing('step.json'):
+            run_experiment_step()
+
+    Each span carries the driver name, the thread and the arguments.
+    When tracing is off, the instrumented calls only check `enabled`.
+
+    :copyright: 2015 by Lantz Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import os
+import json
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from .stats import perf_counter_ns
+
+#: True while spans are being recorded. Checked by the instrumented calls.
+enabled = False
+
+#: Recorded events, oldest are discarded when `max_events` is reached.
+_events = deque()
+
+#: Thread identifier: thread name, for the metadata events.
+_threads = {}
+
+#: perf_counter_ns at the start of the trace.
+_origin = 0
+
+
+def start(max_events=1000000):
+    """Discard the recorded spans and start recording.
+
+    :param max_events: maximum number of spans kept (the oldest are discarded).
+    """
+    global enabled, _events, _origin
+    _events = deque(maxlen=max_events)
+    _threads.clear()
+    _origin = perf_counter_ns()
+    enabled = True
+
+
+def stop():
+    """Stop recording. The recorded spans are kept.
+    """
+    global enabled
+    enabled = False
+
+
+def _jsonable(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def record(driver, name, category, start_ns, args=None):
+    """Record a span from `start_ns` until now.
+
+    :param driver: driver (or None) which name is added to the arguments.
+    :param name: name of the span.
+    :param category: category of the span (feat, action, transport).
+    :param start_ns: start of the span measured with `lantz.stats.perf_counter_ns`.
+    :param args: dictionary of arguments of the call.
+    """
+    end_ns = perf_counter_ns()
+    tid = threading.get_ident()
+    if tid not in _threads:
+        _threads[tid] = threading.current_thread().name
+
+    arguments = {'driver': getattr(driver, 'name', None)}
+    if args:
+        for key, value in args.items():
+            arguments[key] = _jsonable(value)
+
+    _events.append({'name': name, 'cat': category, 'ph': 'X',
+                    'ts': (start_ns - _origin) / 1000.,
+                    'dur': (end_ns - start_ns) / 1000.,
+                    'pid': os.getpid(), 'tid': tid, 'args': arguments})
+
+
+def events():
+    """Return the recorded events, including thread name metadata,
+    as a list of dictionaries in Chrome trace event format.
+
+    :rtype: list
+    """
+    pid = os.getpid()
+    out = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+            'args': {'name': name}}
+           for tid, name in list(_threads.items())]
+    out.extend(list(_events))
+    return out
+
+
+def dump(fp):
+    """Write the recorded events as Chrome trace event JSON.
+
+    :param fp: file-like object opened in text mode.
+    """
+    json.dump({'traceEvents': events(), 'displayTimeUnit': 'ms'}, fp)
+
+
+def save(filename):
+    """Write the recorded events as Chrome trace event JSON to a file.
+    """
+    with open(filename, 'w', encoding='utf-8') as fp:
+        dump(fp)
+
+
+@contextmanager
+def tracing(filename=None, max_events=1000000):
+    """Record spans within the context, saving them to `filename` (if given)
+    when it exits.
+    """
+    start(max_events)
+    try:
+        yield
+    finally:
+        stop()
+        if filename is not None:
+            save(filename)
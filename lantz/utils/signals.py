@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+    lantz.utils.signals
+    ~~~~~~~~~~~~~~~~~~~
+
+    Selects the implementation of the signals used by drivers
+    (e.g. `<feat>_changed`).
+
+    - 'qt': Qt signals (drivers are QObjects, see `lantz.utils.qt`).
+    - 'python': a pure Python observer with the same connect/disconnect/emit
+      API. Slots are called synchronously in the emitting thread. It does not
+      import Qt and makes driver creation and emission cheaper, which is
+      useful for headless applications.
+
+    The backend is selected with the LANTZ_SIGNALS environment variable.
+    If it is not set, Qt is used if it can be imported.
+
+    :copyright: 2015 by Lantz Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import os
+import inspect
+import threading
+
+SIGNALS_QT = 'qt'
+SIGNALS_PYTHON = 'python'
+
+
+class PySignal(object):
+    """Pure Python signal. Declared as a class attribute, it provides
+    a `BoundPySignal` for each instance.
+
+    :param types: types of the arguments (only informative).
+    """
+
+    def __init__(self, *types):
+        self.types = types
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        bound = BoundPySignal(self)
+        # Stored in the instance so that the descriptor is only used once.
+        if self.name is not None:
+            bound = instance.__dict__.setdefault(self.name, bound)
+        return bound
+
+
+class BoundPySignal(object):
+    """Signal of an instance.
+    """
+
+    __slots__ = ('signal', '_slots', '_lock')
+
+    def __init__(self, signal):
+        self.signal = signal
+        #: tuple of (slot, number of arguments or None for all)
+        #: replaced (not modified) on connect/disconnect.
+        self._slots = ()
+        self._lock = threading.Lock()
+
+    def connect(self, slot, connection_type=None):
+        """Connect a callable to this signal. Like in Qt, slots
+        accepting less arguments than emitted receive only the first ones.
+
+        :param connection_type: ignored, for compatibility with Qt.
+        """
+        with self._lock:
+            self._slots += ((slot, _max_args(slot)), )
+
+    def disconnect(self, slot=None):
+        """Disconnect a callable from this signal, or all if slot is None.
+
+        :raises TypeError: if the slot is not connected (like Qt).
+        """
+        with self._lock:
+            if slot is None:
+                self._slots = ()
+                return
+            for index, (connected, _) in enumerate(self._slots):
+                if connected == slot:
+                    self._slots = self._slots[:index] + self._slots[index + 1:]
+                    return
+        raise TypeError('{!r} is not connected'.format(slot))
+
+    def emit(self, *args):
+        """Call all connected slots with the given arguments.
+        """
+        for slot, nargs in self._slots:
+            if nargs is None:
+                slot(*args)
+            else:
+                slot(*args[:nargs])
+
+
+def _max_args(slot):
+    """Return the maximum number of positional arguments accepted by
+    a callable or None if unlimited or unknown.
+    """
+    try:
+        parameters = inspect.signature(slot).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    count = 0
+    for parameter in parameters:
+        if parameter.kind == parameter.VAR_POSITIONAL:
+            return None
+        if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD):
+            count += 1
+    return count
+
+
+class PySuperObject(object):
+    """Base class for objects with pure Python signals, equivalent to
+    `lantz.utils.qt.SuperQObject`.
+    """
+
+    def __init__(self, *args, **kw):
+        # Emulate super by calling the next method in the MRO, if there is one.
+        mro = self.__class__.mro()
+        next_index = mro.index(PySuperObject) + 1
+        init = mro[next_index].__init__
+        if init is object.__init__:
+            init(self)
+        else:
+            init(self, *args, **kw)
+
+
+BACKEND = os.environ.get('LANTZ_SIGNALS', None)
+if BACKEND not in (SIGNALS_QT, SIGNALS_PYTHON, None):
+    raise RuntimeError('Invalid signal backend {!r}, valid values are: {!r}, {!r}'.format(
+                       BACKEND, SIGNALS_QT, SIGNALS_PYTHON))
+
+if BACKEND != SIGNALS_PYTHON:
+    try:
+        from .qt import QtCore, SuperQObject as SuperObject, MetaQObject as MetaObject
+        Signal = QtCore.Signal
+        BACKEND = SIGNALS_QT
+    except ImportError:
+        if BACKEND == SIGNALS_QT:
+            raise
+        BACKEND = SIGNALS_PYTHON
+
+if BACKEND == SIGNALS_PYTHON:
+    Signal, SuperObject, MetaObject = PySignal, PySuperObject, type